@@ -0,0 +1,243 @@
+"""
+سيناريوهات قياس أداء طبقة البيانات في ProfessionalFootballApp مقابل الخادم البديل
+(bench/mock_api.py): الجلب، process_api_response_improved، الفلاتر و SQLiteStorage
+
+لكل سيناريو: الزمن الكلي، عدد الطلبات لكل endpoint، حجم البيانات، وذروة الذاكرة
+
+الاستخدام:
+    python bench/bench_scenarios.py [--latency 80] [--rate-limit 0] [--recorded DIR]
+                                    [--followed 30] [--only cold_start,popup_open] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from mock_api import MockApiServer, SyntheticData  # noqa: E402
+
+
+def scenario_cold_start(app):
+    """أول تشغيل: لا كتالوج محفوظ، جلب الدوريات والمباريات المباشرة"""
+    app._load_with_progress()
+
+
+def scenario_warm_start(app):
+    """تشغيل لاحق: الكتالوج من SQLite والمباريات المباشرة من الشبكة"""
+    app.league_index = type(app.league_index)()
+    app._load_with_progress()
+
+
+def scenario_live_refresh(app):
+    """تحديث مباشر واحد للدوريات المتابعة"""
+    matches = app.fetch_live_matches_for_update()
+    return {'matches': len(matches or [])}
+
+
+def scenario_calendar_filters(app):
+    """يوم في التقويم مع تفعيل فلتري NS Perfect 1_1 و Perfect2_2"""
+    app.filter_ns_perfect_1_1_enabled = True
+    app.filter_perfect2_2_enabled = True
+    try:
+        matches = app.process_matches_improved(app.fetch_matches_by_date_improved(datetime.now().date()))
+        required_league_ids = app.get_required_league_ids()
+        if required_league_ids:
+            matches = [match for match in matches if match.get('league_id') in required_league_ids]
+        passed = app.apply_calendar_filters(matches)
+        return {'candidates': len(matches), 'passed': len(passed)}
+    finally:
+        app.filter_ns_perfect_1_1_enabled = False
+        app.filter_perfect2_2_enabled = False
+
+
+def scenario_live_filters(app):
+    """فلتر Condition 1 + 2 على المباريات المباشرة وعدد الطلبات التي تم تجنبها"""
+    import main
+
+    app.rule_engine.stats.clear()
+    matches = app.fetch_live_matches_sync()
+    passed = [match for match in matches if app.rule_engine.evaluate(main.CONDITION_1_AND_2_RULE, match).passed]
+    summary = app.rule_engine.summary()
+    return {
+        'candidates': len(matches), 'passed': len(passed),
+        'fetched': summary['fetched'], 'avoided': summary['avoided'],
+    }
+
+
+def scenario_batch_refilter(app):
+    """
+    أول تقييم دفعي لـ 500 مباراة (مع جلب الخصائص) ثم إعادة الفلترة دون تغير المدخلات:
+    النتائج تعاد من VerdictCache (reused) دون تقييم أو طلبات
+    """
+    import main
+
+    app.rule_engine.stats.clear()
+    matches = app.process_matches_improved(app.fetch_matches_by_date_improved(datetime.now().date()))
+    matches = (matches + app.fetch_live_matches_sync())[:500]
+    rules = (main.NS_PERFECT_1_1_RULE, main.CONDITION_1_AND_2_RULE)
+
+    started = time.perf_counter()
+    for rule in rules:
+        app.batch_evaluator.evaluate(rule, matches)
+    first_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    passed = sum(verdict.passed for rule in rules for verdict in app.batch_evaluator.evaluate(rule, matches))
+    refilter_ms = (time.perf_counter() - started) * 1000
+    return {
+        'candidates': len(matches), 'passed': passed, 'first_ms': first_ms, 'refilter_ms': refilter_ms,
+        'reused': app.rule_engine.summary()['reused'],
+    }
+
+
+def scenario_team_form(app):
+    """
+    أداء كل فرق أول 10 دوريات متابعة (آخر 3 على الأرض وخارجها): أول مرة مزامنة كل دوري بطلب واحد
+    ثم استعلامات SQL فقط من مستودع المباريات (معرفات الفرق league_id * 100 + n كما في SyntheticData)
+    """
+    season = datetime.now().year
+    teams = [
+        (league['id'] * 100 + n, league['id'])
+        for league in app.selected_leagues[:10] for n in range(20)
+    ]
+
+    def form():
+        for team_id, league_id in teams:
+            for is_home in (True, False):
+                app.fetch_team_last_matches_improved(team_id, league_id, season, is_home)
+
+    started = time.perf_counter()
+    form()
+    first_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    form()
+    warm_ms = (time.perf_counter() - started) * 1000
+    return {'teams': len(teams), 'form_first_ms': first_ms, 'form_warm_ms': warm_ms}
+
+
+def scenario_popup_open(app):
+    """بيانات نافذة الإحصائيات لمباراة واحدة (آخر المباريات والترتيب للفريقين)"""
+    match = next(iter(app.matches), None) or app.fetch_live_matches_sync()[0]
+    league_id, season = match.get('league_id'), match.get('season')
+    for team_id, is_home in ((match.get('home_team_id'), True), (match.get('away_team_id'), False)):
+        app.fetch_team_last_matches_improved(team_id, league_id, season, is_home_team=is_home)
+        app.fetch_team_standings_improved(team_id, league_id, season)
+
+
+SCENARIOS = [
+    ('cold_start', scenario_cold_start),
+    ('warm_start', scenario_warm_start),
+    ('live_refresh', scenario_live_refresh),
+    ('calendar_filters', scenario_calendar_filters),
+    ('live_filters', scenario_live_filters),
+    ('batch_refilter', scenario_batch_refilter),
+    ('team_form', scenario_team_form),
+    ('popup_open', scenario_popup_open),
+]
+
+
+def run_scenario(app, server, name, func):
+    server.reset_counters()
+    tracemalloc.start()
+    started = time.perf_counter()
+    extra = func(app) or {}
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'scenario': name,
+        'wall_ms': wall * 1000,
+        'requests': dict(server.requests),
+        'total_requests': sum(server.requests.values()),
+        'rate_limited': server.rate_limited,
+        'bytes': server.bytes_sent,
+        'peak_mem_kb': peak / 1024,
+        **extra,
+    }
+
+
+def make_app(base_url, followed):
+    import main
+
+    app = main.ProfessionalFootballApp()
+    app.base_url = base_url
+    # الخطوات التي يقوم بها build() دون إنشاء الواجهة
+    app.dimensions.load()
+    app.rank_policy.load()
+    app.data_versions.load()
+    app.load_favorites()
+    app.load_hidden_matches()
+    app.load_favorite_leagues()
+    app.selected_leagues = [{'name': f"League {league_id}", 'id': league_id} for league_id in range(1, followed + 1)]
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=80, help='milliseconds per request')
+    parser.add_argument('--rate-limit', type=int, default=0, help='requests per minute (0 = unlimited)')
+    parser.add_argument('--recorded', help='directory of recorded responses')
+    parser.add_argument('--followed', type=int, default=30, help='number of followed leagues')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--only', help='comma separated scenario names')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    server = MockApiServer(
+        latency=args.latency / 1000, rate_limit=args.rate_limit,
+        recorded_dir=args.recorded, data=SyntheticData(seed=args.seed)
+    ).start()
+
+    selected = set(args.only.split(',')) if args.only else None
+    results = []
+
+    # قاعدة البيانات تنشأ في مجلد مؤقت حتى يبدأ cold_start فعلاً من الصفر
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            app = make_app(server.url, args.followed)
+            for name, func in SCENARIOS:
+                if selected and name not in selected:
+                    continue
+                results.append(run_scenario(app, server, name, func))
+        finally:
+            os.chdir(cwd)
+            server.stop()
+
+    print()
+    print(f"{'scenario':<18}{'wall ms':>10}{'requests':>10}{'429s':>6}{'KB recv':>10}{'peak KB':>10}")
+    for result in results:
+        print(f"{result['scenario']:<18}{result['wall_ms']:>10.0f}{result['total_requests']:>10}"
+              f"{result['rate_limited']:>6}{result['bytes'] / 1024:>10.0f}{result['peak_mem_kb']:>10.0f}")
+        print(f"{'':<18}{json.dumps(result['requests'])}")
+        if 'refilter_ms' in result:
+            print(f"{'':<18}{result['candidates']} matches: first pass {result['first_ms']:.0f} ms, "
+                  f"re-filter {result['refilter_ms']:.1f} ms ({result['reused']} verdicts reused)")
+        if 'form_warm_ms' in result:
+            print(f"{'':<18}{result['teams']} teams: first pass {result['form_first_ms']:.0f} ms, "
+                  f"warm {result['form_warm_ms']:.1f} ms")
+        if 'avoided' in result:
+            print(f"{'':<18}filter fetches needed {json.dumps(result['fetched'])}, avoided {json.dumps(result['avoided'])}")
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+قياس زمن بدء التشغيل: استيراد main.py وترجمة قواعد KV
+كل تكرار يعمل في عملية جديدة حتى لا تؤثر الوحدات المستوردة مسبقاً على القياس
+
+الاستخدام:
+    python bench/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# يعمل داخل العملية الفرعية ويطبع النتائج كسطر JSON
+PROBE = r'''
+import json, os, sys, time
+sys.path.insert(0, sys.argv[1])
+os.chdir(sys.argv[2])
+
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+from kivy.lang import Builder
+app = main.ProfessionalFootballApp()
+app_created = time.perf_counter()
+
+Builder.load_string(main.KV)
+kv_compiled = time.perf_counter()
+
+lazy = {}
+for name in main.LAZY_KV:
+    lazy_started = time.perf_counter()
+    main.load_lazy_kv(name)
+    lazy[name] = (time.perf_counter() - lazy_started) * 1000
+
+heavy = ('requests', 'kivymd.uix.dialog', 'kivymd.uix.snackbar', 'kivymd.uix.textfield')
+
+print("BENCH " + json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'app_init_ms': (app_created - imported) * 1000,
+    'kv_compile_ms': (kv_compiled - app_created) * 1000,
+    'lazy_kv_ms': lazy,
+    'eager_modules': [m for m in heavy if m in sys.modules],
+}))
+'''
+
+
+def run_once(workdir):
+    env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE, ROOT, workdir],
+        capture_output=True, text=True, env=env
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith('BENCH '):
+            return json.loads(line[len('BENCH '):])
+    raise RuntimeError(f"probe failed:\n{result.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    samples = []
+    # قاعدة البيانات تنشأ في مجلد مؤقت وليس في المستودع
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(args.runs):
+            samples.append(run_once(workdir))
+
+    for key in ('import_ms', 'app_init_ms', 'kv_compile_ms'):
+        values = [sample[key] for sample in samples]
+        print(f"{key:>15}: median {statistics.median(values):7.1f} ms   min {min(values):7.1f} ms")
+
+    for name in samples[0]['lazy_kv_ms']:
+        values = [sample['lazy_kv_ms'][name] for sample in samples]
+        print(f"{'lazy ' + name:>15}: median {statistics.median(values):7.1f} ms   (deferred to first use)")
+
+    print(f"  eager modules: {', '.join(samples[-1]['eager_modules']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
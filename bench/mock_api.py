@@ -0,0 +1,339 @@
+"""
+خادم محلي بديل عن v3.football.api-sports.io لقياس الأداء بشكل قابل للتكرار
+
+يخدم /leagues و /fixtures (مباشر، يوم، فريق، ومباريات موسم دوري مع from/to) و /standings من:
+- ملفات استجابات مسجلة (--recorded DIR) بالمسار DIR/<endpoint>/<key>.json
+  (مثل أرشيف FOOTBALL_API_MODE=capture في التطبيق)
+- أو بيانات اصطناعية حتمية (نفس البذرة = نفس الاستجابات)
+
+مع زمن استجابة وحد طلبات في الدقيقة قابلين للضبط، وعداد للطلبات لكل endpoint
+
+الاستخدام المستقل:
+    python bench/mock_api.py --port 8765 --latency 120 --rate-limit 300
+ثم توجيه التطبيق إليه بتغيير base_url إلى http://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+LIVE_STATUSES = ('1H', '2H', 'HT')
+
+
+def recorded_key(params):
+    """مفتاح ملف الاستجابة المسجلة (نفس ApiTransport.archive_key في main.py)"""
+    key = '&'.join(f"{name}={value}" for name, value in sorted(params.items()))
+    return re.sub(r'[^A-Za-z0-9=&._-]', '_', key) or '_'
+
+
+class SyntheticData:
+    """بيانات اصطناعية حتمية بحجم قريب من استجابات api-sports الحقيقية"""
+
+    def __init__(self, seed=7, leagues=1000, teams_per_league=20, live=300, day=400, season=None, weeks=12):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.season = season or datetime.now().year
+        self.weeks = weeks
+        self.created = datetime.now()
+        self._seasons = {}
+        self.leagues = []
+        self.teams = {}
+
+        for index in range(leagues):
+            league_id = index + 1
+            self.leagues.append({
+                'league': {
+                    'id': league_id,
+                    'name': f"League {league_id}" + (" Women" if index % 25 == 0 else ""),
+                    'type': 'League' if index % 5 else 'Cup',
+                    'logo': f"https://media.api-sports.io/football/leagues/{league_id}.png",
+                },
+                'country': {
+                    'name': f"Country {index % 120}",
+                    'code': f"C{index % 120}",
+                    'flag': f"https://media.api-sports.io/flags/c{index % 120}.svg",
+                },
+                'seasons': [{'year': self.season, 'current': True}],
+            })
+            self.teams[league_id] = [league_id * 100 + n for n in range(teams_per_league)]
+
+        self.live = [self._fixture(status=self.rng.choice(LIVE_STATUSES), events=True) for _ in range(live)]
+        self.day = [self._fixture(status=self.rng.choice(('NS', 'NS', 'FT'))) for _ in range(day)]
+
+    def _league(self, league_id):
+        return self.leagues[league_id - 1]
+
+    def _fixture(self, status, league_id=None, home_id=None, away_id=None, date=None, events=False, rng=None):
+        rng = rng or self.rng
+        league_id = league_id or rng.randint(1, len(self.leagues))
+        teams = self.teams[league_id]
+        home_id = home_id or rng.choice(teams)
+        away_id = away_id or rng.choice([team for team in teams if team != home_id])
+        started = status != 'NS'
+        league = self._league(league_id)
+
+        fixture = {
+            'fixture': {
+                'id': rng.randint(10 ** 6, 10 ** 7),
+                'referee': 'Referee Name',
+                'date': (date or datetime.now()).strftime('%Y-%m-%dT%H:%M:%S+00:00'),
+                'venue': {'id': 1, 'name': 'Stadium', 'city': 'City'},
+                'status': {
+                    'short': status,
+                    'elapsed': rng.randint(1, 90) if status in LIVE_STATUSES else (90 if status == 'FT' else None),
+                },
+            },
+            'league': {
+                'id': league_id,
+                'name': league['league']['name'],
+                'country': league['country']['name'],
+                'logo': league['league']['logo'],
+                'flag': league['country']['flag'],
+                'season': self.season,
+            },
+            'teams': {
+                'home': {'id': home_id, 'name': f"Team {home_id}", 'logo': f"https://media.api-sports.io/football/teams/{home_id}.png"},
+                'away': {'id': away_id, 'name': f"Team {away_id}", 'logo': f"https://media.api-sports.io/football/teams/{away_id}.png"},
+            },
+            'goals': {
+                'home': rng.randint(0, 4) if started else None,
+                'away': rng.randint(0, 4) if started else None,
+            },
+        }
+        if events:
+            # أحداث المباريات المباشرة هي الجزء الأثقل في استجابة live=all
+            fixture['events'] = [
+                {'time': {'elapsed': rng.randint(1, 90)}, 'team': {'id': home_id},
+                 'player': {'name': 'Player'}, 'type': 'Card', 'detail': 'Yellow Card'}
+                for _ in range(rng.randint(0, 12))
+            ]
+        return fixture
+
+    def season_fixtures(self, league_id, season):
+        """مباريات منتهية حتمية لموسم دوري (نفسها في كل طلب)، جولة كل أسبوع"""
+        key = (league_id, season)
+        if key not in self._seasons:
+            rng = random.Random(f"{self.seed}-{league_id}-{season}")
+            fixtures = []
+            for week in range(self.weeks):
+                order = list(self.teams[league_id])
+                rng.shuffle(order)
+                date = self.created - timedelta(days=7 * (self.weeks - week))
+                for n in range(0, len(order) - 1, 2):
+                    fixture = self._fixture('FT', league_id, order[n], order[n + 1], date, rng=rng)
+                    fixture['fixture']['id'] = league_id * 10000 + week * 100 + n // 2
+                    fixture['league']['season'] = season
+                    fixtures.append(fixture)
+            self._seasons[key] = fixtures
+        return self._seasons[key]
+
+    # معالجات endpoints
+    def leagues_response(self, params):
+        if 'team' in params:
+            team_id = int(params['team'])
+            return [self._league(team_id // 100)] if team_id // 100 <= len(self.leagues) else []
+        return self.leagues
+
+    def fixtures_response(self, params):
+        if 'live' in params:
+            if params['live'] == 'all':
+                return self.live
+            wanted = {int(league_id) for league_id in params['live'].split('-')}
+            return [fixture for fixture in self.live if fixture['league']['id'] in wanted]
+
+        if 'date' in params:
+            return self.day
+
+        season = int(params.get('season', self.season))
+
+        if 'team' in params:
+            team_id = int(params['team'])
+            league_id = int(params.get('league') or team_id // 100)
+            if league_id not in self.teams or team_id not in self.teams[league_id]:
+                return []
+            fixtures = [
+                fixture for fixture in self.season_fixtures(league_id, season)
+                if team_id in (fixture['teams']['home']['id'], fixture['teams']['away']['id'])
+            ]
+            fixtures.sort(key=lambda fixture: fixture['fixture']['date'], reverse=True)
+            return fixtures[:int(params.get('last', 10))]
+
+        if 'league' in params:
+            league_id = int(params['league'])
+            if league_id not in self.teams:
+                return []
+            first, last = params.get('from', '0000-00-00'), params.get('to', '9999-99-99')
+            return [
+                fixture for fixture in self.season_fixtures(league_id, season)
+                if first <= fixture['fixture']['date'][:10] <= last
+            ]
+
+        return []
+
+    def standings_response(self, params):
+        league_id = int(params.get('league', 0))
+        if league_id not in self.teams:
+            return []
+        league = self._league(league_id)
+        table = [
+            {
+                'rank': rank,
+                'team': {'id': team_id, 'name': f"Team {team_id}"},
+                'points': 60 - rank * 2,
+                'all': {'played': 30, 'win': 20 - rank // 2, 'draw': 5, 'lose': 5 + rank // 2},
+            }
+            for rank, team_id in enumerate(self.teams[league_id], start=1)
+        ]
+        return [{'league': {
+            'id': league_id,
+            'name': league['league']['name'],
+            'season': int(params.get('season', self.season)),
+            'standings': [table],
+        }}]
+
+
+class MockApiServer:
+    """تشغيل الخادم البديل في خيط خلفي داخل نفس العملية"""
+
+    def __init__(self, port=0, latency=0.0, rate_limit=0, recorded_dir=None, data=None):
+        self.latency = latency          # ثوانٍ لكل طلب
+        self.rate_limit = rate_limit    # طلبات في الدقيقة (0 = بدون حد)
+        self.recorded_dir = recorded_dir
+        self.data = data or SyntheticData()
+        self.requests = Counter()
+        self.rate_limited = 0
+        self.bytes_sent = 0
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests.clear()
+            self.rate_limited = 0
+            self.bytes_sent = 0
+
+    def _allow(self):
+        if not self.rate_limit:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            if len(self._recent) >= self.rate_limit:
+                self.rate_limited += 1
+                return False
+            self._recent.append(now)
+            return True
+
+    def _recorded(self, endpoint, params):
+        if not self.recorded_dir:
+            return None
+        path = os.path.join(self.recorded_dir, endpoint, recorded_key(params) + '.json')
+        if os.path.exists(path):
+            with open(path, 'rb') as handle:
+                return handle.read()
+        return None
+
+    def handle(self, request):
+        parsed = urlparse(request.path)
+        endpoint = parsed.path.strip('/')
+        params = dict(parse_qsl(parsed.query))
+
+        with self._lock:
+            self.requests[endpoint] += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if not self._allow():
+            self._send(request, 429, json.dumps({
+                'errors': {'rateLimit': 'Too many requests. Your rate limit is exceeded.'}, 'response': []
+            }).encode())
+            return
+
+        body = self._recorded(endpoint, params)
+        if body is None:
+            handler = {
+                'leagues': self.data.leagues_response,
+                'fixtures': self.data.fixtures_response,
+                'standings': self.data.standings_response,
+            }.get(endpoint)
+            if handler is None:
+                self._send(request, 404, b'{"errors": {"endpoint": "not found"}, "response": []}')
+                return
+            response = handler(params)
+            body = json.dumps({
+                'get': endpoint, 'parameters': params, 'errors': [],
+                'results': len(response), 'response': response,
+            }).encode()
+
+        self._send(request, 200, body)
+
+    def _send(self, request, status, body):
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+        with self._lock:
+            self.bytes_sent += len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0, help='milliseconds per request')
+    parser.add_argument('--rate-limit', type=int, default=0, help='requests per minute (0 = unlimited)')
+    parser.add_argument('--recorded', help='directory of recorded responses')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    server = MockApiServer(
+        port=args.port, latency=args.latency / 1000, rate_limit=args.rate_limit,
+        recorded_dir=args.recorded, data=SyntheticData(seed=args.seed)
+    )
+    print(f"Mock api-sports server on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(dict(server.requests))
+
+
+if __name__ == '__main__':
+    main()
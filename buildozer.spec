@@ -18,12 +18,15 @@ source.include_exts = py,png,jpg,kv,atlas,ttf,json
 # (list) Source files to exclude (let empty to not exclude anything)
 #source.exclude_exts = spec
 
+# (list) List of directory to exclude (let empty to not exclude anything)
+source.exclude_dirs = bench, api_archive
+
 # (str) Application versioning
 version = 0.5
 android.version_code = 5
 
 # (list) Application requirements
-requirements = python3,kivy==2.3.0,kivymd==1.2.0,requests,certifi,urllib3,chardet,idna
+requirements = python3,kivy==2.3.0,kivymd==1.2.0,requests,certifi,urllib3,chardet,idna,numpy
 
 # (str) Presplash of the application (اختياري)
 #presplash.filename = data/presplash.png
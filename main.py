@@ -1,6 +1,6 @@
 from kivy.core.window import Window
 from kivy.lang import Builder
-from kivy.properties import StringProperty, ListProperty, BooleanProperty, DictProperty, NumericProperty
+from kivy.properties import StringProperty, ListProperty, BooleanProperty, DictProperty, NumericProperty, ObjectProperty
 from kivy.clock import Clock, mainthread
 from kivy.utils import platform, get_color_from_hex
 from kivy.metrics import dp
@@ -8,32 +8,72 @@ from kivy.animation import Animation
 from kivy.uix.relativelayout import RelativeLayout
 from datetime import datetime, timedelta
 import threading
-import requests
+import logging
+import logging.handlers
+import queue
 import json
+import math
+import codecs
 import os
+import sys
+import atexit
 import time
 import sqlite3
-from collections import OrderedDict
+import unicodedata
+import re
+from collections import OrderedDict, namedtuple, deque, Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlparse
 
 from kivy.core.clipboard import Clipboard 
 
 from kivymd.app import MDApp
-from kivymd.uix.snackbar import Snackbar
 from kivymd.uix.list import OneLineListItem, TwoLineListItem, OneLineIconListItem
 from kivymd.uix.floatlayout import MDFloatLayout
-from kivymd.uix.textfield import MDTextField
 from kivymd.uix.button import MDFlatButton, MDRaisedButton, MDIconButton
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.scrollview import ScrollView
 from kivymd.uix.gridlayout import MDGridLayout
-from kivymd.uix.dialog import MDDialog
 from kivymd.uix.list import OneLineAvatarIconListItem
-from kivymd.uix.selectioncontrol import MDCheckbox
 from kivymd.uix.card import MDCard
-from kivymd.uix.progressbar import MDProgressBar
 from kivymd.uix.label import MDLabel
 from kivymd.uix.boxlayout import MDBoxLayout
 
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """تمرير السجل كما هو: التنسيق يتم في خيط المستمع وليس في الخيط المستدعي"""
+
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(level=None):
+    """
+    مسجل بمستويات مع كتابة غير متزامنة عبر QueueListener
+    المستوى الافتراضي DEBUG على سطح المكتب و INFO في نسخة Android (release)،
+    ويمكن تغييره عبر FOOTBALL_LOG_LEVEL؛ رسائل المستوى الأقل لا تنسق إطلاقاً
+    """
+    if level is None:
+        level = os.environ.get('FOOTBALL_LOG_LEVEL') or ('INFO' if platform == 'android' else 'DEBUG')
+
+    logger = logging.getLogger('football')
+    logger.setLevel(level)
+    logger.propagate = False
+
+    if not logger.handlers:
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(logging.Formatter('%(levelname).1s %(message)s'))
+        listener = logging.handlers.QueueListener(queue.SimpleQueue(), output)
+        logger.addHandler(_DeferredQueueHandler(listener.queue))
+        listener.start()
+        atexit.register(listener.stop)
+
+    return logger
+
+
+log = setup_logging()
+
+
 if platform not in ("android", "ios"):
     Window.size = (400, 800)
 
@@ -43,7 +83,7 @@ class SQLiteStorage:
         self.db_path = self._get_external_db_path(db_name)
         self._ensure_db_directory()
         self.init_database()
-        print(f"📁 SQLite DB Path: {self.db_path}")
+        log.info("📁 SQLite DB Path: %s", self.db_path)
 
     def _get_external_db_path(self, db_name):
         """
@@ -63,7 +103,7 @@ class SQLiteStorage:
                 return os.path.join(app_folder, db_name)
 
             except Exception as e:
-                print(f"❌ Storage error: {e}")
+                log.error("❌ Storage error: %s", e)
                 return db_name
         else:
             return db_name
@@ -74,7 +114,7 @@ class SQLiteStorage:
             if db_dir and not os.path.exists(db_dir):
                 os.makedirs(db_dir, exist_ok=True)
         except Exception as e:
-            print(f"❌ Directory error: {e}")
+            log.error("❌ Directory error: %s", e)
 
     def get_connection(self):
         return sqlite3.connect(self.db_path)
@@ -176,12 +216,172 @@ class SQLiteStorage:
                 )
             """)
 
+            # جداول الأبعاد: الفرق والدوريات (المباريات تحمل المعرفات فقط)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS dim_teams (
+                    team_id INTEGER PRIMARY KEY,
+                    name TEXT,
+                    logo TEXT
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS dim_leagues (
+                    league_id INTEGER PRIMARY KEY,
+                    name TEXT,
+                    country TEXT,
+                    season INTEGER,
+                    type TEXT,
+                    logo TEXT,
+                    country_code TEXT,
+                    flag TEXT
+                )
+            """)
+
+            # سجل طلبات API (اختياري، يفعل من شاشة API Performance)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS api_calls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp REAL,
+                    endpoint TEXT,
+                    params TEXT,
+                    status INTEGER,
+                    latency_ms REAL,
+                    bytes INTEGER,
+                    cache TEXT,
+                    caller TEXT,
+                    via TEXT
+                )
+            """)
+
+            # كتالوج الدوريات الحالية (/leagues?current=true) بترتيب الاستجابة
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS league_catalog (
+                    league_id INTEGER PRIMARY KEY,
+                    position INTEGER
+                )
+            """)
+
+            # أزواج الترتيب الممنوعة في NS Perfect 1_1 (الإصدار في filter_settings)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS rank_pair_policy (
+                    winner_rank INTEGER,
+                    loser_rank INTEGER,
+                    PRIMARY KEY (winner_rank, loser_rank)
+                )
+            """)
+
+            # مستودع جداول الترتيب النهائية للمواسم المنتهية: جدول كامل لكل (دوري، موسم)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS standings_warehouse (
+                    league_id INTEGER,
+                    season INTEGER,
+                    team_id INTEGER,
+                    rank INTEGER,
+                    points INTEGER,
+                    played INTEGER,
+                    won INTEGER,
+                    draw INTEGER,
+                    lost INTEGER,
+                    league_name TEXT,
+                    PRIMARY KEY (league_id, season, team_id)
+                )
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_standings_warehouse_team
+                ON standings_warehouse(team_id, season)
+            """)
+
+            # الجداول المحملة (حتى الفارغة منها، مثل الكؤوس بلا ترتيب) حتى لا تطلب مرة أخرى
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS standings_loads (
+                    league_id INTEGER,
+                    season INTEGER,
+                    teams INTEGER,
+                    loaded_at REAL,
+                    PRIMARY KEY (league_id, season)
+                )
+            """)
+
+            # مستودع المباريات المنتهية لكل (دوري، موسم) لحساب أداء الفرق محلياً
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS fixtures_warehouse (
+                    fixture_id INTEGER PRIMARY KEY,
+                    league_id INTEGER,
+                    season INTEGER,
+                    date TEXT,
+                    home_team_id INTEGER,
+                    away_team_id INTEGER,
+                    home_goals INTEGER,
+                    away_goals INTEGER,
+                    status TEXT
+                )
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_fixtures_warehouse_home
+                ON fixtures_warehouse(home_team_id, league_id, season, date)
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_fixtures_warehouse_away
+                ON fixtures_warehouse(away_team_id, league_id, season, date)
+            """)
+
+            # آخر مزامنة لكل (دوري، موسم): high_water تاريخ أحدث مباراة محفوظة
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS fixture_sync (
+                    league_id INTEGER,
+                    season INTEGER,
+                    high_water TEXT,
+                    synced_at REAL,
+                    PRIMARY KEY (league_id, season)
+                )
+            """)
+
+            # ترتيب الفرق في المواسم المنتهية (data_json فارغ = الفريق غير موجود في أي جدول ترتيب)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS last_season_ranks (
+                    team_id INTEGER,
+                    season INTEGER,
+                    league_id INTEGER,
+                    data_json TEXT,
+                    resolved_at REAL,
+                    PRIMARY KEY (team_id, season)
+                )
+            """)
+
+            # نتائج الفلاتر المحفوظة: تعاد ما دام إصدار الفلتر وبصمة مدخلات المباراة لم يتغيرا
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS verdict_cache (
+                    filter_id TEXT,
+                    match_id INTEGER,
+                    filter_version TEXT,
+                    fingerprint TEXT,
+                    passed INTEGER,
+                    reason TEXT,
+                    created_at REAL,
+                    PRIMARY KEY (filter_id, match_id)
+                )
+            """)
+
+            # إصدارات البيانات (DataVersions) حتى لا تعود إلى 0 بعد إعادة التشغيل
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS data_versions (
+                    kind TEXT,
+                    item TEXT,
+                    version INTEGER,
+                    PRIMARY KEY (kind, item)
+                )
+            """)
+
             conn.commit()
             conn.close()
-            print("✅ Database initialized")
+            log.info("✅ Database initialized")
 
         except Exception as e:
-            print(f"❌ DB init error: {e}")
+            log.error("❌ DB init error: %s", e)
     
     def get_connection(self):
         return sqlite3.connect(self.db_path)
@@ -198,7 +398,7 @@ class SQLiteStorage:
         for row in rows:
             try:
                 match_data = json.loads(row[0])
-                favorites.append(match_data)
+                favorites.append(Match.from_dict(match_data))
             except:
                 pass
         return favorites
@@ -212,7 +412,7 @@ class SQLiteStorage:
         
         for match in favorites:
             try:
-                match_data = json.dumps(match)
+                match_data = json.dumps(match.to_dict())
                 cursor.execute('INSERT INTO favorites (match_data) VALUES (?)', (match_data,))
             except:
                 pass
@@ -232,7 +432,7 @@ class SQLiteStorage:
         for row in rows:
             try:
                 match_data = json.loads(row[0])
-                hidden_matches.append(match_data)
+                hidden_matches.append(Match.from_dict(match_data))
             except:
                 pass
         return hidden_matches
@@ -245,7 +445,7 @@ class SQLiteStorage:
         
         for match in hidden_matches:
             try:
-                match_data = json.dumps(match)
+                match_data = json.dumps(match.to_dict())
                 cursor.execute('INSERT INTO hidden_matches (match_data) VALUES (?)', (match_data,))
             except:
                 pass
@@ -335,442 +535,3324 @@ class SQLiteStorage:
         conn.commit()
         conn.close()
     
-    # دوال كاش Perfect2_2
-    def load_perfect2_2_cache(self):
-        """تحميل كاش Perfect2_2 من قاعدة البيانات"""
-        cache = {}
+    def load_setting(self, setting_name, default=None):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT setting_value FROM filter_settings WHERE setting_name = ?', (setting_name,))
+        row = cursor.fetchone()
+        conn.close()
+
+        return row[0] if row else default
+
+    def save_api_calls(self, records):
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
-            
-            cursor.execute('SELECT * FROM perfect2_2_cache')
-            rows = cursor.fetchall()
-            
-            for row in rows:
-                match_id = row[0]
-                cache[match_id] = {
-                    'home_team_id': row[1],
-                    'away_team_id': row[2],
-                    'league_id': row[3],
-                    'home_goals_last3': row[4],
-                    'home_goals_against_last3': row[5],
-                    'away_goals_last3': row[6],
-                    'away_goals_against_last3': row[7],
-                    'home_rank_current': row[8],
-                    'home_rank_last': row[9],
-                    'away_rank_current': row[10],
-                    'away_rank_last': row[11],
-                    'stored_time': row[12],
-                    'expires_at': row[13]
-                }
-            
+            cursor.executemany("""
+                INSERT INTO api_calls (timestamp, endpoint, params, status, latency_ms, bytes, cache, caller, via)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [tuple(record) for record in records])
+            conn.commit()
             conn.close()
-            print(f"✅ تم تحميل {len(rows)} سجل من كاش Perfect2_2")
-            
+
         except Exception as e:
-            print(f"❌ خطأ في تحميل كاش Perfect2_2: {e}")
-        
-        return cache
-    
-    def save_perfect2_2_cache(self, cache):
-        """حفظ كاش Perfect2_2 في قاعدة البيانات"""
+            log.error("❌ خطأ في حفظ سجل طلبات API: %s", e)
+
+    # لقطة المباريات المباشرة (تعرض فوراً عند بدء التشغيل)
+    def load_live_snapshot(self):
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
-            
-            # مسح القديم
-            cursor.execute('DELETE FROM perfect2_2_cache')
-            
-            # إضافة الجديد
-            for match_id, data in cache.items():
-                cursor.execute('''
-                    INSERT INTO perfect2_2_cache 
-                    (match_id, home_team_id, away_team_id, league_id, 
-                     home_goals_last3, home_goals_against_last3,
-                     away_goals_last3, away_goals_against_last3,
-                     home_rank_current, home_rank_last,
-                     away_rank_current, away_rank_last,
-                     stored_time, expires_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    match_id,
-                    data.get('home_team_id'),
-                    data.get('away_team_id'),
-                    data.get('league_id'),
-                    data.get('home_goals_last3', 0),
-                    data.get('home_goals_against_last3', 0),
-                    data.get('away_goals_last3', 0),
-                    data.get('away_goals_against_last3', 0),
-                    data.get('home_rank_current'),
-                    data.get('home_rank_last'),
-                    data.get('away_rank_current'),
-                    data.get('away_rank_last'),
-                    data.get('stored_time', datetime.now().isoformat()),
-                    data.get('expires_at')
-                ))
-            
-            conn.commit()
+            cursor.execute("""
+                SELECT data_json FROM api_cache
+                WHERE endpoint = 'live_snapshot' AND params_hash = 'latest' AND expires_at > ?
+            """, (time.time(),))
+            row = cursor.fetchone()
             conn.close()
-            print(f"✅ تم حفظ {len(cache)} سجل في كاش Perfect2_2")
-            
-        except Exception as e:
-            print(f"❌ خطأ في حفظ كاش Perfect2_2: {e}")
 
+            if row:
+                return [Match.from_dict(data) for data in json.loads(row[0])]
 
-class CalendarHeader(MDBoxLayout):
-    selected_date = StringProperty("")
-    
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.app = MDApp.get_running_app()
-        self.current_date = datetime.now().date()
-        self.min_date = datetime.now().date() - timedelta(days=30)
-        self.max_date = datetime.now().date() + timedelta(days=365)
-        self.update_display()
-    
-    def update_display(self):
-        today = datetime.now().date()
-        
-        if hasattr(self, 'ids'):
-            if 'prev_btn' in self.ids:
-                self.ids.prev_btn.disabled = self.current_date <= self.min_date
-            if 'next_btn' in self.ids:
-                self.ids.next_btn.disabled = self.current_date >= self.max_date
-        
-        if self.current_date == today:
-            self.selected_date = "TODAY"
-        elif self.current_date == today + timedelta(days=1):
-            self.selected_date = "TOMORROW"
-        elif self.current_date == today + timedelta(days=2):
-            self.selected_date = "DAY AFTER"
-        else:
-            self.selected_date = self.current_date.strftime('%d/%m/%Y')
-    
-    def previous_day(self):
-        new_date = self.current_date - timedelta(days=1)
-        if new_date >= self.min_date:
-            self.current_date = new_date
-            self.update_display()
-            self.app.on_calendar_date_selected(self.current_date)
-    
-    def next_day(self):
-        new_date = self.current_date + timedelta(days=1)
-        if new_date <= self.max_date:
-            self.current_date = new_date
-            self.update_display()
-            self.app.on_calendar_date_selected(self.current_date)
+        except Exception as e:
+            log.error("❌ خطأ في تحميل لقطة المباريات المباشرة: %s", e)
 
+        return []
 
-class StatsPopup(MDFloatLayout):
-    home_team_name = StringProperty("")
-    away_team_name = StringProperty("")
-    first_team_name_display = StringProperty("")
-    second_team_name_display = StringProperty("")
-    first_team_goals_for = StringProperty("0")
-    first_team_goals_against = StringProperty("0")
-    second_team_goals_for = StringProperty("0")
-    second_team_goals_against = StringProperty("0")
-    first_team_label = StringProperty("") 
-    second_team_label = StringProperty("")
-    first_team_color = StringProperty("green")
-    second_team_color = StringProperty("green")
-    
-    first_team_current_rank = StringProperty("-")
-    first_team_last_rank = StringProperty("-")
-    first_team_points = StringProperty("-")
-    first_team_played = StringProperty("-")
-    
-    second_team_current_rank = StringProperty("-")
-    second_team_last_rank = StringProperty("-")
-    second_team_points = StringProperty("-")
-    second_team_played = StringProperty("-")
-    
-    first_last_rank_color = StringProperty("#AAAAAA")
-    second_last_rank_color = StringProperty("#AAAAAA")
-    
-    # خصائص جديدة لعرض بيانات الكاش
-    from_cache = BooleanProperty(False)
-    cache_data = DictProperty({})
-    
-    def copy_team_rank_info(self, team_type, copy_type="current"):
+    def save_live_snapshot(self, matches, max_age=3 * 3600):
         try:
-            if team_type == 'first':
-                current_rank = self.first_team_current_rank
-                last_rank = self.first_team_last_rank
-                opponent_current_rank = self.second_team_current_rank
-                opponent_last_rank = self.second_team_last_rank
-                team_name = self.first_team_name_display
-            elif team_type == 'second':
-                current_rank = self.second_team_current_rank
-                last_rank = self.second_team_last_rank
-                opponent_current_rank = self.first_team_current_rank
-                opponent_last_rank = self.first_team_last_rank
-                team_name = self.second_team_name_display
-            else:
-                MDApp.get_running_app().show_snackbar("❌ خطأ: نوع الفريق غير معروف")
-                return
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO api_cache (endpoint, params_hash, data_json, expires_at)
+                VALUES ('live_snapshot', 'latest', ?, ?)
+            """, (json.dumps([match.to_dict() for match in matches]), time.time() + max_age))
+            conn.commit()
+            conn.close()
 
-            def clean_rank(rank):
-                cleaned = ''.join(filter(str.isdigit, str(rank))) 
-                return cleaned if cleaned else '0'
+        except Exception as e:
+            log.error("❌ خطأ في حفظ لقطة المباريات المباشرة: %s", e)
 
-            if copy_type == "current":
-                team_rank = clean_rank(current_rank)
-                opponent_rank = clean_rank(opponent_current_rank)
-                copied_text = f"{team_rank}{opponent_rank}"
-                message_type = "الترتيب الحالي"
-            else:  
-                team_rank = clean_rank(last_rank)
-                opponent_rank = clean_rank(opponent_last_rank)
-                copied_text = f"{team_rank}{opponent_rank}"
-                message_type = "ترتيب الموسم الماضي"
+    # دوال كتالوج الدوريات
+    def load_league_catalog(self):
+        """تحميل كتالوج الدوريات المحفوظ بنفس صيغة all_leagues"""
+        leagues = []
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT d.league_id, d.name, d.type, d.logo, d.country, d.country_code, d.flag, d.season
+                FROM league_catalog c JOIN dim_leagues d ON d.league_id = c.league_id
+                ORDER BY c.position
+            """)
+            for row in cursor.fetchall():
+                leagues.append({
+                    'id': row[0],
+                    'name': row[1],
+                    'type': row[2],
+                    'logo': row[3],
+                    'country_name': row[4],
+                    'country_code': row[5],
+                    'flag': row[6],
+                    'season': row[7]
+                })
+            conn.close()
 
-            # نسخ إلى الحافظة
-            Clipboard.copy(copied_text)
-            MDApp.get_running_app().show_snackbar(
-                f"✅ تم نسخ {message_type} لـ {team_name}: {copied_text}", 
-                duration=3
+        except Exception as e:
+            log.error("❌ خطأ في تحميل كتالوج الدوريات: %s", e)
+
+        return leagues
+
+    def save_league_catalog(self, leagues):
+        """حفظ عضوية الكتالوج ووقت الجلب (بيانات الدوريات نفسها في dim_leagues)"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('DELETE FROM league_catalog')
+            cursor.executemany(
+                'INSERT OR IGNORE INTO league_catalog (league_id, position) VALUES (?, ?)',
+                [(league['id'], position) for position, league in enumerate(leagues) if league.get('id') is not None]
             )
-            
-            print(f"📋 تم النسخ: {copied_text} للفريق {team_name} ({message_type})")
-            
+            cursor.execute('''
+                INSERT OR REPLACE INTO filter_settings (setting_name, setting_value)
+                VALUES ('league_catalog_fetched_at', ?)
+            ''', (str(time.time()),))
+
+            conn.commit()
+            conn.close()
+
         except Exception as e:
-            print(f"❌ خطأ في النسخ: {e}")
-            MDApp.get_running_app().show_snackbar(f"❌ فشل النسخ: {e}")
+            log.error("❌ خطأ في حفظ كتالوج الدوريات: %s", e)
 
+    # دوال سياسة أزواج الترتيب
+    def load_rank_pair_policy(self):
+        """(الأزواج، الإصدار)، والإصدار 0 يعني أن السياسة لم تحفظ بعد"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute('SELECT winner_rank, loser_rank FROM rank_pair_policy')
+            pairs = {(row[0], row[1]) for row in cursor.fetchall()}
+            cursor.execute("SELECT setting_value FROM filter_settings WHERE setting_name = 'rank_pair_policy_version'")
+            row = cursor.fetchone()
+            conn.close()
+            return pairs, int(row[0]) if row else 0
 
-class LeagueItem(OneLineAvatarIconListItem):
-    def __init__(self, league_name, league_id, **kwargs):
-        super().__init__(**kwargs)
-        self.text = league_name
-        self.league_id = league_id
-        self.selected = False
+        except Exception as e:
+            log.error("❌ خطأ في تحميل سياسة أزواج الترتيب: %s", e)
+            return set(), 0
 
-    def toggle_checkbox(self):
-        self.selected = not self.selected
-        self.ids.check.icon = "checkbox-marked" if self.selected else "checkbox-blank-outline"
+    def save_rank_pair_policy(self, pairs, version):
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
 
+            cursor.execute('DELETE FROM rank_pair_policy')
+            cursor.executemany(
+                'INSERT INTO rank_pair_policy (winner_rank, loser_rank) VALUES (?, ?)',
+                sorted(pairs)
+            )
+            cursor.execute('''
+                INSERT OR REPLACE INTO filter_settings (setting_name, setting_value)
+                VALUES ('rank_pair_policy_version', ?)
+            ''', (str(version),))
 
-class FavoriteLeagueItem(OneLineAvatarIconListItem):
-    def __init__(self, league_name, league_id, **kwargs):
-        super().__init__(**kwargs)
-        self.text = league_name
-        self.league_id = league_id
+            conn.commit()
+            conn.close()
 
-    def remove_favorite(self):
-        app = MDApp.get_running_app()
-        app.remove_favorite_league(self.league_id)
+        except Exception as e:
+            log.error("❌ خطأ في حفظ سياسة أزواج الترتيب: %s", e)
+
+    # دوال مستودع جداول الترتيب
+    def load_standings_table(self, league_id, season):
+        """صفوف (team_id, rank, points, played, won, draw, lost, league_name) أو None إن لم يحمل الجدول بعد"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT 1 FROM standings_loads WHERE league_id = ? AND season = ?',
+                (league_id, season)
+            )
+            if cursor.fetchone() is None:
+                conn.close()
+                return None
 
+            cursor.execute("""
+                SELECT team_id, rank, points, played, won, draw, lost, league_name
+                FROM standings_warehouse WHERE league_id = ? AND season = ?
+            """, (league_id, season))
+            rows = cursor.fetchall()
+            conn.close()
+            return rows
 
-class LoadingWidget(MDBoxLayout):
-    loading_text = StringProperty("Loading data...")
-    progress_value = NumericProperty(0)
-    status_text = StringProperty("Initializing...")
+        except Exception as e:
+            log.error("❌ خطأ في تحميل جدول الترتيب: %s", e)
+            return None
 
+    def save_standings_table(self, league_id, season, rows):
+        """rows: (team_id, rank, points, played, won, draw, lost, league_name)"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR REPLACE INTO standings_warehouse
+                (league_id, season, team_id, rank, points, played, won, draw, lost, league_name)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(league_id, season) + tuple(row) for row in rows])
+            cursor.execute("""
+                INSERT OR REPLACE INTO standings_loads (league_id, season, teams, loaded_at)
+                VALUES (?, ?, ?, ?)
+            """, (league_id, season, len(rows), time.time()))
+            conn.commit()
+            conn.close()
 
-class ErrorWidget(MDBoxLayout):
-    error_text = StringProperty("Loading error")
+        except Exception as e:
+            log.error("❌ خطأ في حفظ جدول الترتيب: %s", e)
 
+    def find_team_leagues(self, team_id, season):
+        """الدوريات المحملة التي يظهر الفريق في جدولها لهذا الموسم"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT league_id FROM standings_warehouse WHERE team_id = ? AND season = ? AND rank IS NOT NULL',
+                (team_id, season)
+            )
+            league_ids = [row[0] for row in cursor.fetchall()]
+            conn.close()
+            return league_ids
 
-class OptimizedCompactMatchItem(MDCard):
-    match_data = DictProperty({})
-    is_fav = BooleanProperty(False)
-    is_live = BooleanProperty(False)
-    
-    league_name = StringProperty("")
-    home_team = StringProperty("")
-    away_team = StringProperty("")
-    home_score = StringProperty("-")
-    away_score = StringProperty("-")
-    full_score = StringProperty("VS")
-    match_status = StringProperty("")
-    match_time = StringProperty("")
-    events_text = StringProperty("")
+        except Exception as e:
+            log.error("❌ خطأ في البحث في جداول الترتيب: %s", e)
+            return []
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.bind(match_data=self.on_match_data)
+    # دوال مستودع المباريات
+    def load_fixture_high_water(self, league_id, season):
+        """تاريخ أحدث مباراة محفوظة ('' إن لم توجد مباريات)، أو None إن لم يزامن الدوري بعد"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT high_water FROM fixture_sync WHERE league_id = ? AND season = ?',
+                (league_id, season)
+            )
+            row = cursor.fetchone()
+            conn.close()
+            return (row[0] or '') if row else None
 
-    def on_match_data(self, instance, value):
-        if value:
-            self.update_display()
+        except Exception as e:
+            log.error("❌ خطأ في تحميل حالة مزامنة المباريات: %s", e)
+            return None
 
-    def update_display(self):
+    def save_fixtures(self, league_id, season, rows, high_water):
+        """rows: (fixture_id, date, home_team_id, away_team_id, home_goals, away_goals, status)"""
         try:
-            self.league_name = self.match_data.get('league', 'Loading...')
-            
-            home_team_name = self.match_data.get('home_team', 'Home Team')
-            away_team_name = self.match_data.get('away_team', 'Away Team')
-            
-            if len(home_team_name) > 15:
-                self.home_team = home_team_name[:12] + "..."
-            else:
-                self.home_team = home_team_name
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR REPLACE INTO fixtures_warehouse
+                (fixture_id, league_id, season, date, home_team_id, away_team_id, home_goals, away_goals, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(row[0], league_id, season) + tuple(row[1:]) for row in rows])
+            cursor.execute("""
+                INSERT OR REPLACE INTO fixture_sync (league_id, season, high_water, synced_at)
+                VALUES (?, ?, ?, ?)
+            """, (league_id, season, high_water, time.time()))
+            conn.commit()
+            conn.close()
+            return True
 
-            if len(away_team_name) > 15:
-                self.away_team = away_team_name[:12] + "..."
-            else:
-                self.away_team = away_team_name
+        except Exception as e:
+            log.error("❌ خطأ في حفظ المباريات: %s", e)
+            return False
+
+    def load_team_form(self, team_id, league_id, season, is_home, count):
+        """آخر count مباراة منتهية (FT) للفريق على أرضه أو خارجها: [(home_goals, away_goals, date)]"""
+        side = 'home_team_id' if is_home else 'away_team_id'
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT home_goals, away_goals, date FROM fixtures_warehouse
+                WHERE {side} = ? AND league_id = ? AND season = ? AND status = 'FT'
+                ORDER BY date DESC LIMIT ?
+            """, (team_id, league_id, season, count))
+            rows = cursor.fetchall()
+            conn.close()
+            return rows
 
-            home_score = self.match_data.get('home_score')
-            away_score = self.match_data.get('away_score')
-            
-            self.home_score = str(home_score) if home_score is not None else "-"
-            self.away_score = str(away_score) if away_score is not None else "-"
-            
-            if home_score is not None and away_score is not None:
-                self.full_score = f"{home_score}-{away_score}"
-            else:
-                self.full_score = "VS"
-            
-            status = self.match_data.get('status', 'NS')
-            self.match_status = self.get_status_text(status)
-            self.match_time = self.get_time_text(status)
-            self.is_live = status in ['1H', '2H', 'HT', 'ET', 'P', 'BT', 'LIVE']
-            
-            if self.is_live:
-                self.md_bg_color = get_color_from_hex("000000") 
-                self.elevation = 2 
-            else:
-                self.md_bg_color = get_color_from_hex("#FFFFFF")
-                self.elevation = 1
-            
         except Exception as e:
-            print(f"Display update error: {e}")
-
-    def get_status_text(self, status):
-        status_map = {
-            'NS': 'NS', '1H': '1H', 'HT': 'HT',
-            '2H': '2H', 'ET': 'ET', 'P': 'P',
-            'FT': 'FT', 'AET': 'AET', 'PEN': 'PEN',
-            'BT': 'BT', 'SUSP': 'SUSP', 'INT': 'INT',
-            'PST': 'PST', 'CANC': 'CANC', 'LIVE': 'LIVE'
-        }
-        return status_map.get(status, status)
-
-    def get_time_text(self, status):
-        if status in ['1H', '2H', 'LIVE']:
-            elapsed = self.match_data.get('elapsed')
-            return f"{elapsed}'" if elapsed else "Live"
-        elif status == 'HT':
-            return "HT"
-        elif status == 'ET':
-            return "ET"
-        elif status == 'P':
-            return "PEN"
-        elif status == 'NS':
-            time_str = self.match_data.get('time', '')
-            if time_str:
-                try:
-                    dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-                    return dt.strftime('%H:%M')
-                except:
-                    return time_str[:16]
-        return self.match_status
+            log.error("❌ خطأ في حساب أداء الفريق: %s", e)
+            return None
 
-    def on_touch_down(self, touch):
-        if self.collide_point(*touch.pos):
-            hide_button = self.ids.hide_button
-            
-            safe_area_limit = self.x + self.width * 0.85
-            
-            if hide_button.collide_point(*touch.pos):
-                return super().on_touch_down(touch)
-            elif touch.x < safe_area_limit:
-                touch.ud['in_match_item'] = True
-                return True 
-        return super().on_touch_down(touch)
+    # دوال ترتيب المواسم المنتهية
+    def load_last_season_rank(self, team_id, season):
+        """(محفوظ؟، سجل الترتيب أو None)"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT data_json FROM last_season_ranks WHERE team_id = ? AND season = ?',
+                (team_id, season)
+            )
+            row = cursor.fetchone()
+            conn.close()
+            if row:
+                return True, json.loads(row[0]) if row[0] else None
 
-    def on_touch_up(self, touch):
-        if self.collide_point(*touch.pos):
-            hide_button = self.ids.hide_button
-            
-            safe_area_limit = self.x + self.width * 0.85
-            
-            if not hide_button.collide_point(*touch.pos) and touch.x < safe_area_limit:
-                app = MDApp.get_running_app()
-                app.show_stats_popup_improved(self.match_data)
-                return True
-                
-        return super().on_touch_up(touch)
+        except Exception as e:
+            log.error("❌ خطأ في تحميل ترتيب الموسم الماضي: %s", e)
 
-    def hide_match(self):
-        app = MDApp.get_running_app()
-        match_id = self.match_data.get('id')
-        
-        # تحقق إذا كانت المباراة في القائمة المخفية
-        is_in_hidden_list = app.is_hidden(match_id)
-        
-        if not is_in_hidden_list:
-            # إخفاء المباراة: إضافتها إلى القائمة المخفية
-            app.add_hidden_match(self.match_data)
-            app.show_snackbar(f"✅ Match hidden: {self.home_team} vs {self.away_team}")
-            
-            # إزالة المباراة من جميع القوائم مباشرة
-            app.remove_match_from_all_lists(match_id)
-            
-            # إزالة الودجت من الشاشة
-            parent = self.parent
-            if parent:
-                parent.remove_widget(self)
-        else:
-            # إزالة المباراة من القائمة المخفية
-            app.remove_hidden_match(match_id)
-            app.show_snackbar(f"✅ Match unhidden: {self.home_team} vs {self.away_team}")
-            
-            # إزالة الودجت من الشاشة
-            parent = self.parent
-            if parent:
-                parent.remove_widget(self)
+        return False, None
 
+    def save_last_season_rank(self, team_id, season, league_id, standings):
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO last_season_ranks (team_id, season, league_id, data_json, resolved_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (team_id, season, league_id, json.dumps(standings) if standings else None, time.time()))
+            conn.commit()
+            conn.close()
 
-KV = '''
-#:import get_color_from_hex kivy.utils.get_color_from_hex
-#:import dp kivy.metrics.dp
-#:import Animation kivy.animation.Animation
+        except Exception as e:
+            log.error("❌ خطأ في حفظ ترتيب الموسم الماضي: %s", e)
 
-<CalendarHeader>:
-    size_hint_y: None
-    height: dp(50)
-    orientation: 'horizontal'
-    spacing: dp(10)
-    padding: dp(5)
-    
-    MDIconButton:
-        id: prev_btn
-        icon: 'chevron-left'
-        theme_text_color: 'Custom'
-        text_color: get_color_from_hex("#2196F3")
-        on_release: root.previous_day()
-        
-    MDRaisedButton:
-        id: date_btn
-        text: root.selected_date
-        size_hint_x: 0.7
-        md_bg_color: get_color_from_hex("#2196F3")
-        
-    MDIconButton:
-        id: next_btn
-        icon: 'chevron-right'
-        theme_text_color: 'Custom'
-        text_color: get_color_from_hex("#2196F3")
-        on_release: root.next_day()
+    # دوال كاش نتائج الفلاتر
+    def load_verdict_cache(self, since):
+        """الصفوف المحفوظة بعد since: (filter_id, match_id, filter_version, fingerprint, passed, reason, created_at)"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT filter_id, match_id, filter_version, fingerprint, passed, reason, created_at
+                FROM verdict_cache WHERE created_at > ?
+            """, (since,))
+            rows = cursor.fetchall()
+            conn.close()
+            return rows
 
-<StatsPopup>:
-    size_hint: None, None
-    size: dp(210), dp(170)
-    pos_hint: {'center_x': 0.5, 'center_y': 0.9}
-    md_bg_color: get_color_from_hex("#000000")
-    radius: dp(45)
-    opacity: 0
-    
-    MDBoxLayout:
-        orientation: 'vertical'
-        spacing: dp(5)
-        padding: dp(15)
-        pos_hint: {'center_x': 0.5, 'center_y': 0.5}
-        
-        MDLabel:
+        except Exception as e:
+            log.error("❌ خطأ في تحميل كاش نتائج الفلاتر: %s", e)
+            return []
+
+    def save_verdicts(self, rows, prune_before):
+        """حفظ النتائج الجديدة وحذف ما هو أقدم من prune_before"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR REPLACE INTO verdict_cache
+                (filter_id, match_id, filter_version, fingerprint, passed, reason, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            cursor.execute('DELETE FROM verdict_cache WHERE created_at <= ?', (prune_before,))
+            conn.commit()
+            conn.close()
+
+        except Exception as e:
+            log.error("❌ خطأ في حفظ كاش نتائج الفلاتر: %s", e)
+
+    # دوال إصدارات البيانات
+    def load_data_versions(self):
+        """صفوف (kind, item, version)"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute('SELECT kind, item, version FROM data_versions')
+            rows = cursor.fetchall()
+            conn.close()
+            return rows
+
+        except Exception as e:
+            log.error("❌ خطأ في تحميل إصدارات البيانات: %s", e)
+            return []
+
+    def save_data_versions(self, rows):
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.executemany(
+                'INSERT OR REPLACE INTO data_versions (kind, item, version) VALUES (?, ?, ?)', rows
+            )
+            conn.commit()
+            conn.close()
+
+        except Exception as e:
+            log.error("❌ خطأ في حفظ إصدارات البيانات: %s", e)
+
+    # دوال كاش Perfect2_2
+    def load_perfect2_2_cache(self):
+        """تحميل كاش Perfect2_2 من قاعدة البيانات"""
+        cache = {}
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT * FROM perfect2_2_cache')
+            rows = cursor.fetchall()
+            
+            for row in rows:
+                match_id = row[0]
+                cache[match_id] = {
+                    'home_team_id': row[1],
+                    'away_team_id': row[2],
+                    'league_id': row[3],
+                    'home_goals_last3': row[4],
+                    'home_goals_against_last3': row[5],
+                    'away_goals_last3': row[6],
+                    'away_goals_against_last3': row[7],
+                    'home_rank_current': row[8],
+                    'home_rank_last': row[9],
+                    'away_rank_current': row[10],
+                    'away_rank_last': row[11],
+                    'stored_time': row[12],
+                    'expires_at': row[13]
+                }
+            
+            conn.close()
+            log.info("✅ تم تحميل %s سجل من كاش Perfect2_2", len(rows))
+            
+        except Exception as e:
+            log.error("❌ خطأ في تحميل كاش Perfect2_2: %s", e)
+        
+        return cache
+    
+    def save_perfect2_2_cache(self, cache):
+        """حفظ كاش Perfect2_2 في قاعدة البيانات"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            # مسح القديم
+            cursor.execute('DELETE FROM perfect2_2_cache')
+            
+            # إضافة الجديد
+            for match_id, data in cache.items():
+                cursor.execute('''
+                    INSERT INTO perfect2_2_cache 
+                    (match_id, home_team_id, away_team_id, league_id, 
+                     home_goals_last3, home_goals_against_last3,
+                     away_goals_last3, away_goals_against_last3,
+                     home_rank_current, home_rank_last,
+                     away_rank_current, away_rank_last,
+                     stored_time, expires_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    match_id,
+                    data.get('home_team_id'),
+                    data.get('away_team_id'),
+                    data.get('league_id'),
+                    data.get('home_goals_last3', 0),
+                    data.get('home_goals_against_last3', 0),
+                    data.get('away_goals_last3', 0),
+                    data.get('away_goals_against_last3', 0),
+                    data.get('home_rank_current'),
+                    data.get('home_rank_last'),
+                    data.get('away_rank_current'),
+                    data.get('away_rank_last'),
+                    data.get('stored_time', datetime.now().isoformat()),
+                    data.get('expires_at')
+                ))
+            
+            conn.commit()
+            conn.close()
+            log.debug("✅ تم حفظ %s سجل في كاش Perfect2_2", len(cache))
+            
+        except Exception as e:
+            log.error("❌ خطأ في حفظ كاش Perfect2_2: %s", e)
+
+    # دوال جداول الأبعاد
+    def load_dimensions(self):
+        """تحميل جداول الفرق والدوريات"""
+        teams = {}
+        leagues = {}
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('SELECT team_id, name, logo FROM dim_teams')
+            for row in cursor.fetchall():
+                teams[row[0]] = TeamDim(row[1], row[2])
+
+            cursor.execute("""
+                SELECT league_id, name, country, season, type, logo, country_code, flag
+                FROM dim_leagues
+            """)
+            for row in cursor.fetchall():
+                leagues[row[0]] = LeagueDim(*row[1:])
+
+            conn.close()
+            log.info("✅ تم تحميل %s فريق و %s دوري من جداول الأبعاد", len(teams), len(leagues))
+
+        except Exception as e:
+            log.error("❌ خطأ في تحميل جداول الأبعاد: %s", e)
+
+        return teams, leagues
+
+    def save_dimensions(self, teams, leagues):
+        """حفظ صفوف الأبعاد الجديدة أو المعدلة فقط"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.executemany(
+                'INSERT OR REPLACE INTO dim_teams (team_id, name, logo) VALUES (?, ?, ?)',
+                [(team_id, team.name, team.logo) for team_id, team in teams.items()]
+            )
+            cursor.executemany(
+                """
+                INSERT OR REPLACE INTO dim_leagues
+                (league_id, name, country, season, type, logo, country_code, flag)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [(league_id,) + tuple(league) for league_id, league in leagues.items()]
+            )
+
+            conn.commit()
+            conn.close()
+
+        except Exception as e:
+            log.error("❌ خطأ في حفظ جداول الأبعاد: %s", e)
+
+
+TeamDim = namedtuple('TeamDim', ['name', 'logo'])
+LeagueDim = namedtuple('LeagueDim', ['name', 'country', 'season', 'type', 'logo', 'country_code', 'flag'])
+
+
+class DimensionTables:
+    """
+    جداول أبعاد في الذاكرة: معرف الفريق ← الاسم/الشعار، معرف الدوري ← الاسم/البلد/الموسم
+    تملأ من /leagues ومن استجابات المباريات وتحفظ في SQLite
+    """
+
+    def __init__(self, storage=None):
+        self.storage = storage
+        self.teams = {}
+        self.leagues = {}
+        self._dirty_teams = set()
+        self._dirty_leagues = set()
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self.storage:
+            self.teams, self.leagues = self.storage.load_dimensions()
+
+    @staticmethod
+    def _merge(current, **values):
+        # الاحتفاظ بالقيم الموجودة عندما لا تحمل الاستجابة الجديدة قيمة
+        values = {
+            name: sys.intern(value) if isinstance(value, str) else value
+            for name, value in values.items()
+        }
+        if current is None:
+            return values
+        return {name: value if value is not None else getattr(current, name) for name, value in values.items()}
+
+    def add_team(self, team_id, name=None, logo=None):
+        if team_id is None:
+            return
+        current = self.teams.get(team_id)
+        team = TeamDim(**self._merge(current, name=name, logo=logo))
+        if team != current:
+            with self._lock:
+                self.teams[team_id] = team
+                self._dirty_teams.add(team_id)
+
+    def add_league(self, league_id, name=None, country=None, season=None,
+                   type=None, logo=None, country_code=None, flag=None):
+        if league_id is None:
+            return
+        current = self.leagues.get(league_id)
+        if current and current.season and season and season < current.season:
+            # مباريات المواسم السابقة لا ترجع موسم الدوري إلى الخلف
+            season = current.season
+        league = LeagueDim(**self._merge(
+            current, name=name, country=country, season=season,
+            type=type, logo=logo, country_code=country_code, flag=flag
+        ))
+        if league != current:
+            with self._lock:
+                self.leagues[league_id] = league
+                self._dirty_leagues.add(league_id)
+
+    def team_name(self, team_id, default=None):
+        team = self.teams.get(team_id)
+        return team.name if team and team.name else default
+
+    def league_name(self, league_id, default=None):
+        league = self.leagues.get(league_id)
+        return league.name if league and league.name else default
+
+    def flush(self):
+        """حفظ الصفوف المتغيرة منذ آخر حفظ"""
+        if not self.storage:
+            return
+
+        with self._lock:
+            teams = {team_id: self.teams[team_id] for team_id in self._dirty_teams}
+            leagues = {league_id: self.leagues[league_id] for league_id in self._dirty_leagues}
+            self._dirty_teams.clear()
+            self._dirty_leagues.clear()
+
+        if teams or leagues:
+            self.storage.save_dimensions(teams, leagues)
+
+
+class FixturesWarehouse:
+    """
+    المباريات المنتهية لكل (دوري، موسم) في SQLite تزامن تدريجياً: طلب واحد للدوري يجلب فقط
+    المباريات المنتهية منذ high-water mark (أحدث مباراة محفوظة)، وأداء الفرق (آخر مباريات الأرض/الخارج،
+    الأهداف له وعليه) استعلامات SQL مفهرسة بدل طلب last=15 لكل فريق
+
+    المباريات الجديدة ترفع إصدار سجل الفريقين وجدول الدوري في DataVersions فتبطل نتائج الفلاتر المعتمدة عليها
+    """
+
+    SYNC_STATUSES = 'FT-AET-PEN'
+
+    def __init__(self, app, storage=None, versions=None, sync_interval=1800, retry_after=60):
+        self.app = app
+        self.storage = storage
+        self.versions = versions
+        self.sync_interval = sync_interval
+        self.retry_after = retry_after
+        self._synced = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def sync(self, league_id, season, force=False):
+        """مزامنة الدوري إن مضى sync_interval على آخر مزامنة؛ True إذا كانت بياناته متاحة محلياً"""
+        if not self.storage or not league_id:
+            return False
+
+        key = (league_id, season)
+        with self._key_lock(key):
+            next_sync, available = self._synced.get(key, (0, False))
+            if not force and time.time() < next_sync:
+                return available
+
+            high_water = self.storage.load_fixture_high_water(league_id, season)
+            rows = self._download(league_id, season, high_water)
+            if rows is None or not self.storage.save_fixtures(
+                    league_id, season, rows, max([row[1] for row in rows] + [high_water or ''])):
+                # بدون شبكة تبقى المباريات المحفوظة صالحة، ونعيد المحاولة بعد retry_after
+                available = high_water is not None
+                self._synced[key] = (time.time() + self.retry_after, available)
+                return available
+
+            self._synced[key] = (time.time() + self.sync_interval, True)
+
+        new_rows = [row for row in rows if high_water is None or row[1] > high_water]
+        if new_rows and self.versions:
+            self.versions.bump_history({team_id for row in new_rows for team_id in (row[2], row[3])})
+            self.versions.bump_standings(league_id, season)
+        log.debug("🗄️ Fixtures warehouse: league %s season %s, %s new fixtures", league_id, season, len(new_rows))
+        return True
+
+    def _download(self, league_id, season, high_water):
+        """صفوف المباريات المنتهية منذ high_water (أو كل الموسم) أو None عند الفشل"""
+        params = {'league': league_id, 'season': season, 'status': self.SYNC_STATUSES}
+        if high_water:
+            # من يوم أحدث مباراة محفوظة (ضمناً) حتى اليوم، والمكرر يستبدل بنفس المعرف
+            params['from'] = high_water[:10]
+            params['to'] = datetime.now().strftime('%Y-%m-%d')
+
+        response = self.app.fetch_with_retry(f"{self.app.base_url}/fixtures", params)
+        if not response or response.status_code != 200:
+            return None
+        data = response.json()
+        if data.get('errors'):
+            return None
+
+        rows = []
+        for match in data.get('response', []):
+            fixture = match.get('fixture', {})
+            teams = match.get('teams', {})
+            goals = match.get('goals', {})
+            if fixture.get('id') is None:
+                continue
+            rows.append((
+                fixture.get('id'), fixture.get('date', ''),
+                teams.get('home', {}).get('id'), teams.get('away', {}).get('id'),
+                goals.get('home') or 0, goals.get('away') or 0,
+                fixture.get('status', {}).get('short')
+            ))
+        return rows
+
+    def team_form(self, team_id, league_id, season, is_home, count=3):
+        """[(home_goals, away_goals, date)] لآخر count مباراة، أو None إذا لم تتوفر بيانات الدوري محلياً"""
+        if not self.sync(league_id, season):
+            return None
+        return self.storage.load_team_form(team_id, league_id, season, is_home, count)
+
+    def sync_leagues(self, leagues):
+        """مزامنة قائمة (دوري، موسم) بالتسلسل (للدوريات المتابعة في الخلفية)"""
+        return sum(self.sync(league_id, season) for league_id, season in leagues)
+
+
+class StandingsWarehouse:
+    """
+    جداول الترتيب النهائية للمواسم المنتهية: جدول كامل لكل (دوري، موسم) يحمل بطلب واحد
+    عند أول حاجة ويحفظ في SQLite، ثم تقرأ منه كل فرق الدوري دون أي طلب (الموسم المنتهي لا يتغير)
+    """
+
+    def __init__(self, app, storage=None):
+        self.app = app
+        self.storage = storage
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def entry(league_id, season, rank, points, played, won, draw, lost, league_name):
+        """سجل ترتيب بنفس صيغة _fetch_season_standings"""
+        return {
+            'current_rank': str(rank if rank is not None else 'N/A'),
+            'points': str(points if points is not None else 'N/A'),
+            'played': str(played if played is not None else 'N/A'),
+            'won': won,
+            'draw': draw,
+            'lost': lost,
+            'season': season,
+            'league_name': league_name or '',
+            'league_id': league_id,
+        }
+
+    def table(self, league_id, season):
+        """{team_id: سجل الترتيب}، أو None إذا فشل التحميل (يعاد المحاولة لاحقاً)"""
+        key = (league_id, season)
+        with self._lock:
+            if key in self._tables:
+                return self._tables[key]
+
+        rows = self.storage.load_standings_table(league_id, season) if self.storage else None
+        if rows is None:
+            rows = self._download(league_id, season)
+            if rows is None:
+                return None
+            if self.storage:
+                self.storage.save_standings_table(league_id, season, rows)
+            log.debug("🗄️ Standings warehouse: league %s season %s, %s teams", league_id, season, len(rows))
+
+        table = {row[0]: self.entry(league_id, season, *row[1:]) for row in rows}
+        with self._lock:
+            self._tables[key] = table
+        return table
+
+    def standings(self, team_id, league_id, season):
+        table = self.table(league_id, season)
+        entry = table.get(team_id) if table else None
+        return dict(entry) if entry else None
+
+    def find_team(self, team_id, season):
+        """سجل الفريق في أول جدول محمل يظهر فيه لهذا الموسم (دون شبكة) أو None"""
+        for league_id in (self.storage.find_team_leagues(team_id, season) if self.storage else ()):
+            standings = self.standings(team_id, league_id, season)
+            if standings:
+                return standings
+        return None
+
+    def _download(self, league_id, season):
+        """صفوف الجدول كاملاً من /standings أو None عند الفشل"""
+        response = self.app.fetch_with_retry(f"{self.app.base_url}/standings", {'league': league_id, 'season': season})
+        if not response or response.status_code != 200:
+            return None
+        data = response.json()
+        if data.get('errors'):
+            return None
+
+        rows = []
+        seen = set()
+        for standings_data in data.get('response', []):
+            league = standings_data.get('league', {})
+            for standing_group in league.get('standings', []):
+                for team_standing in standing_group:
+                    team_id = team_standing.get('team', {}).get('id')
+                    if team_id is None or team_id in seen:
+                        continue
+                    seen.add(team_id)
+                    totals = team_standing.get('all', {})
+                    rows.append((
+                        team_id, team_standing.get('rank'), team_standing.get('points'), totals.get('played'),
+                        totals.get('win'), totals.get('draw'), totals.get('lose'), league.get('name', '')
+                    ))
+        return rows
+
+
+class LastSeasonResolver:
+    """
+    ترتيب فريق في موسم منتهٍ: (الفريق، الموسم) ← سجل الترتيب مع الدوري
+    يجرب دوري المباراة أولاً (من المستودع في كل مرة)، ثم يطلب جداول كل الدوريات المرشحة
+    (/leagues?team=&season=) بالتوازي وأول مرشح بترتيب الاستجابة يوجد فيه الفريق يحسم النتيجة
+    نتيجة البحث في الدوريات الأخرى تحفظ في SQLite فقط إذا نجحت كل الطلبات (الموسم المنتهي لا يتغير)
+    والجداول نفسها من StandingsWarehouse (جدول واحد يخدم كل فرق الدوري)
+    """
+
+    def __init__(self, app, storage=None, warehouse=None, workers=4):
+        self.app = app
+        self.storage = storage
+        self.warehouse = warehouse or StandingsWarehouse(app, storage)
+        self.workers = workers
+        self._results = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='last-season')
+            return self._executor
+
+    def resolve(self, team_id, season, league_id=None):
+        """سجل الترتيب بصيغة _fetch_season_standings (مع league_name) أو None إن لم يوجد الفريق"""
+        complete = True
+        if league_id:
+            # جدول دوري المباراة يسبق أي نتيجة محفوظة من دوري آخر (كأس أو بطولة قارية)
+            standings, complete = self._fetch(team_id, league_id, season)
+            if self._found(standings):
+                return standings
+
+        key = (team_id, season)
+        with self._lock:
+            if key in self._results:
+                return self._results[key]
+
+        stored, standings = self.storage.load_last_season_rank(team_id, season) if self.storage else (False, None)
+        if not stored:
+            standings, scanned = self._scan(team_id, season, league_id)
+            if not (complete and scanned):
+                # فشل طلب: النتيجة لهذا الاستدعاء فقط، نعيد المحاولة لاحقاً
+                return standings
+            if self.storage:
+                self.storage.save_last_season_rank(team_id, season, standings and standings.get('league_id'), standings)
+
+        with self._lock:
+            self._results[key] = standings
+        return standings
+
+    def _fetch(self, team_id, league_id, season):
+        """(سجل الترتيب أو None، هل نجحت الطلبات) داخل خيط العامل"""
+        instrumentation = self.app.instrumentation
+        failures = instrumentation.failures()
+        standings = self.warehouse.standings(team_id, league_id, season)
+        return standings, instrumentation.failures() == failures
+
+    @staticmethod
+    def _found(standings):
+        return bool(standings) and standings.get('current_rank') != 'N/A'
+
+    def _candidates(self, team_id, season):
+        """([(معرف الدوري، الاسم)]، هل نجح الطلب)"""
+        response = self.app.fetch_with_retry(f"{self.app.base_url}/leagues", {'team': team_id, 'season': season})
+        if not response or response.status_code != 200:
+            return [], False
+        leagues = [league_data.get('league', {}) for league_data in response.json().get('response', [])]
+        return [(league.get('id'), league.get('name', '')) for league in leagues if league.get('id')], True
+
+    def _scan(self, team_id, season, league_id):
+        """البحث في الدوريات الأخرى غير league_id (الذي فحصه resolve)"""
+        # جداول محملة سابقاً لدوريات أخرى (فهرس الفريق في المستودع)
+        standings = self.warehouse.find_team(team_id, season)
+        if self._found(standings):
+            return standings, True
+
+        candidates, complete = self._candidates(team_id, season)
+        candidates = [(candidate_id, name) for candidate_id, name in candidates if candidate_id != league_id]
+
+        fetch = self.app.instrumentation.with_source('last_season_resolver', self._fetch)
+        futures = [self._pool().submit(fetch, team_id, candidate_id, season) for candidate_id, _ in candidates]
+        try:
+            for (candidate_id, name), future in zip(candidates, futures):
+                standings, ok = future.result()
+                complete = complete and ok
+                if self._found(standings):
+                    standings['league_name'] = name or standings.get('league_name', '')
+                    log.debug("🏁 Last season rank for team %s: %s in league %s", team_id, standings.get('current_rank'), candidate_id)
+                    return standings, complete
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return None, complete
+
+
+class LeagueSearchIndex:
+    """
+    فهرس بحث مبني مرة واحدة فوق أسماء الدوريات والبلدان
+    نصوص موحدة (أحرف صغيرة بدون تشكيل) + فهرس بادئات للكلمات
+    واستبعاد دوريات السيدات والفئات السنية محسوب مسبقاً
+    """
+
+    EXCLUDED_WORDS = ("women", "feminine", "u19", "u20", "u17")
+    _TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+    def __init__(self):
+        self.entries = []       # (label, league_id) بالترتيب الأصلي
+        self._haystacks = []    # "اسم الدوري | البلد" موحدة للبحث الجزئي
+        self._prefixes = {}     # بادئة ← قائمة مرتبة من مواقع الإدخالات
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return bool(self.entries)
+
+    @staticmethod
+    def normalize(text):
+        text = unicodedata.normalize('NFKD', (text or '').lower())
+        return ''.join(ch for ch in text if not unicodedata.combining(ch))
+
+    def build(self, leagues):
+        """بناء الفهرس من قائمة all_leagues"""
+        entries = []
+        haystacks = []
+        prefixes = {}
+
+        for league in leagues:
+            name = league.get('name') or ''
+            country_name = league.get('country_name') or ''
+            lname = self.normalize(name)
+
+            if any(x in lname for x in self.EXCLUDED_WORDS):
+                continue
+
+            position = len(entries)
+            entries.append((f"{name} ({country_name})", league.get('id')))
+
+            cname = self.normalize(country_name)
+            haystacks.append(f"{lname} | {cname}")
+
+            for token in set(self._TOKEN_RE.findall(f"{lname} {cname}")):
+                for end in range(1, len(token) + 1):
+                    bucket = prefixes.setdefault(token[:end], [])
+                    if not bucket or bucket[-1] != position:
+                        bucket.append(position)
+
+        with self._lock:
+            self.entries = entries
+            self._haystacks = haystacks
+            self._prefixes = prefixes
+
+        log.info("🔎 League index built: %s leagues, %s prefixes", len(entries), len(prefixes))
+
+    def search(self, keyword=""):
+        """إرجاع قائمة (label, league_id) المطابقة للكلمة المفتاحية"""
+        with self._lock:
+            entries, haystacks, prefixes = self.entries, self._haystacks, self._prefixes
+
+        keyword = self.normalize(keyword).strip()
+        if not keyword:
+            return list(entries)
+
+        # كل كلمة في البحث بداية كلمة في اسم الدوري أو البلد
+        positions = None
+        for token in self._TOKEN_RE.findall(keyword):
+            matches = prefixes.get(token)
+            if not matches:
+                positions = None
+                break
+            positions = set(matches) if positions is None else positions.intersection(matches)
+            if not positions:
+                break
+
+        # مع البحث الجزئي داخل الكلمات دائماً (مثل "liga" في "bundesliga") بالترتيب الأصلي
+        positions = positions or set()
+        positions.update(i for i, haystack in enumerate(haystacks) if keyword in haystack)
+        return [entries[i] for i in sorted(positions)]
+
+
+class ReplayResponse:
+    """استجابة من الأرشيف بنفس واجهة requests.Response التي يستخدمها التطبيق"""
+
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {'Content-Length': str(len(content))}
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class CapturingResponse:
+    """تغليف استجابة متدفقة: تحفظ في الأرشيف عند الإغلاق إذا اكتمل جسم الاستجابة"""
+
+    def __init__(self, response, on_complete):
+        self._response = response
+        self._on_complete = on_complete
+        self._chunks = []
+        self._iterator = None
+        self._complete = False
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def _tee(self, chunk_size):
+        for chunk in self._response.iter_content(chunk_size=chunk_size):
+            self._chunks.append(chunk)
+            yield chunk
+        self._complete = True
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        self._iterator = self._tee(chunk_size)
+        return self._iterator
+
+    def close(self):
+        try:
+            # المحلل المتدفق يتوقف بعد نهاية المصفوفة: قراءة ما تبقى (بضعة بايتات)
+            if self._iterator is not None and not self._complete:
+                for _ in self._iterator:
+                    pass
+            if self._complete:
+                self._on_complete(b''.join(self._chunks))
+        except Exception as e:
+            log.warning("⚠️ تعذر إكمال الاستجابة للأرشيف: %s", e)
+        finally:
+            self._iterator = None
+            self._complete = False
+            self._response.close()
+
+
+class ApiTransport:
+    """
+    نقطة العبور الوحيدة لطلبات api-sports:
+    - live: طلب شبكة عادي
+    - capture: طلب شبكة + حفظ كل استجابة 200 في الأرشيف
+    - replay: الرد من الأرشيف فقط مع زمن استجابة اختياري (بدون استهلاك الحصة)
+
+    الأرشيف: <archive_dir>/<endpoint>/<params>.json (نفس تخطيط bench/mock_api.py --recorded)
+    """
+
+    MODES = ('live', 'capture', 'replay')
+
+    def __init__(self, headers, mode='live', archive_dir='api_archive', replay_latency=0.0):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown API transport mode: {mode}")
+        self.headers = headers
+        self.mode = mode
+        self.archive_dir = archive_dir
+        self.replay_latency = replay_latency
+        self.replay_misses = 0
+
+    @classmethod
+    def from_environment(cls, headers):
+        """FOOTBALL_API_MODE / FOOTBALL_API_ARCHIVE / FOOTBALL_API_REPLAY_LATENCY (ملي ثانية)"""
+        mode = os.environ.get('FOOTBALL_API_MODE', 'live')
+        archive_dir = os.environ.get('FOOTBALL_API_ARCHIVE', 'api_archive')
+        latency = float(os.environ.get('FOOTBALL_API_REPLAY_LATENCY', '0')) / 1000
+        transport = cls(headers, mode, archive_dir, latency)
+        if mode != 'live':
+            log.info("📼 API transport: %s (%s)", mode, archive_dir)
+        return transport
+
+    @staticmethod
+    def archive_key(params):
+        key = '&'.join(f"{name}={value}" for name, value in sorted((params or {}).items()))
+        return re.sub(r'[^A-Za-z0-9=&._-]', '_', key) or '_'
+
+    def archive_path(self, url, params):
+        endpoint = urlparse(url).path.strip('/') or '_'
+        return os.path.join(self.archive_dir, endpoint, self.archive_key(params) + '.json')
+
+    def _save(self, path, content):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as handle:
+                handle.write(content)
+            os.replace(temp_path, path)
+        except OSError as e:
+            log.warning("⚠️ تعذر حفظ الاستجابة في الأرشيف: %s", e)
+
+    def get(self, url, params=None, timeout=15, stream=False):
+        path = self.archive_path(url, params)
+
+        if self.mode == 'replay':
+            if self.replay_latency:
+                time.sleep(self.replay_latency)
+            try:
+                with open(path, 'rb') as handle:
+                    return ReplayResponse(200, handle.read())
+            except OSError:
+                self.replay_misses += 1
+                log.warning("📼 Replay miss: %s", path)
+                return ReplayResponse(404, b'{"errors": {"replay": "not archived"}, "response": []}')
+
+        import requests
+        response = requests.get(url, headers=self.headers, params=params, timeout=timeout, stream=stream)
+
+        if self.mode == 'capture' and response.status_code == 200:
+            if stream:
+                return CapturingResponse(response, lambda content: self._save(path, content))
+            self._save(path, response.content)
+
+        return response
+
+
+ApiCallRecord = namedtuple('ApiCallRecord', [
+    'timestamp', 'endpoint', 'params', 'status', 'latency_ms', 'bytes', 'cache', 'caller', 'via'
+])
+
+
+class ApiInstrumentation:
+    """
+    سجل دائري في الذاكرة لكل طلب api-sports (وكل إصابة كاش تغني عن طلب)
+    مع حفظ اختياري في SQLite وملخص p50/p95 لكل endpoint وأكثر المصادر طلباً
+    """
+
+    # دوال العبور التي لا تمثل مصدر الطلب الحقيقي
+    PLUMBING = frozenset(('api_get', 'fetch_with_retry', 'get', 'record', 'record_cache_hit'))
+
+    def __init__(self, capacity=500, storage=None, persist=False, flush_every=50):
+        self.records = deque(maxlen=capacity)
+        self.storage = storage
+        self.persist = persist
+        self.flush_every = flush_every
+        self._pending = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def source(self, name):
+        """تسمية مصدر الطلبات داخل الخيوط (مثل load_popup_statistics_improved)"""
+        previous = getattr(self._local, 'source', None)
+        self._local.source = name
+        try:
+            yield
+        finally:
+            self._local.source = previous
+
+    def with_source(self, name, func):
+        """تغليف هدف خيط بحيث تنسب طلباته إلى name"""
+        def run(*args, **kwargs):
+            with self.source(name):
+                return func(*args, **kwargs)
+        return run
+
+    def _caller(self):
+        via = outer = None
+        frame = sys._getframe(2)
+        while frame is not None:
+            name = frame.f_code.co_name
+            if frame.f_code.co_filename == __file__ and name not in self.PLUMBING and not name.startswith('<'):
+                if via is None:
+                    via = name
+                outer = name
+            frame = frame.f_back
+        return getattr(self._local, 'source', None) or outer or 'unknown', via or 'unknown'
+
+    @staticmethod
+    def endpoint_of(url):
+        return urlparse(url).path.strip('/') or url
+
+    def record(self, url, params, status, latency_ms, size, cache='none'):
+        caller, via = self._caller()
+        record = ApiCallRecord(
+            time.time(), self.endpoint_of(url),
+            '&'.join(f"{name}={value}" for name, value in sorted((params or {}).items())),
+            status, latency_ms, size, cache, caller, via
+        )
+        if cache != 'hit' and status != 200:
+            self._local.failures = self.failures() + 1
+
+        with self._lock:
+            self.records.append(record)
+            if self.persist:
+                self._pending.append(record)
+                if len(self._pending) < self.flush_every:
+                    return
+                pending, self._pending = self._pending, []
+            else:
+                return
+
+        if self.storage:
+            self.storage.save_api_calls(pending)
+
+    def record_cache_hit(self, endpoint, params=None):
+        self.record(endpoint, params, None, 0.0, 0, cache='hit')
+
+    def failures(self):
+        """عدد الطلبات الفاشلة في الخيط الحالي (للتمييز بين نتيجة حقيقية ونتيجة بقيم افتراضية)"""
+        return getattr(self._local, 'failures', 0)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if pending and self.storage:
+            self.storage.save_api_calls(pending)
+
+    @staticmethod
+    def percentile(values, fraction):
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        # nearest-rank
+        index = max(0, math.ceil(fraction * len(ordered)) - 1)
+        return ordered[index]
+
+    def summary(self, top=5):
+        """ملخص لكل endpoint + أكثر المصادر طلباً"""
+        with self._lock:
+            records = list(self.records)
+
+        endpoints = {}
+        sources = Counter()
+        for record in records:
+            entry = endpoints.setdefault(record.endpoint, {'calls': 0, 'hits': 0, 'errors': 0, 'bytes': 0, 'latencies': []})
+            if record.cache == 'hit':
+                entry['hits'] += 1
+                continue
+            entry['calls'] += 1
+            entry['bytes'] += record.bytes or 0
+            entry['latencies'].append(record.latency_ms)
+            if record.status != 200:
+                entry['errors'] += 1
+            sources[record.caller] += 1
+
+        for entry in endpoints.values():
+            latencies = entry.pop('latencies')
+            entry['p50_ms'] = self.percentile(latencies, 0.50)
+            entry['p95_ms'] = self.percentile(latencies, 0.95)
+
+        return {
+            'records': len(records),
+            'endpoints': endpoints,
+            'top_sources': sources.most_common(top),
+        }
+
+    def export(self, path):
+        """تصدير الملخص والسجلات الحالية إلى ملف JSON"""
+        with self._lock:
+            records = [record._asdict() for record in self.records]
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump({'summary': self.summary(), 'records': records}, handle, ensure_ascii=False, indent=2)
+        return path
+
+
+class JsonArrayStream:
+    """
+    تحليل تدريجي لاستجابة JSON كبيرة: إرجاع عناصر المصفوفة key
+    واحداً تلو الآخر أثناء وصول البيانات دون بناء شجرة الاستجابة كاملة
+    """
+
+    WHITESPACE = ' \t\r\n'
+
+    def __init__(self, chunks, key='response'):
+        self.key = key
+        self.items_parsed = 0
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        if self._eof:
+            return False
+
+        for chunk in self._chunks:
+            if chunk:
+                # حذف الجزء المقروء للحفاظ على ذاكرة محدودة
+                self._buf = self._buf[self._pos:] + self._text.decode(chunk)
+                self._pos = 0
+                return True
+
+        self._eof = True
+        self._buf = self._buf[self._pos:] + self._text.decode(b'', final=True)
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in self.WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def _expect(self, char):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}' in JSON stream")
+        self._pos += 1
+
+    def _decode_value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # القيمة لم تكتمل بعد، قراءة المزيد
+                if not self._fill():
+                    raise
+                continue
+
+            # رقم في نهاية المخزن قد يكون مقطوعاً
+            if end == len(self._buf) and not self._eof:
+                self._fill()
+                continue
+
+            self._pos = end
+            return value
+
+    def _next_separator(self, closing):
+        separator = self._peek()
+        self._pos += 1
+        if separator == closing:
+            return False
+        if separator != ',':
+            raise ValueError(f"Unexpected '{separator}' in JSON stream")
+        return True
+
+    def __iter__(self):
+        self._expect('{')
+        if self._peek() == '}':
+            return
+
+        while True:
+            name = self._decode_value()
+            self._expect(':')
+
+            if name == self.key and self._peek() == '[':
+                self._pos += 1
+                if self._peek() == ']':
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._decode_value()
+                        self.items_parsed += 1
+                        if not self._next_separator(']'):
+                            break
+            else:
+                self._decode_value()
+
+            if not self._next_separator('}'):
+                return
+
+
+class CalendarHeader(MDBoxLayout):
+    selected_date = StringProperty("")
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.app = MDApp.get_running_app()
+        self.current_date = datetime.now().date()
+        self.min_date = datetime.now().date() - timedelta(days=30)
+        self.max_date = datetime.now().date() + timedelta(days=365)
+        self.update_display()
+    
+    def update_display(self):
+        today = datetime.now().date()
+        
+        if hasattr(self, 'ids'):
+            if 'prev_btn' in self.ids:
+                self.ids.prev_btn.disabled = self.current_date <= self.min_date
+            if 'next_btn' in self.ids:
+                self.ids.next_btn.disabled = self.current_date >= self.max_date
+        
+        if self.current_date == today:
+            self.selected_date = "TODAY"
+        elif self.current_date == today + timedelta(days=1):
+            self.selected_date = "TOMORROW"
+        elif self.current_date == today + timedelta(days=2):
+            self.selected_date = "DAY AFTER"
+        else:
+            self.selected_date = self.current_date.strftime('%d/%m/%Y')
+    
+    def previous_day(self):
+        new_date = self.current_date - timedelta(days=1)
+        if new_date >= self.min_date:
+            self.current_date = new_date
+            self.update_display()
+            self.app.on_calendar_date_selected(self.current_date)
+    
+    def next_day(self):
+        new_date = self.current_date + timedelta(days=1)
+        if new_date <= self.max_date:
+            self.current_date = new_date
+            self.update_display()
+            self.app.on_calendar_date_selected(self.current_date)
+
+
+class StatsPopup(MDFloatLayout):
+    home_team_name = StringProperty("")
+    away_team_name = StringProperty("")
+    first_team_name_display = StringProperty("")
+    second_team_name_display = StringProperty("")
+    first_team_goals_for = StringProperty("0")
+    first_team_goals_against = StringProperty("0")
+    second_team_goals_for = StringProperty("0")
+    second_team_goals_against = StringProperty("0")
+    first_team_label = StringProperty("") 
+    second_team_label = StringProperty("")
+    first_team_color = StringProperty("green")
+    second_team_color = StringProperty("green")
+    
+    first_team_current_rank = StringProperty("-")
+    first_team_last_rank = StringProperty("-")
+    first_team_points = StringProperty("-")
+    first_team_played = StringProperty("-")
+    
+    second_team_current_rank = StringProperty("-")
+    second_team_last_rank = StringProperty("-")
+    second_team_points = StringProperty("-")
+    second_team_played = StringProperty("-")
+    
+    first_last_rank_color = StringProperty("#AAAAAA")
+    second_last_rank_color = StringProperty("#AAAAAA")
+    
+    # خصائص جديدة لعرض بيانات الكاش
+    from_cache = BooleanProperty(False)
+    cache_data = DictProperty({})
+
+    def __init__(self, **kwargs):
+        load_lazy_kv('stats_popup')
+        super().__init__(**kwargs)
+    
+    def copy_team_rank_info(self, team_type, copy_type="current"):
+        try:
+            if team_type == 'first':
+                current_rank = self.first_team_current_rank
+                last_rank = self.first_team_last_rank
+                opponent_current_rank = self.second_team_current_rank
+                opponent_last_rank = self.second_team_last_rank
+                team_name = self.first_team_name_display
+            elif team_type == 'second':
+                current_rank = self.second_team_current_rank
+                last_rank = self.second_team_last_rank
+                opponent_current_rank = self.first_team_current_rank
+                opponent_last_rank = self.first_team_last_rank
+                team_name = self.second_team_name_display
+            else:
+                MDApp.get_running_app().show_snackbar("❌ خطأ: نوع الفريق غير معروف")
+                return
+
+            def clean_rank(rank):
+                cleaned = ''.join(filter(str.isdigit, str(rank))) 
+                return cleaned if cleaned else '0'
+
+            if copy_type == "current":
+                team_rank = clean_rank(current_rank)
+                opponent_rank = clean_rank(opponent_current_rank)
+                copied_text = f"{team_rank}{opponent_rank}"
+                message_type = "الترتيب الحالي"
+            else:  
+                team_rank = clean_rank(last_rank)
+                opponent_rank = clean_rank(opponent_last_rank)
+                copied_text = f"{team_rank}{opponent_rank}"
+                message_type = "ترتيب الموسم الماضي"
+
+            # نسخ إلى الحافظة
+            Clipboard.copy(copied_text)
+            MDApp.get_running_app().show_snackbar(
+                f"✅ تم نسخ {message_type} لـ {team_name}: {copied_text}", 
+                duration=3
+            )
+            
+            log.info("📋 تم النسخ: %s للفريق %s (%s)", copied_text, team_name, message_type)
+            
+        except Exception as e:
+            log.error("❌ خطأ في النسخ: %s", e)
+            MDApp.get_running_app().show_snackbar(f"❌ فشل النسخ: {e}")
+
+
+class LeagueItem(OneLineAvatarIconListItem):
+    def __init__(self, league_name, league_id, **kwargs):
+        load_lazy_kv('league_items')
+        super().__init__(**kwargs)
+        self.text = league_name
+        self.league_id = league_id
+        self.selected = False
+
+    def toggle_checkbox(self):
+        self.selected = not self.selected
+        self.ids.check.icon = "checkbox-marked" if self.selected else "checkbox-blank-outline"
+
+
+class FavoriteLeagueItem(OneLineAvatarIconListItem):
+    def __init__(self, league_name, league_id, **kwargs):
+        load_lazy_kv('league_items')
+        super().__init__(**kwargs)
+        self.text = league_name
+        self.league_id = league_id
+
+    def remove_favorite(self):
+        app = MDApp.get_running_app()
+        app.remove_favorite_league(self.league_id)
+
+
+class LoadingWidget(MDBoxLayout):
+    loading_text = StringProperty("Loading data...")
+    progress_value = NumericProperty(0)
+    status_text = StringProperty("Initializing...")
+
+
+class ErrorWidget(MDBoxLayout):
+    error_text = StringProperty("Loading error")
+
+
+# حقول العرض المحسوبة مسبقاً لكل مباراة (view-model)
+DISPLAY_FIELDS = (
+    'league_name', 'home_team', 'away_team', 'home_score',
+    'away_score', 'full_score', 'match_status', 'match_time'
+)
+
+MatchDisplay = namedtuple('MatchDisplay', DISPLAY_FIELDS + ('is_live',))
+
+STATUS_TEXT = {
+    'NS': 'NS', '1H': '1H', 'HT': 'HT',
+    '2H': '2H', 'ET': 'ET', 'P': 'P',
+    'FT': 'FT', 'AET': 'AET', 'PEN': 'PEN',
+    'BT': 'BT', 'SUSP': 'SUSP', 'INT': 'INT',
+    'PST': 'PST', 'CANC': 'CANC', 'LIVE': 'LIVE'
+}
+
+
+def _short_team_name(name):
+    return name[:12] + "..." if len(name) > 15 else name
+
+
+def _match_time_text(match, status, status_text):
+    if status in ['1H', '2H', 'LIVE']:
+        elapsed = match.get('elapsed')
+        return f"{elapsed}'" if elapsed else "Live"
+    elif status == 'HT':
+        return "HT"
+    elif status == 'ET':
+        return "ET"
+    elif status == 'P':
+        return "PEN"
+    elif status == 'NS':
+        formatted_time = match.get('formatted_time')
+        if formatted_time and formatted_time != 'TBD':
+            return formatted_time
+        time_str = match.get('time', '')
+        if time_str:
+            try:
+                dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
+                return dt.strftime('%H:%M')
+            except:
+                return time_str[:16]
+    return status_text
+
+
+def build_match_display(match):
+    """حساب حقول العرض مرة واحدة لكل مباراة"""
+    home_score = match.get('home_score')
+    away_score = match.get('away_score')
+    status = match.get('status', 'NS')
+    status_text = STATUS_TEXT.get(status, status)
+
+    return MatchDisplay(
+        league_name=match.get('league', 'Loading...'),
+        home_team=_short_team_name(match.get('home_team', 'Home Team')),
+        away_team=_short_team_name(match.get('away_team', 'Away Team')),
+        home_score=str(home_score) if home_score is not None else "-",
+        away_score=str(away_score) if away_score is not None else "-",
+        full_score=f"{home_score}-{away_score}" if home_score is not None and away_score is not None else "VS",
+        match_status=status_text,
+        match_time=_match_time_text(match, status, status_text),
+        is_live=status in ['1H', '2H', 'HT', 'ET', 'P', 'BT', 'LIVE']
+    )
+
+
+def get_match_display(match):
+    """إرجاع حقول العرض المحسوبة مسبقاً للسجل (أو حسابها لقاموس عادي)"""
+    if isinstance(match, Match):
+        return match.display
+    return build_match_display(match)
+
+
+_MISSING = object()
+
+
+class Match:
+    """
+    سجل مباراة مدمج وغير قابل للتعديل (__slots__) تتشاركه كل القوائم بالمرجع
+    يحمل معرفات الفرق والدوري فقط، والأسماء تقرأ من جداول الأبعاد
+    """
+
+    FIELDS = (
+        'id', 'league_id', 'season', 'home_team_id', 'away_team_id',
+        'home_score', 'away_score', 'status', 'elapsed',
+        'time', 'venue', 'referee'
+    )
+    NAME_FIELDS = ('league', 'home_team', 'away_team')
+    ALIASES = {'full_home_team': 'home_team', 'full_away_team': 'away_team'}
+
+    __slots__ = FIELDS + ('_display', '_formatted_time')
+
+    _FIELD_SET = frozenset(FIELDS + NAME_FIELDS)
+
+    # جداول الأبعاد المشتركة (يستبدلها التطبيق بنسخة مرتبطة بقاعدة البيانات)
+    dimensions = DimensionTables()
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            value = fields.get(name)
+            if isinstance(value, str):
+                value = sys.intern(value)
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, '_display', None)
+        object.__setattr__(self, '_formatted_time', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Match records are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Match records are immutable")
+
+    def __repr__(self):
+        return f"Match({self.id}: {self.home_team} vs {self.away_team}, {self.status})"
+
+    @property
+    def league(self):
+        return self.dimensions.league_name(self.league_id, 'Unknown League')
+
+    @property
+    def home_team(self):
+        return self.dimensions.team_name(self.home_team_id, 'Home Team')
+
+    @property
+    def away_team(self):
+        return self.dimensions.team_name(self.away_team_id, 'Away Team')
+
+    @classmethod
+    def from_fixture(cls, fixture_data):
+        """إنشاء سجل من عنصر واحد في استجابة /fixtures"""
+        fixture = fixture_data.get('fixture', {})
+        teams = fixture_data.get('teams', {})
+        goals = fixture_data.get('goals', {})
+        league = fixture_data.get('league', {})
+        status = fixture.get('status', {})
+
+        home_team = teams.get('home', {})
+        away_team = teams.get('away', {})
+
+        season = league.get('season')
+        if season is None:
+            season = league.get('seasons', [{}])[0].get('year', datetime.now().year) if league.get('seasons') else datetime.now().year
+
+        dimensions = cls.dimensions
+        dimensions.add_league(
+            league.get('id'), name=league.get('name'), country=league.get('country'),
+            season=season, logo=league.get('logo'), flag=league.get('flag')
+        )
+        dimensions.add_team(home_team.get('id'), home_team.get('name'), home_team.get('logo'))
+        dimensions.add_team(away_team.get('id'), away_team.get('name'), away_team.get('logo'))
+
+        return cls(
+            id=fixture.get('id'),
+            league_id=league.get('id'),
+            season=season,
+            home_team_id=home_team.get('id'),
+            away_team_id=away_team.get('id'),
+            home_score=goals.get('home'),
+            away_score=goals.get('away'),
+            status=status.get('short', 'NS'),
+            elapsed=status.get('elapsed'),
+            time=fixture.get('date', ''),
+            venue=(fixture.get('venue') or {}).get('name', ''),
+            referee=fixture.get('referee', 'Unknown')
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """إنشاء سجل من قاموس محفوظ (يقبل الصيغة القديمة التي تحمل الأسماء)"""
+        dimensions = cls.dimensions
+        if data.get('league'):
+            dimensions.add_league(data.get('league_id'), name=data.get('league'))
+        if data.get('home_team'):
+            dimensions.add_team(data.get('home_team_id'), data.get('home_team'))
+        if data.get('away_team'):
+            dimensions.add_team(data.get('away_team_id'), data.get('away_team'))
+
+        return cls(**{name: data.get(name) for name in cls.FIELDS})
+
+    def to_dict(self):
+        """عرض قاموس مدمج للتخزين في قاعدة البيانات (المعرفات فقط)"""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def get(self, key, default=None):
+        key = self.ALIASES.get(key, key)
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        if key == 'formatted_time':
+            return self.formatted_time
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    @property
+    def formatted_time(self):
+        if self._formatted_time is None:
+            time_str = self.time or ''
+            if time_str:
+                try:
+                    dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
+                    formatted = dt.strftime('%H:%M')
+                except:
+                    formatted = time_str[:16]
+            else:
+                formatted = 'TBD'
+            object.__setattr__(self, '_formatted_time', formatted)
+        return self._formatted_time
+
+    @property
+    def display(self):
+        if self._display is None:
+            object.__setattr__(self, '_display', build_match_display(self))
+        return self._display
+
+
+class OptimizedCompactMatchItem(MDCard):
+    match_data = ObjectProperty(None, allownone=True)
+    is_fav = BooleanProperty(False)
+    is_live = BooleanProperty(False)
+    
+    league_name = StringProperty("")
+    home_team = StringProperty("")
+    away_team = StringProperty("")
+    home_score = StringProperty("-")
+    away_score = StringProperty("-")
+    full_score = StringProperty("VS")
+    match_status = StringProperty("")
+    match_time = StringProperty("")
+    events_text = StringProperty("")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.bind(match_data=self.on_match_data)
+
+    def on_match_data(self, instance, value):
+        if value:
+            self.update_display()
+
+    def bind_match(self, match_data, is_fav=False):
+        """ربط البطاقة (الجديدة أو المعاد استخدامها) ببيانات مباراة"""
+        self.is_fav = is_fav
+        if self.match_data == match_data:
+            # نفس البيانات لا تطلق on_match_data، لذا نحدث العرض يدوياً
+            self.update_display()
+        else:
+            self.match_data = match_data
+
+    def update_display(self):
+        try:
+            display = get_match_display(self.match_data)
+
+            # تعيين الخصائص التي تغيرت قيمتها فقط لتجنب الإرسال غير الضروري
+            for field in DISPLAY_FIELDS:
+                value = getattr(display, field)
+                if getattr(self, field) != value:
+                    setattr(self, field, value)
+
+            if self.is_live != display.is_live:
+                self.is_live = display.is_live
+                if self.is_live:
+                    self.md_bg_color = get_color_from_hex("000000") 
+                    self.elevation = 2 
+                else:
+                    self.md_bg_color = get_color_from_hex("#FFFFFF")
+                    self.elevation = 1
+            
+        except Exception as e:
+            log.error("Display update error: %s", e)
+
+    def on_touch_down(self, touch):
+        if self.collide_point(*touch.pos):
+            hide_button = self.ids.hide_button
+            
+            safe_area_limit = self.x + self.width * 0.85
+            
+            if hide_button.collide_point(*touch.pos):
+                return super().on_touch_down(touch)
+            elif touch.x < safe_area_limit:
+                touch.ud['in_match_item'] = True
+                return True 
+        return super().on_touch_down(touch)
+
+    def on_touch_up(self, touch):
+        if self.collide_point(*touch.pos):
+            hide_button = self.ids.hide_button
+            
+            safe_area_limit = self.x + self.width * 0.85
+            
+            if not hide_button.collide_point(*touch.pos) and touch.x < safe_area_limit:
+                app = MDApp.get_running_app()
+                app.show_stats_popup_improved(self.match_data)
+                return True
+                
+        return super().on_touch_up(touch)
+
+    def hide_match(self):
+        app = MDApp.get_running_app()
+        match_id = self.match_data.get('id')
+        
+        # تحقق إذا كانت المباراة في القائمة المخفية
+        is_in_hidden_list = app.is_hidden(match_id)
+        
+        if not is_in_hidden_list:
+            # إخفاء المباراة: إضافتها إلى القائمة المخفية
+            app.add_hidden_match(self.match_data)
+            app.show_snackbar(f"✅ Match hidden: {self.home_team} vs {self.away_team}")
+            
+            # إزالة المباراة من جميع القوائم مباشرة
+            app.remove_match_from_all_lists(match_id)
+            
+            # إزالة الودجت من الشاشة وإرجاعه إلى المجمع
+            app.match_item_pool.release(self)
+        else:
+            # إزالة المباراة من القائمة المخفية
+            app.remove_hidden_match(match_id)
+            app.show_snackbar(f"✅ Match unhidden: {self.home_team} vs {self.away_team}")
+            
+            # إزالة الودجت من الشاشة وإرجاعه إلى المجمع
+            app.match_item_pool.release(self)
+
+
+class MatchItemPool:
+    """
+    مجمع محدود لبطاقات OptimizedCompactMatchItem الجاهزة
+    يعاد ربط البطاقات ببيانات جديدة بدل إنشائها من جديد عند تبديل التبويبات
+    """
+
+    def __init__(self, max_size=150, prewarm_size=40, frame_budget=0.004):
+        self.max_size = max_size
+        self.prewarm_size = prewarm_size
+        self.frame_budget = frame_budget
+        self._free = []
+        self._prewarm_event = None
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, match_data, is_fav=False):
+        if self._free:
+            item = self._free.pop()
+            self.reused += 1
+        else:
+            item = OptimizedCompactMatchItem()
+            self.created += 1
+        item.bind_match(match_data, is_fav)
+        return item
+
+    def release(self, item):
+        if item.parent:
+            item.parent.remove_widget(item)
+        if len(self._free) < self.max_size:
+            self._free.append(item)
+
+    def reclaim(self, container):
+        """تفريغ الحاوية وإرجاع بطاقات المباريات إلى المجمع"""
+        items = [w for w in container.children if isinstance(w, OptimizedCompactMatchItem)]
+        container.clear_widgets()
+        for item in items:
+            self.release(item)
+
+    def prewarm(self, *args):
+        """إنشاء بطاقات مسبقاً على دفعات صغيرة خلال الإطارات الخاملة"""
+        if self._prewarm_event or len(self._free) >= self.prewarm_size:
+            return
+        self._prewarm_event = Clock.schedule_interval(self._prewarm_step, 0)
+
+    def _prewarm_step(self, dt):
+        # تخطي الإطارات المزدحمة (أبطأ من 30 إطار/ثانية)
+        if dt > 1 / 30.:
+            return True
+
+        start = time.perf_counter()
+        while len(self._free) < self.prewarm_size:
+            self._free.append(OptimizedCompactMatchItem())
+            self.created += 1
+            if time.perf_counter() - start > self.frame_budget:
+                return True
+
+        self._prewarm_event = None
+        log.info("♻️ تم تجهيز %s بطاقة مباراة مسبقاً", len(self._free))
+        return False
+
+
+class BatchedWidgetRenderer:
+    """
+    إضافة الودجات إلى حاوية على دفعات موزعة عبر الإطارات
+    الشاشة الأولى تضاف فوراً والباقي ضمن ميزانية زمنية لكل إطار
+    """
+
+    def __init__(self, frame_budget=0.008, item_height=dp(86)):
+        self.frame_budget = frame_budget
+        self.item_height = item_height
+        self._event = None
+        self._job = None
+
+    def first_screenful(self):
+        return int(Window.height / self.item_height) + 1
+
+    def render(self, container, items, factory, on_progress=None, on_done=None):
+        self.cancel()
+
+        self._job = {
+            'container': container,
+            'items': list(items),
+            'index': 0,
+            'factory': factory,
+            'on_progress': on_progress,
+            'on_done': on_done
+        }
+
+        self._add_items(self.first_screenful())
+        if not self._finish_if_done():
+            self._event = Clock.schedule_interval(self._render_step, 0)
+
+    def cancel(self):
+        if self._event:
+            self._event.cancel()
+            self._event = None
+        self._job = None
+
+    @property
+    def is_rendering(self):
+        return self._job is not None
+
+    def _add_items(self, count=None, deadline=None):
+        job = self._job
+        items = job['items']
+        container = job['container']
+        factory = job['factory']
+        added = 0
+
+        while job['index'] < len(items):
+            container.add_widget(factory(items[job['index']]))
+            job['index'] += 1
+            added += 1
+            if count is not None and added >= count:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        if job['on_progress']:
+            job['on_progress'](job['index'], len(items))
+
+    def _finish_if_done(self):
+        job = self._job
+        if job['index'] < len(job['items']):
+            return False
+
+        self._job = None
+        if self._event:
+            self._event.cancel()
+            self._event = None
+        if job['on_done']:
+            job['on_done']()
+        return True
+
+    def _render_step(self, dt):
+        if not self._job:
+            self._event = None
+            return False
+
+        self._add_items(deadline=time.perf_counter() + self.frame_budget)
+        return not self._finish_if_done()
+
+
+LiveDelta = namedtuple('LiveDelta', ['match_id', 'kind', 'changes', 'match'])
+
+
+class LiveUpdater:
+    """
+    محرك التحديث المباشر: استطلاع بفاصل زمني متكيف
+    واكتشاف التغييرات (النتيجة، الحالة، الدقيقة) لكل مباراة
+    """
+
+    DELTA_FIELDS = ('home_score', 'away_score', 'status', 'elapsed')
+
+    def __init__(self, app, fast_interval=30, normal_interval=120, idle_interval=600):
+        self.app = app
+        self.fast_interval = fast_interval
+        self.normal_interval = normal_interval
+        self.idle_interval = idle_interval
+        self.current_interval = idle_interval
+
+        self.snapshot = {}
+        self.listeners = []
+
+        self._event = None
+        self._running = False
+        self._paused = False
+        self._in_flight = False
+
+    @property
+    def is_running(self):
+        return self._running
+
+    def start(self, delay=0):
+        self._running = True
+        self._schedule(delay)
+
+    def stop(self):
+        self._running = False
+        self._cancel()
+
+    def pause(self):
+        """إيقاف مؤقت عندما يكون التطبيق في الخلفية"""
+        self._paused = True
+        self._cancel()
+
+    def resume(self):
+        self._paused = False
+        if self._running:
+            self._schedule(0)
+
+    def seed(self, matches):
+        """تهيئة اللقطة من المباريات المعروضة حالياً"""
+        self.snapshot = {m.get('id'): self._state(m) for m in matches}
+
+    def poll_now(self):
+        """استطلاع فوري لمرة واحدة (يستخدم أيضاً للتحديث اليدوي)"""
+        self._cancel()
+        self._poll_async()
+
+    def _cancel(self):
+        if self._event:
+            self._event.cancel()
+            self._event = None
+
+    def _schedule(self, delay):
+        self._cancel()
+        if self._running and not self._paused:
+            self._event = Clock.schedule_once(lambda dt: self._poll_async(), delay)
+
+    def _poll_async(self):
+        if self._in_flight:
+            return
+        self._in_flight = True
+        threading.Thread(target=self._poll, daemon=True).start()
+
+    def _poll(self):
+        try:
+            matches = self.app.fetch_live_matches_for_update()
+
+            if matches is None:
+                # فشل الطلب: لا نعتبر المباريات منتهية، نعيد المحاولة لاحقاً
+                Clock.schedule_once(lambda dt: self._finish(None, None, self.current_interval), 0)
+                return
+
+            deltas, ended_ids = self.compute_deltas(matches)
+            interval = self.next_interval(matches)
+            Clock.schedule_once(lambda dt: self._finish(deltas, ended_ids, interval), 0)
+
+        except Exception as e:
+            log.warning("Error in live updater: %s", e)
+            Clock.schedule_once(lambda dt: self._finish(None, None, self.current_interval), 0)
+
+    def _finish(self, deltas, ended_ids, interval):
+        self._in_flight = False
+        self.current_interval = interval
+
+        if deltas is not None:
+            changed_matches = [delta.match for delta in deltas]
+            if changed_matches or ended_ids:
+                self.app.update_matches_data(changed_matches, ended_ids=ended_ids)
+            self.app.last_update = datetime.now().strftime('%H:%M:%S')
+
+            for listener in self.listeners:
+                try:
+                    listener(deltas, ended_ids)
+                except Exception as e:
+                    log.warning("Error in live delta listener: %s", e)
+
+            log.debug("🔄 Live update: %s changed, %s ended, next in %ss", len(deltas), len(ended_ids), interval)
+
+        self._schedule(interval)
+
+    def _state(self, match):
+        return tuple(match.get(field) for field in self.DELTA_FIELDS)
+
+    def compute_deltas(self, matches):
+        """مقارنة المباريات الجديدة باللقطة السابقة وإرجاع التغييرات فقط"""
+        new_snapshot = {}
+        deltas = []
+
+        for match in matches:
+            match_id = match.get('id')
+            state = self._state(match)
+            new_snapshot[match_id] = state
+
+            old_state = self.snapshot.get(match_id)
+            if old_state is None:
+                deltas.append(LiveDelta(match_id, 'new', {}, match))
+            elif old_state != state:
+                changes = {
+                    field: (old, new)
+                    for field, old, new in zip(self.DELTA_FIELDS, old_state, state)
+                    if old != new
+                }
+                deltas.append(LiveDelta(match_id, 'changed', changes, match))
+
+        ended_ids = [match_id for match_id in self.snapshot if match_id not in new_snapshot]
+        self.snapshot = new_snapshot
+        return deltas, ended_ids
+
+    def next_interval(self, matches):
+        """سريع عند وجود مباريات متابعة جارية، أبطأ عند عدم وجود مباريات مباشرة"""
+        if not matches:
+            return self.idle_interval
+
+        required_league_ids = self.app.get_required_league_ids()
+        for match in matches:
+            if not required_league_ids or match.get('league_id') in required_league_ids:
+                return self.fast_interval
+            if self.app.is_favorite(match.get('id')):
+                return self.fast_interval
+
+        return self.normal_interval
+
+
+# ========== محرك قواعد الفلترة ==========
+
+class Verdict(namedtuple('Verdict', ['passed', 'reason'])):
+    """نتيجة فلتر منظمة: passed للمنطق و reason للعرض"""
+
+    __slots__ = ()
+
+    def __str__(self):
+        text = "✅ yes" if self.passed else "❌ no"
+        return f"{text} ({self.reason})" if self.reason else text
+
+
+# الحالات التي تعمل عليها فلاتر المباريات المباشرة
+FILTER_ACTIVE_STATUSES = frozenset(('NS', '1H', '2H', 'HT', 'ET', 'LIVE'))
+FINISHED_STATUSES = frozenset(('FT', 'AET', 'PEN'))
+
+# أزواج الترتيب الممنوعة الافتراضية في NS Perfect 1_1: (ترتيب الأكثر تسجيلاً، ترتيب الأقل تسجيلاً)
+# النسخة المعمول بها في RankPairPolicy (قابلة للتعديل ومحفوظة في SQLite)
+FORBIDDEN_RANK_PAIRS = frozenset({
+    (1, 2), (1, 3), (1, 4), (1, 5), (1, 6), (1, 7), (1, 8), (1, 10), (1, 11), (1, 12),
+    (2, 3), (2, 4), (2, 5), (2, 6), (2, 7), (2, 8), (2, 9), (2, 10), (2, 11), (2, 12), (2, 13), (2, 14),
+    (3, 2), (3, 4), (3, 5), (3, 6), (3, 7), (3, 8), (3, 9), (3, 10), (3, 11), (3, 12), (3, 13), (3, 14), (3, 15),
+    (4, 2), (4, 3), (4, 5), (4, 6), (4, 7), (4, 8), (4, 9), (4, 10), (4, 11), (4, 12), (4, 13), (4, 14), (4, 15), (4, 16),
+    (5, 2), (5, 3), (5, 4), (5, 6), (5, 7), (5, 8), (5, 9), (5, 10), (5, 11), (5, 12), (5, 13), (5, 14), (5, 15), (5, 16),
+    (6, 2), (6, 3), (6, 4), (6, 5), (6, 7), (6, 8), (6, 9), (6, 10), (6, 11), (6, 12), (6, 13), (6, 14), (6, 15), (6, 16),
+    (7, 2), (7, 3), (7, 4), (7, 5), (7, 6), (7, 8), (7, 9), (7, 10), (7, 11), (7, 12), (7, 13), (7, 14), (7, 15), (7, 16),
+    (8, 2), (8, 3), (8, 4), (8, 5), (8, 6), (8, 7), (8, 9), (8, 10), (8, 11), (8, 12), (8, 13), (8, 14), (8, 15), (8, 16),
+    (9, 2), (9, 3), (9, 4), (9, 5), (9, 6), (9, 7), (9, 8), (9, 10), (9, 11), (9, 12), (9, 13), (9, 14), (9, 15), (9, 16),
+    (10, 4), (10, 5), (10, 6), (10, 7), (10, 8), (10, 9), (10, 11), (10, 12), (10, 13), (10, 14), (10, 15), (10, 16), (10, 17), (10, 18),
+    (11, 4), (11, 6), (11, 7), (11, 8), (11, 9), (11, 10), (11, 12), (11, 13), (11, 14), (11, 15), (11, 16), (11, 17), (11, 18),
+    (12, 6), (12, 7), (12, 8), (12, 9), (12, 10), (12, 11), (12, 13), (12, 14), (12, 15), (12, 16), (12, 17), (12, 18),
+    (13, 7), (13, 8), (13, 10), (13, 11), (13, 12), (13, 14), (13, 15), (13, 16), (13, 17), (13, 18),
+    (14, 8), (14, 9), (14, 10), (14, 11), (14, 12), (14, 13), (14, 15), (14, 16), (14, 17), (14, 18),
+    (15, 8), (15, 9), (15, 10), (15, 11), (15, 12), (15, 13), (15, 14),
+    (16, 8), (16, 9), (16, 10), (16, 11), (16, 12), (16, 13), (16, 14), (16, 15),
+    (17, 15),
+})
+
+
+_numpy = None
+
+
+def load_numpy():
+    """NumPy اختياري: يستورد عند أول تقييم دفعي (لا يبطئ بدء التشغيل)، و None إن لم يكن مثبتاً"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+class RankPairPolicy:
+    """
+    سياسة أزواج الترتيب الممنوعة كجدول كثيف: rows[ترتيب الأكثر تسجيلاً][ترتيب الأقل تسجيلاً]
+    تحمل من SQLite مرة واحدة، وكل تعديل يحفظ ويرفع version حتى تبطل النتائج المخزنة
+    """
+
+    def __init__(self, storage=None, pairs=FORBIDDEN_RANK_PAIRS):
+        self.storage = storage
+        self._lock = threading.Lock()
+        self._set(pairs, 0)
+
+    def _set(self, pairs, version):
+        pairs = frozenset(pairs)
+        size = max((max(pair) for pair in pairs), default=0) + 1
+        rows = [bytearray(size) for _ in range(size)]
+        for winner_rank, loser_rank in pairs:
+            rows[winner_rank][loser_rank] = 1
+        # تبديل الحالة كاملة دفعة واحدة حتى لا يقرأ خيط آخر جدولاً نصف محدث
+        self._state = (size, rows, None)
+        self.pairs = pairs
+        self.version = version
+
+    @property
+    def size(self):
+        return self._state[0]
+
+    def load(self):
+        if not self.storage:
+            return
+        pairs, version = self.storage.load_rank_pair_policy()
+        with self._lock:
+            if version:
+                self._set(pairs, version)
+            else:
+                # أول تشغيل: حفظ السياسة الافتراضية كإصدار 1
+                self._set(self.pairs, 1)
+                self.storage.save_rank_pair_policy(self.pairs, 1)
+
+    def is_forbidden(self, winner_rank, loser_rank):
+        size, rows, _ = self._state
+        if 0 <= winner_rank < size and 0 <= loser_rank < size:
+            return bool(rows[winner_rank][loser_rank])
+        return False
+
+    def numpy_table(self, np):
+        """نفس الجدول كمصفوفة NumPy منطقية (تبنى مرة لكل إصدار)"""
+        size, rows, table = self._state
+        if table is None:
+            table = np.zeros((size, size), dtype=bool)
+            for winner_rank, row in enumerate(rows):
+                table[winner_rank] = np.frombuffer(bytes(row), dtype=np.uint8).astype(bool)
+            self._state = (size, rows, table)
+        return table
+
+    def forbidden_for(self, winner_rank):
+        """ترتيبات الأقل تسجيلاً الممنوعة أمام winner_rank"""
+        return sorted(loser for winner, loser in self.pairs if winner == winner_rank)
+
+    def replace(self, pairs):
+        pairs = {(int(winner), int(loser)) for winner, loser in pairs if winner > 0 and loser > 0}
+        with self._lock:
+            self._set(pairs, self.version + 1)
+            if self.storage:
+                self.storage.save_rank_pair_policy(self.pairs, self.version)
+        log.info("🚫 Rank pair policy v%s: %s pairs", self.version, len(self.pairs))
+
+    def set_forbidden_for(self, winner_rank, loser_ranks):
+        pairs = {pair for pair in self.pairs if pair[0] != winner_rank}
+        pairs.update((winner_rank, loser_rank) for loser_rank in loser_ranks)
+        self.replace(pairs)
+
+    def reset(self):
+        self.replace(FORBIDDEN_RANK_PAIRS)
+
+
+def parse_rank(value):
+    """ترتيب رقمي أو None ('N/A' أو قيمة غير صالحة)"""
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip())
+    except (ValueError, TypeError):
+        return None
+
+
+# تكلفة الحصول على خاصية: من سجل المباراة، من جدول مخزن مؤقتاً (جدول ترتيب واحد لكل دوري)، أو طلب شبكة
+COST_PURE, COST_CACHED, COST_NETWORK = 0, 1, 2
+COST_NAMES = {COST_PURE: 'pure', COST_CACHED: 'cached', COST_NETWORK: 'network'}
+
+# مجموعة خصائص تجلب معاً بطلب واحد: key يحدد الطلب (لتجميع الطلبات المتكررة)
+# و fetch يعيد قيم fields بالترتيب
+FeatureGroup = namedtuple('FeatureGroup', ['name', 'fields', 'cost', 'key', 'fetch'])
+
+
+def _side_groups(side, is_home):
+    team = f"{side}_team_id"
+    return [
+        FeatureGroup(
+            f"{side}_goals3", (f"{side}_goals3", f"{side}_count3"), COST_NETWORK,
+            lambda f: (getattr(f, team), f.league_id, f.season, is_home),
+            lambda app, f: app.fetch_team_last_goals_for_filter(getattr(f, team), f.league_id, f.season, is_home, 3)
+        ),
+        FeatureGroup(
+            f"{side}_for_against3", (f"{side}_goals_for3", f"{side}_goals_against3", f"{side}_played3"), COST_NETWORK,
+            lambda f: (getattr(f, team), f.league_id, f.season, is_home),
+            lambda app, f: app.fetch_team_last_goals_for_and_against(getattr(f, team), f.league_id, f.season, is_home, 3)
+        ),
+        FeatureGroup(
+            f"{side}_recent", (f"{side}_recent_for", f"{side}_recent_against"), COST_NETWORK,
+            lambda f: (getattr(f, team), f.league_id, f.season, is_home),
+            lambda app, f: app.extract_goals_for_and_against(
+                app.fetch_team_last_matches_improved(getattr(f, team), f.league_id, f.season, is_home)
+            )
+        ),
+        FeatureGroup(
+            f"{side}_rank", (f"{side}_rank",), COST_CACHED,
+            lambda f: (f.league_id, f.season),
+            lambda app, f: (parse_rank(app.fetch_team_standings_for_filter(getattr(f, team), f.league_id, f.season).get('current_rank')),)
+        ),
+        FeatureGroup(
+            f"{side}_rank_last", (f"{side}_rank_last",), COST_NETWORK,
+            lambda f: (getattr(f, team), f.season),
+            lambda app, f: (app._fetch_last_season_rank(getattr(f, team), f.season, f.league_id),)
+        ),
+    ]
+
+
+FEATURE_GROUPS = {group.name: group for group in _side_groups('home', True) + _side_groups('away', False)}
+FEATURE_SOURCES = {field: group for group in FEATURE_GROUPS.values() for field in group.fields}
+
+
+def feature_cost(fields):
+    """أعلى تكلفة بين الخصائص (حقول المباراة نفسها COST_PURE)"""
+    return max((FEATURE_SOURCES[field].cost for field in fields if field in FEATURE_SOURCES), default=COST_PURE)
+
+
+class MatchFeatures:
+    """
+    سجل خصائص مباراة واحدة للفلاتر: حقول المباراة متاحة فوراً،
+    والخصائص المحسوبة من الشبكة (FEATURE_GROUPS) تجلب عند أول قراءة فقط
+    """
+
+    BASE_FIELDS = ('id', 'status', 'home_score', 'away_score', 'home_team_id', 'away_team_id', 'league_id', 'season')
+
+    __slots__ = BASE_FIELDS + ('_engine', '_values')
+
+    # سياسة أزواج الترتيب المشتركة (يستبدلها التطبيق بنسخة مرتبطة بقاعدة البيانات)
+    rank_policy = RankPairPolicy()
+
+    def __init__(self, match, engine=None):
+        self.id = match.get('id')
+        self.status = match.get('status') or 'NS'
+        self.home_score = match.get('home_score') or 0
+        self.away_score = match.get('away_score') or 0
+        self.home_team_id = match.get('home_team_id')
+        self.away_team_id = match.get('away_team_id')
+        self.league_id = match.get('league_id')
+        self.season = match.get('season') or datetime.now().year
+        self._engine = engine
+        self._values = {}
+
+    def __getattr__(self, name):
+        # يستدعى فقط للخصائص غير الموجودة في __slots__
+        if name not in FEATURE_SOURCES:
+            raise AttributeError(name)
+        values = self._values
+        if name not in values:
+            self._engine.resolve(self, FEATURE_SOURCES[name])
+        return values[name]
+
+    @property
+    def has_ids(self):
+        return bool(self.home_team_id and self.away_team_id and self.league_id)
+
+
+Clause = namedtuple('Clause', ['when', 'passed', 'reason', 'needs', 'vector'])
+
+
+def accept(reason='', needs=(), when=None, vector=None):
+    """
+    بند قبول: reason نص ثابت أو دالة تبني النص من الخصائص، و when=None يعني دائماً
+    vector(columns, np) نفس الشرط على أعمدة N مباراة (مصفوفة منطقية) للتقييم الدفعي
+    """
+    return Clause(when, True, reason, tuple(needs), vector)
+
+
+def reject(reason='', needs=(), when=None, vector=None):
+    """بند رفض بنفس صيغة accept"""
+    return Clause(when, False, reason, tuple(needs), vector)
+
+
+def order_by_cost(clauses):
+    """
+    ترتيب البنود المتتالية ذات النتيجة نفسها من الأرخص للأغلى (ترتيب مستقر)
+    تبديل بندي رفض متتاليين لا يغير نجاح الفلتر بل السبب فقط، أما تجاوز بند بنتيجة مختلفة فيغيره
+    لذلك لا تنتقل البنود عبر بند بنتيجة مختلفة ولا عبر بند دائم (when=None)
+    """
+    ordered, run = [], []
+    for clause in clauses:
+        if run and (clause.passed != run[0].passed or clause.when is None):
+            ordered.extend(sorted(run, key=lambda item: feature_cost(item.needs)))
+            run = []
+        run.append(clause)
+        if clause.when is None:
+            ordered.extend(run)
+            run = []
+    ordered.extend(sorted(run, key=lambda item: feature_cost(item.needs)))
+    return ordered
+
+
+class FilterRule:
+    """
+    فلتر معرف كقائمة قرارات مرتبة: أول بند يتحقق شرطه يحدد النتيجة (والرفض إن لم يتحقق أي بند)
+    تترجم البنود مرة واحدة عند الإنشاء إلى دالة evaluate(features) -> Verdict
+
+    revision يرفع يدوياً عند تعديل البنود، و depends دوال تعيد إصدار بيانات خارجية
+    تقرأها القاعدة (مثل سياسة أزواج الترتيب)، ومنهما معاً version للنتائج المحفوظة
+    """
+
+    def __init__(self, name, clauses, revision=1, depends=()):
+        self.name = name
+        self.revision = revision
+        self.depends = tuple(depends)
+        self.clauses = tuple(order_by_cost(clauses))
+        self.required_features = frozenset(field for clause in self.clauses for field in clause.needs)
+        self.feature_groups = frozenset(FEATURE_SOURCES[field] for field in self.required_features if field in FEATURE_SOURCES)
+        self.cost = feature_cost(self.required_features)
+        self.vectorized = all(clause.when is None or clause.vector is not None for clause in self.clauses)
+        self.evaluate = self._compile()
+
+    def _compile(self):
+        steps = []
+        for clause in self.clauses:
+            if callable(clause.reason):
+                build = (lambda passed, reason: lambda features: Verdict(passed, reason(features)))(clause.passed, clause.reason)
+            else:
+                build = (lambda verdict: lambda features: verdict)(Verdict(clause.passed, clause.reason))
+            steps.append((clause.when, build))
+        steps = tuple(steps)
+        default = Verdict(False, '')
+
+        def evaluate(features):
+            for when, build in steps:
+                if when is None or when(features):
+                    return build(features)
+            return default
+
+        return evaluate
+
+    @property
+    def version(self):
+        return '.'.join(str(part) for part in (self.revision,) + tuple(depend() for depend in self.depends))
+
+    def __repr__(self):
+        return f"FilterRule({self.name})"
+
+
+class AllOfRule(FilterRule):
+    """تنجح فقط إذا نجحت كل القواعد، تقيم الأرخص أولاً وتتوقف عند أول قاعدة ترفض"""
+
+    def __init__(self, name, rules, revision=1):
+        self.rules = tuple(sorted(rules, key=lambda rule: rule.cost))
+        super().__init__(name, (), revision)
+        self.required_features = frozenset().union(*(rule.required_features for rule in self.rules))
+        self.feature_groups = frozenset().union(*(rule.feature_groups for rule in self.rules))
+        self.cost = feature_cost(self.required_features)
+        self.vectorized = all(rule.vectorized for rule in self.rules)
+
+    def _compile(self):
+        evaluators = tuple(rule.evaluate for rule in self.rules)
+        passed = Verdict(True, '')
+
+        def evaluate(features):
+            for rule_evaluate in evaluators:
+                verdict = rule_evaluate(features)
+                if not verdict.passed:
+                    return verdict
+            return passed
+
+        return evaluate
+
+    @property
+    def version(self):
+        return f"{self.revision}:" + '+'.join(rule.version for rule in self.rules)
+
+
+def _recent_by_result(f):
+    """(أهداف الخاسر: له، عليه)، (أهداف الفائز: له، عليه) في آخر 3 مباريات (مباريات الأرض للمضيف والخارج للضيف)"""
+    home = (f.home_recent_for, f.home_recent_against)
+    away = (f.away_recent_for, f.away_recent_against)
+    return (home, away) if f.home_score < f.away_score else (away, home)
+
+
+def _goals_leader(f):
+    """(التسمية، الأهداف، الترتيب) للأكثر تسجيلاً ثم للأقل في آخر 3 مباريات"""
+    home = ("Home", f.home_goals3, f.home_rank)
+    away = ("Away", f.away_goals3, f.away_rank)
+    return (home, away) if f.home_goals3 > f.away_goals3 else (away, home)
+
+
+def _leader_ranks(f):
+    winner, loser = _goals_leader(f)
+    return winner[2], loser[2]
+
+
+def _status_in(columns, np, statuses):
+    return np.isin(columns['status'], tuple(statuses))
+
+
+def _has_ids_vector(columns, np):
+    return (columns['home_team_id'] != 0) & (columns['away_team_id'] != 0) & (columns['league_id'] != 0)
+
+
+def _recent_by_result_vector(columns, np):
+    """نفس _recent_by_result لكل الصفوف: (له، عليه) للخاسر ثم للفائز"""
+    home_losing = columns['home_score'] < columns['away_score']
+    loser_for = np.where(home_losing, columns['home_recent_for'], columns['away_recent_for'])
+    loser_against = np.where(home_losing, columns['home_recent_against'], columns['away_recent_against'])
+    winner_for = np.where(home_losing, columns['away_recent_for'], columns['home_recent_for'])
+    winner_against = np.where(home_losing, columns['away_recent_against'], columns['home_recent_against'])
+    return (loser_for, loser_against), (winner_for, winner_against)
+
+
+def _forbidden_vector(columns, np):
+    """(ترتيب الأكثر تسجيلاً، ترتيب الأقل تسجيلاً) ممنوع حسب rank_policy عبر جدولها المنطقي"""
+    home_leads = columns['home_goals3'] > columns['away_goals3']
+    winner_rank = np.where(home_leads, columns['home_rank'], columns['away_rank'])
+    loser_rank = np.where(home_leads, columns['away_rank'], columns['home_rank'])
+    table = MatchFeatures.rank_policy.numpy_table(np)
+    size = table.shape[0]
+    valid = (winner_rank >= 0) & (loser_rank >= 0) & (winner_rank < size) & (loser_rank < size)
+    forbidden = np.zeros(len(winner_rank), dtype=bool)
+    forbidden[valid] = table[winner_rank[valid], loser_rank[valid]]
+    return forbidden
+
+
+def _ns_perfect_summary(f):
+    (winner_label, winner_goals, w_rank), (loser_label, loser_goals, l_rank) = _goals_leader(f)
+    return f"+:{winner_label} {winner_goals} | -:{loser_label} {loser_goals} | [{w_rank}] vs [{l_rank}]"
+
+
+SCORE_FEATURES = ('status', 'home_score', 'away_score')
+ID_FEATURES = ('home_team_id', 'away_team_id', 'league_id')
+RECENT_FEATURES = ('home_recent_for', 'home_recent_against', 'away_recent_for', 'away_recent_against')
+GOALS3_FEATURES = ('home_goals3', 'home_count3', 'away_goals3', 'away_count3')
+RANK_FEATURES = ('home_rank', 'away_rank')
+
+NO_FILTER_RULE = FilterRule('no_filter', ())
+
+CONDITION_1_RULE = FilterRule('condition_1', [
+    reject(needs=('status',), when=lambda f: f.status not in FILTER_ACTIVE_STATUSES,
+           vector=lambda c, np: ~_status_in(c, np, FILTER_ACTIVE_STATUSES)),
+    accept(needs=('status',), when=lambda f: f.status == 'NS',
+           vector=lambda c, np: c['status'] == 'NS'),
+    reject(needs=SCORE_FEATURES, when=lambda f: f.home_score > 0 and f.away_score > 0,
+           vector=lambda c, np: (c['home_score'] > 0) & (c['away_score'] > 0)),
+    accept(),
+])
+
+CONDITION_2_RULE = FilterRule('condition_2', [
+    reject("انتهت بالتعادل السلبي 0-0", SCORE_FEATURES,
+           lambda f: f.status in FINISHED_STATUSES and f.home_score == 0 and f.away_score == 0,
+           lambda c, np: _status_in(c, np, FINISHED_STATUSES) & (c['home_score'] == 0) & (c['away_score'] == 0)),
+    reject("انتهت: FT/AET/PEN", ('status',), lambda f: f.status in FINISHED_STATUSES,
+           lambda c, np: _status_in(c, np, FINISHED_STATUSES)),
+    reject("سجلوا كلاهما", SCORE_FEATURES, lambda f: f.home_score > 0 and f.away_score > 0,
+           lambda c, np: (c['home_score'] > 0) & (c['away_score'] > 0)),
+    reject(needs=('status',), when=lambda f: f.status not in FILTER_ACTIVE_STATUSES,
+           vector=lambda c, np: ~_status_in(c, np, FILTER_ACTIVE_STATUSES)),
+    accept(needs=SCORE_FEATURES, when=lambda f: f.home_score == f.away_score and f.status != 'NS',
+           vector=lambda c, np: (c['home_score'] == c['away_score']) & (c['status'] != 'NS')),
+    accept(needs=('status',), when=lambda f: f.status == 'NS',
+           vector=lambda c, np: c['status'] == 'NS'),
+    reject(needs=ID_FEATURES, when=lambda f: not f.has_ids,
+           vector=lambda c, np: ~_has_ids_vector(c, np)),
+    reject("الخاسر استقبل أكثر من 7 أهداف", SCORE_FEATURES + RECENT_FEATURES,
+           lambda f: _recent_by_result(f)[0][1] > 7,
+           lambda c, np: _recent_by_result_vector(c, np)[0][1] > 7),
+    reject("الخاسر استقبل عدد أهداف مرتفع", SCORE_FEATURES + RECENT_FEATURES,
+           lambda f: _recent_by_result(f)[0][1] - _recent_by_result(f)[1][1] > 2,
+           lambda c, np: _recent_by_result_vector(c, np)[0][1] - _recent_by_result_vector(c, np)[1][1] > 2),
+    accept(needs=SCORE_FEATURES + RECENT_FEATURES, when=lambda f: _recent_by_result(f)[0][0] >= _recent_by_result(f)[1][0],
+           vector=lambda c, np: _recent_by_result_vector(c, np)[0][0] >= _recent_by_result_vector(c, np)[1][0]),
+    reject("الأهداف المسجلة للخاسر أقل"),
+])
+
+CONDITION_1_AND_2_RULE = AllOfRule('condition_1_and_2', [CONDITION_1_RULE, CONDITION_2_RULE])
+
+NS_PERFECT_1_1_RULE = FilterRule('ns_perfect_1_1', [
+    reject("Match already started", ('status',), lambda f: f.status not in ('NS', 'TBD'),
+           lambda c, np: ~_status_in(c, np, ('NS', 'TBD'))),
+    reject("Missing team/league data", ID_FEATURES, lambda f: not f.has_ids,
+           lambda c, np: ~_has_ids_vector(c, np)),
+    reject(lambda f: f"Not enough matches: H:{f.home_count3}, A:{f.away_count3}", GOALS3_FEATURES,
+           lambda f: f.home_count3 < 3 or f.away_count3 < 3,
+           lambda c, np: (c['home_count3'] < 3) | (c['away_count3'] < 3)),
+    accept(lambda f: f"Equal goals: {f.home_goals3}-{f.away_goals3}", GOALS3_FEATURES,
+           lambda f: f.home_goals3 == f.away_goals3,
+           lambda c, np: c['home_goals3'] == c['away_goals3']),
+    reject("Rank Processing Error", RANK_FEATURES, lambda f: f.home_rank is None or f.away_rank is None,
+           lambda c, np: (c['home_rank'] < 0) | (c['away_rank'] < 0)),
+    reject(lambda f: "Forbidden: +{} vs -{}".format(*_leader_ranks(f)), GOALS3_FEATURES + RANK_FEATURES,
+           lambda f: f.rank_policy.is_forbidden(*_leader_ranks(f)),
+           _forbidden_vector),
+    accept(_ns_perfect_summary, GOALS3_FEATURES + RANK_FEATURES),
+], depends=(lambda: MatchFeatures.rank_policy.version,))
+
+PERFECT2_2_RULE = FilterRule('perfect2_2', [
+    reject("Missing basic match data", ('id',) + ID_FEATURES, lambda f: not (f.id and f.has_ids)),
+    accept(lambda f: (
+        f"Goals: H:{f.home_goals_for3}({f.home_goals_against3}) A:{f.away_goals_for3}({f.away_goals_against3}), "
+        f"Ranks: H:{f.home_rank or 'N/A'}({f.home_rank_last}) A:{f.away_rank or 'N/A'}({f.away_rank_last})"
+    ), needs=(
+        'home_goals_for3', 'home_goals_against3', 'away_goals_for3', 'away_goals_against3',
+        'home_rank', 'away_rank', 'home_rank_last', 'away_rank_last'
+    )),
+])
+
+
+class RuleEngine:
+    """
+    تقييم قواعد الفلترة على المباريات وجلب الخصائص المطلوبة عبر دوال التطبيق المخزنة مؤقتاً
+    stats يعد مجموعات الخصائص التي جلبت والتي تم تجنبها لأن النتيجة تحددت قبلها
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def features(self, match):
+        if isinstance(match, MatchFeatures):
+            return match
+        return MatchFeatures(match, self)
+
+    def resolve(self, features, group):
+        values = group.fetch(self.app, features)
+        features._values.update(zip(group.fields, values))
+
+    def evaluate(self, rule, match):
+        features = self.features(match)
+        try:
+            verdict = rule.evaluate(features)
+        except Exception as e:
+            log.warning("Error in filter %s: %s", rule.name, e)
+            return Verdict(False, f"System Error: {e}")
+
+        self.record(rule, (features,))
+        return verdict
+
+    def record(self, rule, features_list):
+        """عد مجموعات الخصائص التي جلبت أو تم تجنبها لكل مباراة بعد تحديد نتيجتها"""
+        counts = Counter(evaluations=len(features_list))
+        for features in features_list:
+            values = features._values
+            for group in rule.feature_groups:
+                tier = COST_NAMES[group.cost]
+                if group.fields[0] in values:
+                    counts[f'fetched_{tier}'] += 1
+                else:
+                    counts[f'avoided_{tier}'] += 1
+        with self._lock:
+            self.stats.update(counts)
+
+    def record_reused(self, count):
+        """نتائج أعيدت من VerdictCache دون تقييم"""
+        with self._lock:
+            self.stats['reused'] += count
+
+    def summary(self):
+        """{'evaluations', 'reused', 'fetched': {tier: n}, 'avoided': {tier: n}}"""
+        with self._lock:
+            stats = dict(self.stats)
+        return {
+            'evaluations': stats.get('evaluations', 0),
+            'reused': stats.get('reused', 0),
+            'fetched': {name: stats.get(f'fetched_{name}', 0) for name in ('cached', 'network')},
+            'avoided': {name: stats.get(f'avoided_{name}', 0) for name in ('cached', 'network')},
+        }
+
+    def plan(self, rule, matches):
+        """
+        الطلبات التي قد تحتاجها القاعدة لهذه المباريات: {اسم المجموعة: مجموعة المفاتيح}
+        المفاتيح المتكررة (نفس الدوري والموسم لجدول الترتيب مثلاً) تحسب مرة واحدة
+        """
+        plan = {group.name: set() for group in rule.feature_groups}
+        for match in matches:
+            features = self.features(match)
+            if not features.has_ids:
+                continue
+            for group in rule.feature_groups:
+                plan[group.name].add(group.key(features))
+        return plan
+
+
+class BatchEvaluator:
+    """
+    تقييم قاعدة على N مباراة دفعة واحدة: كل بند يطبق كعملية مصفوفات NumPy على أعمدة الخصائص
+    مع الحفاظ على نفس النتائج ونفس تجنب الطلبات (الخصائص تجلب فقط للصفوف التي لم تحسم بعد)
+    بدون NumPy أو لقاعدة بلا شروط مصفوفية يعود للتقييم العادي مباراة بمباراة
+
+    الخصائص المجلوبة تحفظ لكل مباراة (max_age ثانية) فإعادة الفلترة بعد تعديل قاعدة
+    أو تغير النتيجة لا تعيد أي طلب، ومع verdict_cache لا تقيم أصلاً المباريات التي لم تتغير مدخلاتها
+    """
+
+    # قيم الأعمدة للصفوف التي لم تجلب خصائصها (لا تؤثر لأن هذه الصفوف محسومة مسبقاً)
+    COLUMN_FILL = {'status': '', 'home_rank': -1, 'away_rank': -1}
+
+    def __init__(self, engine, max_age=300, capacity=2000, verdict_cache=None):
+        self.engine = engine
+        self.max_age = max_age
+        self.capacity = capacity
+        self.verdict_cache = verdict_cache
+        self._resolved = OrderedDict()
+        self._lock = threading.Lock()
+
+    def features(self, matches):
+        """سجلات الخصائص مع ما جلب سابقاً لنفس المباراة (ونفس الفرق والدوري والموسم)"""
+        now = time.time()
+        features_list = []
+        with self._lock:
+            for match in matches:
+                features = self.engine.features(match)
+                entry = self._resolved.get(features.id)
+                if entry and entry[0] == self._identity(features) and now - entry[1] < self.max_age:
+                    features._values.update(entry[2])
+                features_list.append(features)
+        return features_list
+
+    def remember(self, features_list):
+        now = time.time()
+        with self._lock:
+            for features in features_list:
+                if features.id is None or not features._values:
+                    continue
+                self._resolved[features.id] = (self._identity(features), now, dict(features._values))
+                self._resolved.move_to_end(features.id)
+            while len(self._resolved) > self.capacity:
+                self._resolved.popitem(last=False)
+
+    @staticmethod
+    def _identity(features):
+        return features.home_team_id, features.away_team_id, features.league_id, features.season
+
+    def evaluate(self, rule, matches):
+        """النتائج بنفس ترتيب matches"""
+        cache = self.verdict_cache
+        # القواعد التي لا تحتاج إلا حقول المباراة أرخص من البحث في الكاش
+        if cache is None or rule.cost == COST_PURE:
+            return self._evaluate(rule, self.features(matches))
+
+        version = rule.version
+        verdicts = []
+        misses = []
+        for match in matches:
+            features = self.engine.features(match)
+            fingerprint = cache.fingerprint(features)
+            verdict = cache.get(rule.name, version, features.id, fingerprint)
+            if verdict is None:
+                misses.append((len(verdicts), features, fingerprint))
+            verdicts.append(verdict)
+
+        if len(misses) < len(verdicts):
+            self.engine.record_reused(len(verdicts) - len(misses))
+        if not misses:
+            return verdicts
+
+        # نتيجة بنيت على قيم افتراضية بعد طلب فاشل تعاد الآن لكن لا تحفظ
+        instrumentation = self.engine.app.instrumentation
+        failures = instrumentation.failures()
+        fresh = self._evaluate(rule, self.features([features for _, features, _ in misses]))
+        store = instrumentation.failures() == failures
+
+        for (index, features, fingerprint), verdict in zip(misses, fresh):
+            verdicts[index] = verdict
+            if store and features.id is not None and not verdict.reason.startswith("System Error"):
+                cache.put(rule.name, version, features, fingerprint, verdict)
+        return verdicts
+
+    def _evaluate(self, rule, features_list):
+        engine = self.engine
+        np = load_numpy()
+        if np is None or not rule.vectorized or not features_list:
+            verdicts = [engine.evaluate(rule, features) for features in features_list]
+            self.remember(features_list)
+            return verdicts
+
+        try:
+            columns = ({}, {})
+            active = np.ones(len(features_list), dtype=bool)
+            verdicts = self._evaluate_rule(np, rule, features_list, active, columns)
+        except Exception as e:
+            log.warning("Batch filter %s failed, evaluating one by one: %s", rule.name, e)
+            verdicts = [engine.evaluate(rule, features) for features in features_list]
+        else:
+            engine.record(rule, features_list)
+
+        self.remember(features_list)
+        return verdicts
+
+    def _evaluate_rule(self, np, rule, features_list, active, columns):
+        """النتائج لكل الصفوف (None للصفوف غير النشطة)"""
+        if isinstance(rule, AllOfRule):
+            verdicts = [None] * len(features_list)
+            remaining = active.copy()
+            for sub_rule in rule.rules:
+                sub_verdicts = self._evaluate_rule(np, sub_rule, features_list, remaining, columns)
+                for index in np.flatnonzero(remaining):
+                    verdict = sub_verdicts[index]
+                    if not verdict.passed:
+                        verdicts[index] = verdict
+                        remaining[index] = False
+            passed = Verdict(True, '')
+            for index in np.flatnonzero(remaining):
+                verdicts[index] = passed
+            return verdicts
+
+        decided = np.full(len(features_list), -1)
+        undecided = active.copy()
+        for position, clause in enumerate(rule.clauses):
+            if not undecided.any():
+                break
+            if clause.when is None:
+                hit = undecided
+            else:
+                arrays = self._load_columns(np, clause.needs, features_list, undecided, columns)
+                hit = undecided & clause.vector(arrays, np)
+            decided[hit] = position
+            undecided = undecided & ~hit
+
+        rejected = Verdict(False, '')
+        verdicts = [None] * len(features_list)
+        for index in np.flatnonzero(active):
+            position = decided[index]
+            if position < 0:
+                verdicts[index] = rejected
+                continue
+            clause = rule.clauses[position]
+            reason = clause.reason(features_list[index]) if callable(clause.reason) else clause.reason
+            verdicts[index] = Verdict(clause.passed, reason)
+        return verdicts
+
+    def _load_columns(self, np, names, features_list, rows, columns):
+        """
+        تحميل أعمدة الخصائص المطلوبة للصفوف rows فقط
+        columns = ({الاسم: المصفوفة}، {الاسم: الصفوف المحملة}) ويعاد قاموس المصفوفات
+        """
+        arrays, loaded = columns
+        for name in names:
+            fill = self.COLUMN_FILL.get(name, 0)
+            if name not in arrays:
+                arrays[name] = np.full(len(features_list), fill, dtype=object if isinstance(fill, str) else np.int64)
+                loaded[name] = np.zeros(len(features_list), dtype=bool)
+            missing = rows & ~loaded[name]
+            if missing.any():
+                values = arrays[name]
+                for index in np.flatnonzero(missing):
+                    value = getattr(features_list[index], name)
+                    values[index] = fill if value is None else value
+                loaded[name] |= missing
+        return arrays
+
+
+class DataVersions:
+    """
+    إصدارات البيانات التي تقرأها الفلاتر: سجل مباريات كل فريق وجدول ترتيب كل (دوري، موسم)
+    الإصدار هو وقت آخر تغيير معروف بالميلي ثانية ويحفظ في SQLite، و 0 يعني أن لا مصدر يتابع هذه البيانات
+    (فقد تتغير والتطبيق مغلق)
+    """
+
+    def __init__(self, storage=None):
+        self.storage = storage
+        self._history = {}
+        self._standings = {}
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        if not self.storage:
+            return
+        with self._lock:
+            for kind, item, version in self.storage.load_data_versions():
+                if kind == 'history':
+                    self._history[int(item)] = version
+                else:
+                    league_id, season = item.split(':')
+                    self._standings[(int(league_id), int(season))] = version
+                self._last = max(self._last, version)
+
+    def _next(self):
+        self._last = max(self._last + 1, int(time.time() * 1000))
+        return self._last
+
+    @property
+    def latest(self):
+        """آخر إصدار صدر (يتغير مع كل رفع)"""
+        return self._last
+
+    def _save(self, rows):
+        if self.storage and rows:
+            self.storage.save_data_versions(rows)
+
+    def history(self, team_id):
+        return self._history.get(team_id, 0)
+
+    def standings(self, league_id, season):
+        return self._standings.get((league_id, season), 0)
+
+    def bump_history(self, team_ids):
+        rows = []
+        with self._lock:
+            version = self._next()
+            for team_id in team_ids:
+                if team_id:
+                    self._history[team_id] = version
+                    rows.append(('history', str(team_id), version))
+        self._save(rows)
+
+    def bump_standings(self, league_id, season):
+        with self._lock:
+            version = self._standings[(league_id, season)] = self._next()
+        self._save([('standings', f"{league_id}:{season}", version)])
+
+    def match_finished(self, match):
+        """مباراة انتهت: تغير سجل الفريقين وجدول ترتيب دوريهما"""
+        self.bump_history((match.get('home_team_id'), match.get('away_team_id')))
+        if match.get('league_id'):
+            self.bump_standings(match.get('league_id'), match.get('season') or datetime.now().year)
+
+
+class VerdictCache:
+    """
+    نتائج الفلاتر المحفوظة لكل (فلتر، مباراة) مع إصدار الفلتر وبصمة المدخلات:
+    الحالة والنتيجة وإصدار سجل مباريات الفريقين وإصدار جدول ترتيب الدوري (DataVersions)
+    ما دامت البصمة نفسها تعاد النتيجة دون تقييم أو طلبات، وتحفظ في SQLite بين التشغيلات (max_age ثانية)
+
+    بعد تغير إصدار قد تبقى بيانات قديمة في كاش الخصائص حتى settle ثانية،
+    لذلك لا تحفظ النتائج المحسوبة خلال هذه المدة
+    والنتائج المحفوظة التي في بصمتها إصدار 0 لا تعاد في تشغيل لاحق (تغير بياناتها غير مرصود)
+    """
+
+    def __init__(self, storage=None, versions=None, max_age=3 * 3600, settle=300, flush_every=50):
+        self.storage = storage
+        self.versions = versions or DataVersions()
+        self.max_age = max_age
+        self.settle = settle
+        self.flush_every = flush_every
+        self._entries = {}
+        self._pending = []
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _versions(self, features):
+        versions = self.versions
+        return (
+            versions.history(features.home_team_id),
+            versions.history(features.away_team_id),
+            versions.standings(features.league_id, features.season),
+        )
+
+    def fingerprint(self, features):
+        return '|'.join(map(str, (features.status, features.home_score, features.away_score) + self._versions(features)))
+
+    def _load(self):
+        # عند أول استخدام (داخل القفل) حتى لا يبطئ بدء التشغيل
+        self._loaded = True
+        if not self.storage:
+            return
+        for filter_id, match_id, filter_version, fingerprint, passed, reason, created_at in \
+                self.storage.load_verdict_cache(time.time() - self.max_age):
+            if '0' in fingerprint.split('|')[-3:]:
+                continue
+            self._entries[(filter_id, match_id)] = (filter_version, fingerprint, Verdict(bool(passed), reason or ''), created_at)
+
+    def get(self, filter_id, filter_version, match_id, fingerprint):
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            entry = self._entries.get((filter_id, match_id))
+        if entry and entry[0] == filter_version and entry[1] == fingerprint and time.time() - entry[3] < self.max_age:
+            return entry[2]
+        return None
+
+    def put(self, filter_id, filter_version, features, fingerprint, verdict):
+        now = time.time()
+        if max(self._versions(features)) > (now - self.settle) * 1000:
+            return
+        with self._lock:
+            self._entries[(filter_id, features.id)] = (filter_version, fingerprint, verdict, now)
+            self._pending.append((filter_id, features.id, filter_version, fingerprint, int(verdict.passed), verdict.reason, now))
+            if len(self._pending) < self.flush_every:
+                return
+            pending, self._pending = self._pending, []
+        if self.storage:
+            self.storage.save_verdicts(pending, now - self.max_age)
+
+    def flush(self):
+        """حفظ النتائج المعلقة وحذف المنتهية من الذاكرة و SQLite"""
+        now = time.time()
+        with self._lock:
+            pending, self._pending = self._pending, []
+            expired = [key for key, entry in self._entries.items() if now - entry[3] >= self.max_age]
+            for key in expired:
+                del self._entries[key]
+        if pending and self.storage:
+            self.storage.save_verdicts(pending, now - self.max_age)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+KV = '''
+#:import get_color_from_hex kivy.utils.get_color_from_hex
+#:import dp kivy.metrics.dp
+#:import Animation kivy.animation.Animation
+
+<CalendarHeader>:
+    size_hint_y: None
+    height: dp(50)
+    orientation: 'horizontal'
+    spacing: dp(10)
+    padding: dp(5)
+    
+    MDIconButton:
+        id: prev_btn
+        icon: 'chevron-left'
+        theme_text_color: 'Custom'
+        text_color: get_color_from_hex("#2196F3")
+        on_release: root.previous_day()
+        
+    MDRaisedButton:
+        id: date_btn
+        text: root.selected_date
+        size_hint_x: 0.7
+        md_bg_color: get_color_from_hex("#2196F3")
+        
+    MDIconButton:
+        id: next_btn
+        icon: 'chevron-right'
+        theme_text_color: 'Custom'
+        text_color: get_color_from_hex("#2196F3")
+        on_release: root.next_day()
+
+<LoadingWidget>:
+    orientation: 'vertical'
+    spacing: dp(20)
+    padding: dp(20)
+    size_hint_y: None
+    height: dp(150)
+
+    MDLabel:
+        text: root.loading_text
+        halign: 'center'
+        theme_text_color: 'Secondary'
+        font_style: 'H6'
+        bold: True
+
+    MDProgressBar:
+        id: progress_bar
+        value: root.progress_value
+        type: "determinate"
+        
+    MDLabel:
+        id: progress_text
+        text: f"{int(root.progress_value)}%"
+        halign: 'center'
+        theme_text_color: 'Primary'
+        font_style: 'H5'
+        bold: True
+
+    MDLabel:
+        id: status_text
+        text: root.status_text
+        halign: 'center'
+        theme_text_color: 'Secondary'
+        font_style: 'Caption'
+
+<ErrorWidget>:
+    orientation: 'vertical'
+    spacing: dp(20)
+    padding: dp(20)
+    size_hint_y: None
+    height: dp(150)
+
+    MDIcon:
+        icon: "wifi-off"
+        size_hint: None, None
+        size: dp(48), dp(48)
+        pos_hint: {'center_x': 0.5}
+        theme_text_color: 'Secondary'
+
+    MDLabel:
+        text: root.error_text
+        halign: 'center'
+        theme_text_color: 'Secondary'
+
+    MDRaisedButton:
+        text: "Retry"
+        pos_hint: {'center_x': 0.5}
+        on_release: app.retry_loading()
+
+<OptimizedCompactMatchItem>:
+    size_hint_y: None
+    height: dp(80)
+    x: 0
+    md_bg_color: get_color_from_hex("000000") if root.is_live else get_color_from_hex("#FFFFFF")
+    elevation: 2 if root.is_live else 1
+    padding: dp(8)
+    radius: dp(8)
+    orientation: 'horizontal'
+    spacing: dp(6)
+
+    BoxLayout:
+        orientation: 'vertical'
+        size_hint_x: 0.20
+        spacing: dp(2)
+        
+        MDLabel:
+            text: root.match_time
+            font_style: 'Caption'
+            theme_text_color: 'Custom'
+            text_color: get_color_from_hex("#FF0000") if root.is_live else get_color_from_hex("#666666")
+            halign: 'center'
+            bold: True
+            font_size: '16sp'
+            
+        MDLabel:
+            text: root.league_name
+            font_style: 'Caption'
+            theme_text_color: 'Custom'
+            text_color: get_color_from_hex("#FFFFFF") if root.is_live else get_color_from_hex("#999999")
+            halign: 'center'
+            font_size: '9sp'
+            shorten: True
+            shorten_from: 'right'
+            text_size: self.width, None
+
+    BoxLayout:
+        orientation: 'horizontal'
+        size_hint_x: 0.65
+        spacing: dp(5)
+
+        BoxLayout:
+            orientation: 'horizontal'
+            size_hint_x: 0.48
+            spacing: dp(3)
+            
+            MDLabel:
+                text: root.home_team
+                font_style: 'Body2'
+                halign: 'right'
+                theme_text_color: 'Custom'
+                text_color: get_color_from_hex("#FFFFFF") if root.is_live else get_color_from_hex("#000000")
+                shorten: True
+                shorten_from: 'right'
+                font_size: '12sp'
+                text_size: self.width, None
+                
+            MDLabel:
+                text: root.home_score
+                font_style: 'Subtitle1'
+                halign: 'center'
+                theme_text_color: 'Custom'
+                text_color: get_color_from_hex("FFFFFF") if root.is_live else get_color_from_hex("#000000")
+                bold: True
+                font_size: '18sp'
+                size_hint_x: 0.28
+
+        BoxLayout:
+            orientation: 'vertical'
+            size_hint_x: 0.12
+            spacing: dp(2)
+            
+            MDLabel:
+                text: root.match_status
+                font_style: 'Caption'
+                halign: 'center'
+                theme_text_color: 'Custom'
+                text_color: get_color_from_hex("#FF0000") if root.is_live else get_color_from_hex("#666666")
+                bold: root.is_live
+                font_size: '10sp'
+
+        BoxLayout:
+            orientation: 'horizontal'
+            size_hint_x: 0.48
+            spacing: dp(3)
+            
+            MDLabel:
+                text: root.away_score
+                font_style: 'Subtitle1'
+                halign: 'center'
+                theme_text_color: 'Custom'
+                text_color: get_color_from_hex("FFFFFF") if root.is_live else get_color_from_hex("#000000")
+                bold: True
+                font_size: '18sp'
+                size_hint_x: 0.28
+                
+            MDLabel:
+                text: root.away_team
+                font_style: 'Body2'
+                halign: 'left'
+                theme_text_color: 'Custom'
+                text_color: get_color_from_hex("#FFFFFF") if root.is_live else get_color_from_hex("#000000")
+                shorten: True
+                shorten_from: 'left'
+                font_size: '12sp'
+                text_size: self.width, None
+
+    BoxLayout:
+        orientation: 'vertical'
+        size_hint_x: 0.15
+        spacing: dp(2)
+        
+        MDIconButton:
+            id: hide_button
+            icon: 'eye-off'
+            user_font_size: '20sp'
+            theme_text_color: 'Custom'
+            text_color: get_color_from_hex("#FF5252")
+            on_release: root.hide_match()
+            size_hint_y: 1
+
+<BottomNavButton@MDFloatLayout>:
+    size_hint: None, None
+    size: dp(80), dp(70)
+    icon: ''
+    text: ''
+    selected: False
+
+    MDIconButton:
+        icon: root.icon
+        theme_text_color: 'Custom'
+        text_color: get_color_from_hex("#2196F3") if root.selected else get_color_from_hex("#757575")
+        pos_hint: {'center_x': 0.5, 'center_y': 0.6}
+        user_font_size: '24sp'
+        on_release: app.switch_tab(root.text.lower())
+
+    MDLabel:
+        text: root.text
+        theme_text_color: 'Custom'
+        text_color: get_color_from_hex("#2196F3") if root.selected else get_color_from_hex("#757575")
+        font_style: 'Caption'
+        halign: 'center'
+        pos_hint: {'center_x': 0.5, 'center_y': 0.2}
+
+BoxLayout:
+    orientation: 'vertical'
+    spacing: 0
+
+    MDTopAppBar:
+        id: topbar
+        title: app.current_title
+        elevation: 0
+        md_bg_color: get_color_from_hex("#2196F3")
+        specific_text_color: get_color_from_hex("#FFFFFF")
+        left_action_items: 
+            [
+            ['arrow-left', lambda x: app.go_back()],
+            ['menu', lambda x: app.open_menu()]
+            ]
+        right_action_items: 
+            [
+            ['autorenew', lambda x: app.actualaser_refresh()],
+            ['update', lambda x: app.manual_refresh()]
+            ]
+        height: dp(52)
+
+    RelativeLayout:
+        id: stats_popup_container
+        size_hint_y: None
+        height: 0
+
+    CalendarHeader:
+        id: calendar_header
+
+    BoxLayout:
+        orientation: 'vertical'
+        spacing: dp(6)
+        padding: dp(6)
+
+        BoxLayout:
+            size_hint_y: None
+            height: dp(35)
+            spacing: dp(8)
+
+            MDLabel:
+                text: app.current_time
+                font_style: 'H1'
+                halign: 'center'
+                theme_text_color: 'Primary'
+                font_size: '1sp'
+                size_hint_x: 1
+                bold: True
+
+        ScrollView:
+            id: main_scroll
+            MDGridLayout:
+                id: main_list
+                cols: 1
+                adaptive_height: True
+                spacing: dp(6)
+                padding: dp(4)
+
+    BoxLayout:
+        id: bottom_nav
+        size_hint_y: None
+        height: dp(65)
+        md_bg_color: get_color_from_hex("#FFFFFF")
+        padding: dp(6)
+        spacing: dp(4)
+
+        BottomNavButton:
+            id: btn_en_cours
+            icon: 'play-circle'
+            text: 'Live'
+            selected: True
+
+        BottomNavButton:
+            id: btn_favoris
+            icon: 'star'
+            text: 'Favorites'
+
+        BottomNavButton:
+            id: btn_competitions
+            icon: 'trophy'
+            text: 'Leagues'
+
+        BottomNavButton:
+            id: btn_profil
+            icon: 'account'
+            text: 'Profile'
+'''
+
+# قواعد KV للشاشات قليلة الاستخدام: تترجم عند أول إنشاء للعنصر بدل بدء التشغيل
+LAZY_KV = {
+    'stats_popup': '''
+#:import get_color_from_hex kivy.utils.get_color_from_hex
+#:import dp kivy.metrics.dp
+
+<StatsPopup>:
+    size_hint: None, None
+    size: dp(210), dp(170)
+    pos_hint: {'center_x': 0.5, 'center_y': 0.9}
+    md_bg_color: get_color_from_hex("#000000")
+    radius: dp(45)
+    opacity: 0
+    
+    MDBoxLayout:
+        orientation: 'vertical'
+        spacing: dp(5)
+        padding: dp(15)
+        pos_hint: {'center_x': 0.5, 'center_y': 0.5}
+        
+        MDLabel:
             text: "From Cache" if root.from_cache else "Live Stats"
             theme_text_color: 'Custom'
             text_color: get_color_from_hex("#4CAF50") if root.from_cache else get_color_from_hex("#2196F3")
@@ -901,397 +3983,123 @@ KV = '''
                         text_color: get_color_from_hex("#00FF00") if root.second_team_color == 'green' else (get_color_from_hex("#2196F3") if root.second_team_color == 'blue' else (get_color_from_hex("#FF0000") if root.second_team_color == 'red' else get_color_from_hex("#FFFFFF")))
                         font_size: "9sp"
                         halign: 'center'
-                        size_hint_x: 0.1
-                        
-                    MDLabel:
-                        text: root.second_team_goals_against
-                        theme_text_color: 'Custom'
-                        text_color: get_color_from_hex("#FF0000")
-                        font_size: "21sp"
-                        halign: 'center'
-                        bold: True
-        
-        MDBoxLayout:
-            orientation: 'horizontal'
-            spacing: dp(15)
-            size_hint_y: None
-            height: dp(40)
-            
-            MDBoxLayout:
-                orientation: 'vertical'
-                size_hint_x: 0.35
-                spacing: dp(2)
-                
-                MDLabel:
-                    text: "Classement"
-                    theme_text_color: 'Custom'
-                    text_color: get_color_from_hex("#FFFFFF")
-                    font_size: "8sp"
-                    halign: 'center'
-                
-                MDBoxLayout:
-                    orientation: 'horizontal'
-                    spacing: dp(5)
-                    
-                    MDLabel:
-                        text: root.first_team_current_rank
-                        theme_text_color: 'Custom'
-                        text_color: get_color_from_hex("#00FF00")
-                        font_size: "15sp"
-                        halign: 'center'
-                        bold: True
-                        
-                    MDLabel:
-                        text: "(" + root.first_team_last_rank + ")"
-                        theme_text_color: 'Custom'
-                        text_color: root.first_last_rank_color
-                        font_size: "15sp"
-                        halign: 'center'
-            
-            MDLabel:
-                text: "|"
-                theme_text_color: 'Custom'
-                text_color: get_color_from_hex("#666666")
-                font_size: "12sp"
-                halign: 'center'
-                size_hint_x: 0.1
-            
-            MDBoxLayout:
-                orientation: 'vertical'
-                size_hint_x: 0.35
-                spacing: dp(2)
-                
-                MDBoxLayout:
-                    orientation: 'vertical'
-                    spacing: dp(5)
-
-                    MDLabel:
-                        text: "Classement"
-                        theme_text_color: 'Custom'
-                        text_color: get_color_from_hex("#FFFFFF")
-                        font_size: "8sp"
-                        halign: 'center'
-                    
-                    MDBoxLayout:
-                        orientation: 'horizontal'
-                        spacing: dp(5)
-                        
-                        MDLabel:
-                            text: root.second_team_current_rank
-                            theme_text_color: 'Custom'
-                            text_color: get_color_from_hex("#00FF00")
-                            font_size: "15sp"
-                            halign: 'center'
-                            bold: True
-                            
-                        MDLabel:
-                            text: "(" + root.second_team_last_rank + ")"
-                            theme_text_color: 'Custom'
-                            text_color: root.second_last_rank_color
-                            font_size: "15sp"
-                            halign: 'center'
-
-<LeagueItem>:
-    IconLeftWidget:
-        id: check
-        icon: "checkbox-blank-outline"
-        on_release: root.toggle_checkbox()
-
-<FavoriteLeagueItem>:
-    IconLeftWidget:
-        icon: "star"
-        theme_text_color: 'Custom'
-        text_color: get_color_from_hex("#FFD700")
-
-<LoadingWidget>:
-    orientation: 'vertical'
-    spacing: dp(20)
-    padding: dp(20)
-    size_hint_y: None
-    height: dp(150)
-
-    MDLabel:
-        text: root.loading_text
-        halign: 'center'
-        theme_text_color: 'Secondary'
-        font_style: 'H6'
-        bold: True
-
-    MDProgressBar:
-        id: progress_bar
-        value: root.progress_value
-        type: "determinate"
-        
-    MDLabel:
-        id: progress_text
-        text: f"{int(root.progress_value)}%"
-        halign: 'center'
-        theme_text_color: 'Primary'
-        font_style: 'H5'
-        bold: True
-
-    MDLabel:
-        id: status_text
-        text: root.status_text
-        halign: 'center'
-        theme_text_color: 'Secondary'
-        font_style: 'Caption'
-
-<ErrorWidget>:
-    orientation: 'vertical'
-    spacing: dp(20)
-    padding: dp(20)
-    size_hint_y: None
-    height: dp(150)
-
-    MDIcon:
-        icon: "wifi-off"
-        size_hint: None, None
-        size: dp(48), dp(48)
-        pos_hint: {'center_x': 0.5}
-        theme_text_color: 'Secondary'
-
-    MDLabel:
-        text: root.error_text
-        halign: 'center'
-        theme_text_color: 'Secondary'
-
-    MDRaisedButton:
-        text: "Retry"
-        pos_hint: {'center_x': 0.5}
-        on_release: app.retry_loading()
-
-<OptimizedCompactMatchItem>:
-    size_hint_y: None
-    height: dp(80)
-    x: 0
-    md_bg_color: get_color_from_hex("000000") if root.is_live else get_color_from_hex("#FFFFFF")
-    elevation: 2 if root.is_live else 1
-    padding: dp(8)
-    radius: dp(8)
-    orientation: 'horizontal'
-    spacing: dp(6)
-
-    BoxLayout:
-        orientation: 'vertical'
-        size_hint_x: 0.20
-        spacing: dp(2)
-        
-        MDLabel:
-            text: root.match_time
-            font_style: 'Caption'
-            theme_text_color: 'Custom'
-            text_color: get_color_from_hex("#FF0000") if root.is_live else get_color_from_hex("#666666")
-            halign: 'center'
-            bold: True
-            font_size: '16sp'
-            
-        MDLabel:
-            text: root.league_name
-            font_style: 'Caption'
-            theme_text_color: 'Custom'
-            text_color: get_color_from_hex("#FFFFFF") if root.is_live else get_color_from_hex("#999999")
-            halign: 'center'
-            font_size: '9sp'
-            shorten: True
-            shorten_from: 'right'
-            text_size: self.width, None
-
-    BoxLayout:
-        orientation: 'horizontal'
-        size_hint_x: 0.65
-        spacing: dp(5)
-
-        BoxLayout:
+                        size_hint_x: 0.1
+                        
+                    MDLabel:
+                        text: root.second_team_goals_against
+                        theme_text_color: 'Custom'
+                        text_color: get_color_from_hex("#FF0000")
+                        font_size: "21sp"
+                        halign: 'center'
+                        bold: True
+        
+        MDBoxLayout:
             orientation: 'horizontal'
-            size_hint_x: 0.48
-            spacing: dp(3)
+            spacing: dp(15)
+            size_hint_y: None
+            height: dp(40)
             
-            MDLabel:
-                text: root.home_team
-                font_style: 'Body2'
-                halign: 'right'
-                theme_text_color: 'Custom'
-                text_color: get_color_from_hex("#FFFFFF") if root.is_live else get_color_from_hex("#000000")
-                shorten: True
-                shorten_from: 'right'
-                font_size: '12sp'
-                text_size: self.width, None
+            MDBoxLayout:
+                orientation: 'vertical'
+                size_hint_x: 0.35
+                spacing: dp(2)
                 
-            MDLabel:
-                text: root.home_score
-                font_style: 'Subtitle1'
-                halign: 'center'
-                theme_text_color: 'Custom'
-                text_color: get_color_from_hex("FFFFFF") if root.is_live else get_color_from_hex("#000000")
-                bold: True
-                font_size: '18sp'
-                size_hint_x: 0.28
-
-        BoxLayout:
-            orientation: 'vertical'
-            size_hint_x: 0.12
-            spacing: dp(2)
+                MDLabel:
+                    text: "Classement"
+                    theme_text_color: 'Custom'
+                    text_color: get_color_from_hex("#FFFFFF")
+                    font_size: "8sp"
+                    halign: 'center'
+                
+                MDBoxLayout:
+                    orientation: 'horizontal'
+                    spacing: dp(5)
+                    
+                    MDLabel:
+                        text: root.first_team_current_rank
+                        theme_text_color: 'Custom'
+                        text_color: get_color_from_hex("#00FF00")
+                        font_size: "15sp"
+                        halign: 'center'
+                        bold: True
+                        
+                    MDLabel:
+                        text: "(" + root.first_team_last_rank + ")"
+                        theme_text_color: 'Custom'
+                        text_color: root.first_last_rank_color
+                        font_size: "15sp"
+                        halign: 'center'
             
             MDLabel:
-                text: root.match_status
-                font_style: 'Caption'
-                halign: 'center'
+                text: "|"
                 theme_text_color: 'Custom'
-                text_color: get_color_from_hex("#FF0000") if root.is_live else get_color_from_hex("#666666")
-                bold: root.is_live
-                font_size: '10sp'
-
-        BoxLayout:
-            orientation: 'horizontal'
-            size_hint_x: 0.48
-            spacing: dp(3)
-            
-            MDLabel:
-                text: root.away_score
-                font_style: 'Subtitle1'
+                text_color: get_color_from_hex("#666666")
+                font_size: "12sp"
                 halign: 'center'
-                theme_text_color: 'Custom'
-                text_color: get_color_from_hex("FFFFFF") if root.is_live else get_color_from_hex("#000000")
-                bold: True
-                font_size: '18sp'
-                size_hint_x: 0.28
+                size_hint_x: 0.1
+            
+            MDBoxLayout:
+                orientation: 'vertical'
+                size_hint_x: 0.35
+                spacing: dp(2)
                 
-            MDLabel:
-                text: root.away_team
-                font_style: 'Body2'
-                halign: 'left'
-                theme_text_color: 'Custom'
-                text_color: get_color_from_hex("#FFFFFF") if root.is_live else get_color_from_hex("#000000")
-                shorten: True
-                shorten_from: 'left'
-                font_size: '12sp'
-                text_size: self.width, None
-
-    BoxLayout:
-        orientation: 'vertical'
-        size_hint_x: 0.15
-        spacing: dp(2)
-        
-        MDIconButton:
-            id: hide_button
-            icon: 'eye-off'
-            user_font_size: '20sp'
-            theme_text_color: 'Custom'
-            text_color: get_color_from_hex("#FF5252")
-            on_release: root.hide_match()
-            size_hint_y: 1
+                MDBoxLayout:
+                    orientation: 'vertical'
+                    spacing: dp(5)
 
-<BottomNavButton@MDFloatLayout>:
-    size_hint: None, None
-    size: dp(80), dp(70)
-    icon: ''
-    text: ''
-    selected: False
+                    MDLabel:
+                        text: "Classement"
+                        theme_text_color: 'Custom'
+                        text_color: get_color_from_hex("#FFFFFF")
+                        font_size: "8sp"
+                        halign: 'center'
+                    
+                    MDBoxLayout:
+                        orientation: 'horizontal'
+                        spacing: dp(5)
+                        
+                        MDLabel:
+                            text: root.second_team_current_rank
+                            theme_text_color: 'Custom'
+                            text_color: get_color_from_hex("#00FF00")
+                            font_size: "15sp"
+                            halign: 'center'
+                            bold: True
+                            
+                        MDLabel:
+                            text: "(" + root.second_team_last_rank + ")"
+                            theme_text_color: 'Custom'
+                            text_color: root.second_last_rank_color
+                            font_size: "15sp"
+                            halign: 'center'
+''',
+    'league_items': '''
+#:import get_color_from_hex kivy.utils.get_color_from_hex
+#:import dp kivy.metrics.dp
 
-    MDIconButton:
-        icon: root.icon
-        theme_text_color: 'Custom'
-        text_color: get_color_from_hex("#2196F3") if root.selected else get_color_from_hex("#757575")
-        pos_hint: {'center_x': 0.5, 'center_y': 0.6}
-        user_font_size: '24sp'
-        on_release: app.switch_tab(root.text.lower())
+<LeagueItem>:
+    IconLeftWidget:
+        id: check
+        icon: "checkbox-blank-outline"
+        on_release: root.toggle_checkbox()
 
-    MDLabel:
-        text: root.text
+<FavoriteLeagueItem>:
+    IconLeftWidget:
+        icon: "star"
         theme_text_color: 'Custom'
-        text_color: get_color_from_hex("#2196F3") if root.selected else get_color_from_hex("#757575")
-        font_style: 'Caption'
-        halign: 'center'
-        pos_hint: {'center_x': 0.5, 'center_y': 0.2}
-
-BoxLayout:
-    orientation: 'vertical'
-    spacing: 0
-
-    MDTopAppBar:
-        id: topbar
-        title: app.current_title
-        elevation: 0
-        md_bg_color: get_color_from_hex("#2196F3")
-        specific_text_color: get_color_from_hex("#FFFFFF")
-        left_action_items: 
-            [
-            ['arrow-left', lambda x: app.go_back()],
-            ['menu', lambda x: app.open_menu()]
-            ]
-        right_action_items: 
-            [
-            ['autorenew', lambda x: app.actualaser_refresh()],
-            ['update', lambda x: app.manual_refresh()]
-            ]
-        height: dp(52)
-
-    RelativeLayout:
-        id: stats_popup_container
-        size_hint_y: None
-        height: 0
-
-    CalendarHeader:
-        id: calendar_header
-
-    BoxLayout:
-        orientation: 'vertical'
-        spacing: dp(6)
-        padding: dp(6)
-
-        BoxLayout:
-            size_hint_y: None
-            height: dp(35)
-            spacing: dp(8)
-
-            MDLabel:
-                text: app.current_time
-                font_style: 'H1'
-                halign: 'center'
-                theme_text_color: 'Primary'
-                font_size: '1sp'
-                size_hint_x: 1
-                bold: True
-
-        ScrollView:
-            id: main_scroll
-            MDGridLayout:
-                id: main_list
-                cols: 1
-                adaptive_height: True
-                spacing: dp(6)
-                padding: dp(4)
-
-    BoxLayout:
-        id: bottom_nav
-        size_hint_y: None
-        height: dp(65)
-        md_bg_color: get_color_from_hex("#FFFFFF")
-        padding: dp(6)
-        spacing: dp(4)
-
-        BottomNavButton:
-            id: btn_en_cours
-            icon: 'play-circle'
-            text: 'Live'
-            selected: True
-
-        BottomNavButton:
-            id: btn_favoris
-            icon: 'star'
-            text: 'Favorites'
+        text_color: get_color_from_hex("#FFD700")
+''',
+}
 
-        BottomNavButton:
-            id: btn_competitions
-            icon: 'trophy'
-            text: 'Leagues'
+_loaded_lazy_kv = set()
+
+
+def load_lazy_kv(name):
+    """ترجمة قاعدة KV مؤجلة مرة واحدة"""
+    if name not in _loaded_lazy_kv:
+        _loaded_lazy_kv.add(name)
+        Builder.load_string(LAZY_KV[name])
 
-        BottomNavButton:
-            id: btn_profil
-            icon: 'account'
-            text: 'Profile'
-'''
 
 class ProfessionalFootballApp(MDApp):
     current_tab = StringProperty('live')
@@ -1309,6 +4117,8 @@ class ProfessionalFootballApp(MDApp):
     
     auto_update = BooleanProperty(False)
     update_interval = NumericProperty(600)
+    live_fast_interval = NumericProperty(30)
+    live_normal_interval = NumericProperty(120)
     last_update = StringProperty('')
     request_count = NumericProperty(0)
     max_requests = NumericProperty(7500)
@@ -1335,30 +4145,75 @@ class ProfessionalFootballApp(MDApp):
             'x-rapidapi-key': self.api_key,
             'x-rapidapi-host': 'v3.football.api-sports.io'
         }
+        self.transport = ApiTransport.from_environment(self.headers)
         self._is_loading = False
         self.leagues = []
         self.leagues_loaded = False
-        self._update_event = None
+        self.live_updater = LiveUpdater(
+            self,
+            fast_interval=self.live_fast_interval,
+            normal_interval=self.live_normal_interval,
+            idle_interval=self.update_interval
+        )
 
         self.storage = SQLiteStorage()
 
+        self.dimensions = DimensionTables(self.storage)
+
+        self.instrumentation = ApiInstrumentation(
+            storage=self.storage,
+            persist=self.storage.load_filter_state('instrumentation_persist')
+        )
+        Match.dimensions = self.dimensions
+
+        self.rank_policy = RankPairPolicy(self.storage)
+        MatchFeatures.rank_policy = self.rank_policy
+
+        self.standings_warehouse = StandingsWarehouse(self, self.storage)
+        self.last_season_resolver = LastSeasonResolver(self, self.storage, self.standings_warehouse)
+
+        self.league_index = LeagueSearchIndex()
+        self.league_catalog_seasons = {}
+        self.league_catalog_max_age = 24 * 3600
+        self._catalog_refreshing = False
+
         self.filtered_matches = []
         self.filter_results = {}
         self._is_filtering = False
-        self.filter_condition = self.default_filter_condition
+        # تغييرات مباشرة وصلت أثناء فلترة كاملة، تطبق بعد انتهائها
+        self._pending_filter_deltas = []
+        self.live_updater.listeners.append(self.on_live_deltas)
+        self.rule_engine = RuleEngine(self)
+        self.filter_rule = NO_FILTER_RULE
         self._auto_filter_event = None
         self.filter_interval = 600
         self.current_filter = "No Filter"
 
         self.current_calendar_date = datetime.now().date()
         self.calendar_mode = False
+
+        # عدد الدوريات في كل طلب live=id-id-...
+        self.live_league_chunk_size = 20
         
 
         self.team_stats_cache = {}
         self.team_standings_cache = {}
         self.cache_timeout = 300
+        self.data_versions = DataVersions(self.storage)
+        self.fixtures_warehouse = FixturesWarehouse(self, self.storage, self.data_versions)
+        self.verdict_cache = VerdictCache(self.storage, self.data_versions, settle=self.cache_timeout)
+        self.batch_evaluator = BatchEvaluator(self.rule_engine, max_age=self.cache_timeout, verdict_cache=self.verdict_cache)
         
         self.perfect2_2_cache = {}
+        self._perfect2_2_cache_loaded = threading.Event()
+        self._perfect2_2_save_pending = False
+        self._perfect2_2_lock = threading.Lock()
+
+        # مدة كل مرحلة من مراحل بدء التشغيل بالميلي ثانية
+        self.startup_timings = {}
+
+        self.match_item_pool = MatchItemPool()
+        self.widget_renderer = BatchedWidgetRenderer()
     
     def build(self):
         self.theme_cls.primary_palette = 'Blue'
@@ -1369,6 +4224,11 @@ class ProfessionalFootballApp(MDApp):
         self.update_time()
         Clock.schedule_interval(self.update_time, 60)
         
+        # الأسماء تقرأ من جداول الأبعاد، لذا تحمل قبل المباريات المحفوظة
+        self.dimensions.load()
+        self.rank_policy.load()
+        self.data_versions.load()
+
         self.load_favorites()
         self.load_hidden_matches()
         self.load_league_selection()
@@ -1376,18 +4236,22 @@ class ProfessionalFootballApp(MDApp):
 
         self.load_filter_state()
         
-        # تحميل كاش Perfect2_2
-        self.perfect2_2_cache = self.storage.load_perfect2_2_cache()
-        
-        Clock.schedule_once(lambda dt: self.load_leagues_and_matches(), 0.5)
+        Clock.schedule_once(lambda dt: self.load_leagues_and_matches(), 0)
         
         Clock.schedule_once(lambda dt: self.schedule_auto_filter(), 10)
+
+        # مزامنة مباريات الدوريات المتابعة حتى يحسب أداء الفرق محلياً
+        # (الأولى قبل أول فلترة تلقائية، وما ترفعه من إصدارات يعيد الفلترة)
+        Clock.schedule_once(lambda dt: self.sync_fixtures_warehouse_async(), 2)
+        Clock.schedule_interval(lambda dt: self.sync_fixtures_warehouse_async(), self.fixtures_warehouse.sync_interval)
+
+        # تجهيز بطاقات المباريات مسبقاً بعد أول عرض
+        Clock.schedule_once(self.match_item_pool.prewarm, 2)
         
         return Builder.load_string(KV)
     
     def on_stop(self):
-        if self._update_event:
-            self._update_event.cancel()
+        self.live_updater.stop()
             
         if self._auto_filter_event:
             self._auto_filter_event.cancel()
@@ -1397,13 +4261,58 @@ class ProfessionalFootballApp(MDApp):
         self.save_favorite_leagues()
         self.save_league_selection()        
         self.save_filter_state()        
-        self.save_perfect2_2_cache()
+        self.save_perfect2_2_cache(final=True)
+        self.verdict_cache.flush()
+        self.dimensions.flush()
+        self.instrumentation.flush()
         
         super().on_stop()
+
+    def on_pause(self):
+        # لا حاجة للاستطلاع والتطبيق في الخلفية
+        self.live_updater.pause()
+        return True
+
+    def on_resume(self):
+        self.live_updater.resume()
     
-    def save_perfect2_2_cache(self):
+    def clear_main_list(self):
+        """تفريغ القائمة الرئيسية مع إرجاع بطاقات المباريات إلى المجمع"""
+        container = self.root.ids.main_list
+        self.widget_renderer.cancel()
+        self.match_item_pool.reclaim(container)
+        return container
+
+    def render_match_items(self, container, matches, progress_label=None, with_favorites=False, on_done=None):
+        """عرض بطاقات المباريات على دفعات عبر الإطارات مع تحديث نسبة التقدم"""
+        final_text = progress_label.text if progress_label else ''
+
+        def make_item(match):
+            is_fav = self.is_favorite(match.get('id')) if with_favorites else False
+            return self.match_item_pool.acquire(match, is_fav)
+
+        def on_progress(done, total):
+            if progress_label:
+                progress_label.text = final_text if done >= total else f"{final_text} ({done}/{total})"
+
+        self.widget_renderer.render(container, matches, make_item, on_progress, on_done)
+
+    def save_perfect2_2_cache(self, final=False):
         """حفظ كاش Perfect2_2"""
-        self.storage.save_perfect2_2_cache(self.perfect2_2_cache)
+        # الحفظ قبل اكتمال التحميل المؤجل يمسح المحفوظ: يؤجل حتى ينتهي التحميل،
+        # أو يدمج مع المحفوظ عند الإغلاق
+        with self._perfect2_2_lock:
+            if not self._perfect2_2_cache_loaded.is_set():
+                if not final:
+                    self._perfect2_2_save_pending = True
+                    log.info("⏳ Perfect2_2 cache save deferred until the stored cache is loaded")
+                    return
+                cache = self.storage.load_perfect2_2_cache()
+                cache.update(self.perfect2_2_cache)
+                log.info("📦 Perfect2_2 cache merged with storage before load finished: %s entries", len(cache))
+            else:
+                cache = self.perfect2_2_cache
+        self.storage.save_perfect2_2_cache(cache)
 
     def filter_out_hidden_matches_immediately(self, matches_list):
         if not matches_list:
@@ -1424,7 +4333,7 @@ class ProfessionalFootballApp(MDApp):
             filtered.append(match)
         
         if hidden_count > 0:
-            print(f"🚫 فلترة فورية: تم إزالة {hidden_count} مباراة مخفية")
+            log.debug("🚫 فلترة فورية: تم إزالة %s مباراة مخفية", hidden_count)
         
         return filtered
     
@@ -1450,98 +4359,35 @@ class ProfessionalFootballApp(MDApp):
             filtered.append(match)
         
         if hidden_count > 0 or favorite_count > 0:
-            print(f"🚫 فلترة شاملة: تم إزالة {hidden_count} مخفية و {favorite_count} مفضلة")
+            log.debug("🚫 فلترة شاملة: تم إزالة %s مخفية و %s مفضلة", hidden_count, favorite_count)
         
         return filtered
 
     def load_filter_state(self):
         self.filter_ns_perfect_1_1_enabled = self.storage.load_filter_state('filter_ns_perfect_1_1_enabled')
         self.filter_perfect2_2_enabled = self.storage.load_filter_state('filter_perfect2_2_enabled')
+        self.auto_update = self.storage.load_filter_state('auto_update')
             
     def save_filter_state(self):
         self.storage.save_filter_state('filter_ns_perfect_1_1_enabled', self.filter_ns_perfect_1_1_enabled)
         self.storage.save_filter_state('filter_perfect2_2_enabled', self.filter_perfect2_2_enabled)
+        self.storage.save_filter_state('auto_update', self.auto_update)
 
     def filter_ns_perfect_1_1(self, match_data):
-        try:
-            # 1. استخراج البيانات الأساسية بأسماء واضحة
-            home_id = match_data.get('home_team_id')
-            away_id = match_data.get('away_team_id')
-            league_id = match_data.get('league_id')
-            season = match_data.get('season', datetime.now().year)
-            
-            if match_data.get('status', 'NS') not in ['NS', 'TBD']:
-                return "❌ no (Match already started)"
-            if not all([home_id, away_id, league_id]):
-                return "❌ no (Missing team/league data)"
-
-            # 2. جلب الأهداف
-            home_goals, home_count = self.fetch_team_last_goals_for_filter(home_id, league_id, season, True, 3)
-            away_goals, away_count = self.fetch_team_last_goals_for_filter(away_id, league_id, season, False, 3)
-
-            if home_count < 3 or away_count < 3:
-                return f"❌ no (Not enough matches: H:{home_count}, A:{away_count})"
-
-            # 3. حالة التعادل
-            if home_goals == away_goals:
-                return f"✅ yes (Equal goals: {home_goals}-{away_goals})"
-
-            # 4. تحديد الفائز والخاسر (المنطق الموحد)
-            if home_goals > away_goals:
-                winner_id, loser_id = home_id, away_id
-                winner_label, loser_label = "Home", "Away"
-                winner_goals, loser_goals = home_goals, away_goals
-            else:
-                winner_id, loser_id = away_id, home_id
-                winner_label, loser_label = "Away", "Home"
-                winner_goals, loser_goals = away_goals, home_goals
-
-            # 5. جلب الترتيب باستخدام المعرفات الصحيحة
-            winner_stand = self.fetch_team_standings_for_filter(winner_id, league_id, season)
-            loser_stand = self.fetch_team_standings_for_filter(loser_id, league_id, season)
-            
-            try:
-                w_rank = int(str(winner_stand.get('current_rank')).strip())
-                l_rank = int(str(loser_stand.get('current_rank')).strip())
-            except (ValueError, TypeError):
-                return "❌ no (Rank Processing Error)"
-
-            # 6. قائمة المحظورات (تكتب مرة واحدة فقط)
-            forbidden_pairs = {
-                (1, 2), (1, 3), (1, 4), (1, 5), (1, 6), (1, 7), (1, 8), (1, 10), (1, 11), (1, 12),
-                (2, 3), (2, 4), (2, 5), (2, 6), (2, 7), (2, 8), (2, 9), (2, 10), (2, 11), (2, 12), (2, 13), (2, 14),
-                (3, 2), (3, 4), (3, 5), (3, 6), (3, 7), (3, 8), (3, 9), (3, 10), (3, 11), (3, 12), (3, 13), (3, 14), (3, 15),
-                (4, 2), (4, 3), (4, 5), (4, 6), (4, 7), (4, 8), (4, 9), (4, 10), (4, 11), (4, 12), (4, 13), (4, 14), (4, 15), (4, 16),
-                (5, 2), (5, 3), (5, 4), (5, 6), (5, 7), (5, 8), (5, 9), (5, 10), (5, 11), (5, 12), (5, 13), (5, 14), (5, 15), (5, 16),
-                (6, 2), (6, 3), (6, 4), (6, 5), (6, 7), (6, 8), (6, 9), (6, 10), (6, 11), (6, 12), (6, 13), (6, 14), (6, 15), (6, 16),
-                (7, 2), (7, 3), (7, 4), (7, 5), (7, 6), (7, 8), (7, 9), (7, 10), (7, 11), (7, 12), (7, 13), (7, 14), (7, 15), (7, 16),
-                (8, 2), (8, 3), (8, 4), (8, 5), (8, 6), (8, 7), (8, 9), (8, 10), (8, 11), (8, 12), (8, 13), (8, 14), (8, 15), (8, 16),
-                (9, 2), (9, 3), (9, 4), (9, 5), (9, 6), (9, 7), (9, 8), (9, 10), (9, 11), (9, 12), (9, 13), (9, 14), (9, 15), (9, 16),
-                (10, 4), (10, 5), (10, 6), (10, 7), (10, 8), (10, 9), (10, 11), (10, 12), (10, 13), (10, 14), (10, 15), (10, 16), (10, 17), (10, 18),
-                (11, 4), (11, 6), (11, 7), (11, 8), (11, 9), (11, 10), (11, 12), (11, 13), (11, 14), (11, 15), (11, 16), (11, 17), (11, 18),
-                (12, 6), (12, 7), (12, 8), (12, 9), (12, 10), (12, 11), (12, 13), (12, 14), (12, 15), (12, 16), (12, 17), (12, 18),
-                (13, 7), (13, 8), (13, 10), (13, 11), (13, 12), (13, 14), (13, 15), (13, 16), (13, 17), (13, 18),
-                (14, 8), (14, 9), (14, 10), (14, 11), (14, 12), (14, 13), (14, 15), (14, 16), (14, 17), (14, 18),
-                (15, 8), (15, 9), (15, 10), (15, 11), (15, 12), (15, 13), (15, 14),
-                (16, 8), (16, 9), (16, 10), (16, 11), (16, 12), (16, 13), (16, 14), (16, 15),
-                (17, 15)
-            }
-
-            if (w_rank, l_rank) in forbidden_pairs:
-                return f"❌ no (Forbidden: +{w_rank} vs -{l_rank})"
-
-            return f"✅ yes (+:{winner_label} {winner_goals} | -:{loser_label} {loser_goals} | [{w_rank}] vs [{l_rank}])"
-
-        except Exception as e:
-            return f"❌ no (System Error: {e})"
+        return self.batch_evaluator.evaluate(NS_PERFECT_1_1_RULE, [match_data])[0]
 
     def fetch_team_last_goals_for_filter(self, team_id, league_id, season, is_home_team, matches_count=3):
+        form = self.fixtures_warehouse.team_form(team_id, league_id, season, is_home_team, matches_count)
+        if form is not None:
+            return sum(row[0 if is_home_team else 1] for row in form), len(form)
+
         cache_key = f"goals_{team_id}_{league_id}_{season}_{'home' if is_home_team else 'away'}_last_{matches_count}"
         
         if cache_key in self.team_stats_cache:
             cached_data = self.team_stats_cache[cache_key]
             cached_time = cached_data.get('time', 0)
             if time.time() - cached_time < self.cache_timeout:
+                self.instrumentation.record_cache_hit('fixtures', {'team': team_id, 'league': league_id, 'season': season})
                 return cached_data['result']
         
         try:
@@ -1553,7 +4399,7 @@ class ProfessionalFootballApp(MDApp):
                 'last': 15  
             }
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
+            response = self.api_get(url, params, timeout=15, cache='miss')
             
             if response.status_code == 200:
                 data = response.json()
@@ -1600,19 +4446,26 @@ class ProfessionalFootballApp(MDApp):
             return result
             
         except Exception as e:
-            print(f"Error in fetch_team_last_goals_for_filter for team {team_id}: {e}")
+            log.warning("Error in fetch_team_last_goals_for_filter for team %s: %s", team_id, e)
             result = (0, 0)
             self.team_stats_cache[cache_key] = {'result': result, 'time': time.time()}
             return result
 
     def fetch_team_last_goals_for_and_against(self, team_id, league_id, season, is_home_team, matches_count=3):
         """جلب الأهداف المسجلة والمستقبلة في آخر 3 مباريات"""
+        form = self.fixtures_warehouse.team_form(team_id, league_id, season, is_home_team, matches_count)
+        if form is not None:
+            goals_for = sum(row[0 if is_home_team else 1] for row in form)
+            goals_against = sum(row[1 if is_home_team else 0] for row in form)
+            return goals_for, goals_against, len(form)
+
         cache_key = f"goals_for_against_{team_id}_{league_id}_{season}_{'home' if is_home_team else 'away'}_last_{matches_count}"
         
         if cache_key in self.team_stats_cache:
             cached_data = self.team_stats_cache[cache_key]
             cached_time = cached_data.get('time', 0)
             if time.time() - cached_time < self.cache_timeout:
+                self.instrumentation.record_cache_hit('fixtures', {'team': team_id, 'league': league_id, 'season': season})
                 return cached_data['result']
         
         try:
@@ -1624,7 +4477,7 @@ class ProfessionalFootballApp(MDApp):
                 'last': 15
             }
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
+            response = self.api_get(url, params, timeout=15, cache='miss')
             
             if response.status_code == 200:
                 data = response.json()
@@ -1675,7 +4528,7 @@ class ProfessionalFootballApp(MDApp):
             return result
             
         except Exception as e:
-            print(f"Error in fetch_team_last_goals_for_and_against for team {team_id}: {e}")
+            log.warning("Error in fetch_team_last_goals_for_and_against for team %s: %s", team_id, e)
             result = (0, 0, 0)
             self.team_stats_cache[cache_key] = {'result': result, 'time': time.time()}
             return result
@@ -1687,6 +4540,7 @@ class ProfessionalFootballApp(MDApp):
             cached_data = self.team_standings_cache[cache_key]
             cached_time = cached_data.get('time', 0)
             if time.time() - cached_time < self.cache_timeout:
+                self.instrumentation.record_cache_hit('standings', {'league': league_id, 'season': season})
                 return cached_data['result']
         
         try:
@@ -1696,7 +4550,7 @@ class ProfessionalFootballApp(MDApp):
                 'season': season
             }
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
+            response = self.api_get(url, params, timeout=15, cache='miss')
             
             if response.status_code == 200:
                 data = response.json()
@@ -1705,16 +4559,29 @@ class ProfessionalFootballApp(MDApp):
                 if standings:
                     league_standings = standings[0].get('league', {}).get('standings', [])
 
+                    # جدول واحد يكفي لكل فرق الدوري: تخزين ترتيب الجميع بدل طلب لكل فريق
+                    fetched_at = time.time()
+                    found = None
+                    seen = set()
                     for standing_group in league_standings:
                         for team_standing in standing_group:
-                            if team_standing.get('team', {}).get('id') == team_id:
-                                result = {
-                                    'current_rank': team_standing.get('rank'),
-                                    'points': team_standing.get('points'),
-                                    'form': team_standing.get('form')
-                                }
-                                self.team_standings_cache[cache_key] = {'result': result, 'time': time.time()}
-                                return result
+                            standing_team_id = team_standing.get('team', {}).get('id')
+                            if standing_team_id in seen:
+                                continue
+                            seen.add(standing_team_id)
+                            result = {
+                                'current_rank': team_standing.get('rank'),
+                                'points': team_standing.get('points'),
+                                'form': team_standing.get('form')
+                            }
+                            self.team_standings_cache[f"standings_filter_{league_id}_{season}_{standing_team_id}"] = {
+                                'result': result, 'time': fetched_at
+                            }
+                            if standing_team_id == team_id:
+                                found = result
+
+                    if found is not None:
+                        return found
                 
 
             result = {'current_rank': 'N/A', 'points': 0, 'form': ''}
@@ -1722,7 +4589,7 @@ class ProfessionalFootballApp(MDApp):
             return result
             
         except Exception as e:
-            print(f"Error in fetch_team_standings_for_filter: {e}")
+            log.warning("Error in fetch_team_standings_for_filter: %s", e)
             result = {'current_rank': 'N/A', 'points': 0, 'form': ''}
             self.team_standings_cache[cache_key] = {'result': result, 'time': time.time()}
             return result
@@ -1730,97 +4597,40 @@ class ProfessionalFootballApp(MDApp):
     # ========== فلترة Perfect2_2 ==========
     
     def filter_perfect2_2(self, match_data):
-        try:
-            # 1. استخراج البيانات الأساسية للمباراة فقط
-            match_id = match_data.get('id')
-            home_team_id = match_data.get('home_team_id')
-            away_team_id = match_data.get('away_team_id')
-            league_id = match_data.get('league_id')
-            season = match_data.get('season', datetime.now().year)
-            
-            print(f"🎯 Perfect2_2: Processing match {match_id}")
-            
-            # 2. التحقق من وجود البيانات الأساسية
-            if not all([match_id, home_team_id, away_team_id, league_id]):
-                return "❌ no (Missing basic match data)"
-            
-            # 3. جلب الأهداف المسجلة والمستقبلة في آخر 3 مباريات
-            home_goals_for, home_goals_against, home_count = self.fetch_team_last_goals_for_and_against(
-                home_team_id, league_id, season, is_home_team=True, matches_count=3
-            )
-            away_goals_for, away_goals_against, away_count = self.fetch_team_last_goals_for_and_against(
-                away_team_id, league_id, season, is_home_team=False, matches_count=3
-            )
-            
-            # 4. جلب الترتيب الحالي
-            home_rank_current = self.fetch_team_standings_for_filter(home_team_id, league_id, season)
-            away_rank_current = self.fetch_team_standings_for_filter(away_team_id, league_id, season)
-            
-            # 5. جلب ترتيب الموسم الماضي
-            home_rank_last = self._fetch_last_season_rank(home_team_id, season, league_id)
-            away_rank_last = self._fetch_last_season_rank(away_team_id, season, league_id)
-            
-            print(f"📊 Perfect2_2 Data - Home: {home_goals_for} goals scored, {home_goals_against} goals conceded, Rank: {home_rank_current.get('current_rank', 'N/A')}({home_rank_last})")
-            print(f"📊 Perfect2_2 Data - Away: {away_goals_for} goals scored, {away_goals_against} goals conceded, Rank: {away_rank_current.get('current_rank', 'N/A')}({away_rank_last})")
-            
-            # 6. تخزين البيانات في الكاش مع إضافة الأهداف المستقبلة
-            cache_data = {
-                'home_team_id': home_team_id,
-                'away_team_id': away_team_id,
-                'league_id': league_id,
-                'home_goals_last3': home_goals_for,          # الأهداف المسجلة
-                'home_goals_against_last3': home_goals_against,  # الأهداف المستقبلة
-                'away_goals_last3': away_goals_for,          # الأهداف المسجلة
-                'away_goals_against_last3': away_goals_against,  # الأهداف المستقبلة
-                'home_rank_current': home_rank_current.get('current_rank', 'N/A') if home_rank_current else 'N/A',
-                'home_rank_last': home_rank_last,
-                'away_rank_current': away_rank_current.get('current_rank', 'N/A') if away_rank_current else 'N/A',
-                'away_rank_last': away_rank_last,
-                'stored_time': datetime.now().isoformat(),
-                'expires_at': (datetime.now() + timedelta(days=1)).isoformat()
-            }
-            
-            # 7. إضافة إلى الكاش
-            self.add_to_perfect2_2_cache(match_id, cache_data)
-            
-            # 8. إرجاع "yes" - بكل بساطة
-            return f"✅ yes (Goals: H:{home_goals_for}({home_goals_against}) A:{away_goals_for}({away_goals_against}), Ranks: H:{cache_data['home_rank_current']}({home_rank_last}) A:{cache_data['away_rank_current']}({away_rank_last}))"
-            
-        except Exception as e:
-            print(f"❌ Error in filter_perfect2_2: {e}")
-            return f"❌ no (System error: {e})"
+        features = self.rule_engine.features(match_data)
+        log.debug("🎯 Perfect2_2: Processing match %s", features.id)
+
+        verdict = self.rule_engine.evaluate(PERFECT2_2_RULE, features)
+        if not verdict.passed:
+            return verdict
+
+        log.debug("📊 Perfect2_2 Data - Home: %s goals scored, %s goals conceded, Rank: %s(%s)", features.home_goals_for3, features.home_goals_against3, features.home_rank, features.home_rank_last)
+        log.debug("📊 Perfect2_2 Data - Away: %s goals scored, %s goals conceded, Rank: %s(%s)", features.away_goals_for3, features.away_goals_against3, features.away_rank, features.away_rank_last)
+
+        # تخزين البيانات في الكاش مع إضافة الأهداف المستقبلة
+        self.add_to_perfect2_2_cache(features.id, {
+            'home_team_id': features.home_team_id,
+            'away_team_id': features.away_team_id,
+            'league_id': features.league_id,
+            'home_goals_last3': features.home_goals_for3,            # الأهداف المسجلة
+            'home_goals_against_last3': features.home_goals_against3,  # الأهداف المستقبلة
+            'away_goals_last3': features.away_goals_for3,            # الأهداف المسجلة
+            'away_goals_against_last3': features.away_goals_against3,  # الأهداف المستقبلة
+            'home_rank_current': features.home_rank or 'N/A',
+            'home_rank_last': features.home_rank_last,
+            'away_rank_current': features.away_rank or 'N/A',
+            'away_rank_last': features.away_rank_last,
+        })
+
+        return verdict
     
     def _fetch_last_season_rank(self, team_id, current_season, league_id=None):
-        """جلب ترتيب الفريق في الموسم الماضي"""
+        """جلب ترتيب الفريق في الموسم الماضي (نفس الدوري أولاً ثم كل دوريات الفريق)"""
         try:
-            last_season = current_season - 1
-            
-            if league_id:
-                # محاولة جلب ترتيب الموسم الماضي لنفس الدوري
-                standings = self._fetch_season_standings(team_id, league_id, last_season)
-                if standings and standings.get('current_rank') != 'N/A':
-                    return standings.get('current_rank')
-            
-            # إذا لم يتم العثور، البحث في جميع الدوريات
-            url = f"{self.base_url}/leagues"
-            params = {'team': team_id, 'season': last_season}
-            
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('response'):
-                    for league_data in data['response']:
-                        league_info = league_data.get('league', {})
-                        found_league_id = league_info.get('id')
-                        
-                        standings = self._fetch_season_standings(team_id, found_league_id, last_season)
-                        if standings and standings.get('current_rank') != 'N/A':
-                            return standings.get('current_rank')
-            
-            return "N/A"
+            standings = self.last_season_resolver.resolve(team_id, current_season - 1, league_id)
+            return standings.get('current_rank') if standings else "N/A"
         except Exception as e:
-            print(f"❌ Error fetching last season rank: {e}")
+            log.warning("❌ Error fetching last season rank: %s", e)
             return "N/A"
     
     def _fetch_season_standings(self, team_id, league_id, season):
@@ -1829,7 +4639,7 @@ class ProfessionalFootballApp(MDApp):
             url = f"{self.base_url}/standings"
             params = {'league': league_id, 'season': season, 'team': team_id}
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = self.api_get(url, params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -1863,11 +4673,12 @@ class ProfessionalFootballApp(MDApp):
             return None
             
         except Exception as e:
-            print(f"Error fetching season standings: {e}")
+            log.warning("Error fetching season standings: %s", e)
             return None
     
     def get_from_perfect2_2_cache(self, match_id):
         """الحصول على بيانات من الكاش"""
+        # قبل اكتمال التحميل المؤجل يحتوي الكاش فقط ما أضيف في هذا التشغيل
         if match_id in self.perfect2_2_cache:
             cache_data = self.perfect2_2_cache[match_id]
             
@@ -1896,7 +4707,7 @@ class ProfessionalFootballApp(MDApp):
             'stored_time': datetime.now().isoformat()
         }
         
-        print(f"✅ تمت إضافة المباراة {match_id} إلى كاش Perfect2_2")
+        log.debug("✅ تمت إضافة المباراة %s إلى كاش Perfect2_2", match_id)
         
         # حفظ الكاش فوراً
         self.save_perfect2_2_cache()
@@ -1922,8 +4733,7 @@ class ProfessionalFootballApp(MDApp):
     
     def show_perfect2_2_cached_matches(self):
         """عرض المباريات المخزنة في الكاش"""
-        container = self.root.ids.main_list
-        container.clear_widgets()
+        container = self.clear_main_list()
         
         if not self.perfect2_2_cache:
             self.show_empty_message("No matches cached in Perfect2_2")
@@ -2051,66 +4861,112 @@ class ProfessionalFootballApp(MDApp):
         else:
             self.current_title = f"Matches for {selected_date.strftime('%d/%m/%Y')}"
         
-        print(f"🗓️ تم اختيار التاريخ: {selected_date}")
+        log.info("🗓️ تم اختيار التاريخ: %s", selected_date)
         self.show_calendar_matches(selected_date)
 
     def show_calendar_matches(self, target_date):
         self.show_loading(f"Loading scheduled matches for {target_date.strftime('%d/%m/%Y')}...")
         
+        def show_first_batch(first_matches):
+            # عرض أولي قبل اكتمال التحليل (فقط عندما لا تحتاج الفلاتر إلى طلبات شبكة)
+            if self.filter_ns_perfect_1_1_enabled or self.filter_perfect2_2_enabled:
+                return
+            preview = self.process_matches_improved(first_matches)
+            Clock.schedule_once(lambda dt: self.display_calendar_matches_improved(preview, target_date), 0)
+
         def fetch_and_display():
             try:
-                matches = self.fetch_matches_by_date_improved(target_date)
+                matches = self.fetch_matches_by_date_improved(target_date, on_first_batch=show_first_batch)
                 processed_matches = self.process_matches_improved(matches)
                 
                 Clock.schedule_once(lambda dt: self.display_calendar_matches_improved(processed_matches, target_date), 0)
             except Exception as e:
-                print(f"❌ خطأ في جلب المباريات: {e}")
+                log.error("❌ خطأ في جلب المباريات: %s", e)
                 Clock.schedule_once(lambda dt: self.display_calendar_matches_improved([], target_date), 0)
                 
-        threading.Thread(target=fetch_and_display, daemon=True).start()
+        threading.Thread(target=self.instrumentation.with_source('show_calendar_matches', fetch_and_display), daemon=True).start()
 
-    def fetch_matches_by_date_improved(self, target_date):
+    def fetch_matches_by_date_improved(self, target_date, on_first_batch=None, first_batch_size=40):
+        """
+        جلب مباريات تاريخ معين مع تحليل الاستجابة تدريجياً:
+        كل مباراة تعالج فور وصولها، وon_first_batch يستدعى بأول دفعة قبل اكتمال التحميل
+        """
+        response = None
         try:
             url = f"{self.base_url}/fixtures"
             date_str = target_date.strftime('%Y-%m-%d')
             params = {'date': date_str}
             
-            print(f"🔍 جاري البحث عن المباريات للتاريخ: {date_str}")
+            log.info("🔍 جاري البحث عن المباريات للتاريخ: %s", date_str)
             
-            response = self.fetch_with_retry(url, params, max_retries=2)
+            response = self.fetch_with_retry(url, params, max_retries=2, stream=True)
             
-            if response and response.status_code == 200:
-                data = response.json()
-                print(f"📊 الاستجابة من API: {len(data.get('response', []))} مباراة")
-                
-                if data.get('response'):
-                    matches = self.process_api_response_improved(data['response'])
-
-                    matches = self.filter_out_hidden_matches_immediately(matches)
-                    
-                    print(f"✅ تم العثور على {len(matches)} مباراة (بعد إزالة المخفية)")
-                    return matches
-                else:
-                    print("❌ لا توجد بيانات في الاستجابة")
-                    return []
-            else:
-                print(f"❌ خطأ في API: {response.status_code if response else 'No response'}")
+            if not response or response.status_code != 200:
+                log.error("❌ خطأ في API: %s", response.status_code if response else 'No response')
                 return []
+
+            hidden_ids = {m.get('id') for m in self.hidden_matches}
+            matches = []
+            hidden_count = 0
+
+            stream = JsonArrayStream(response.iter_content(chunk_size=32 * 1024))
+            for fixture in stream:
+                match = self.process_api_fixture(fixture)
+                if match is None:
+                    continue
+                if match.get('id') in hidden_ids:
+                    hidden_count += 1
+                    continue
+
+                matches.append(match)
+                if on_first_batch and len(matches) == first_batch_size:
+                    on_first_batch(list(matches))
+
+            self.dimensions.flush()
+
+            log.info("📊 الاستجابة من API: %s مباراة، تم إزالة %s مخفية", stream.items_parsed, hidden_count)
+            log.info("✅ تم العثور على %s مباراة (بعد إزالة المخفية)", len(matches))
+            return matches
                 
         except Exception as e:
-            print(f"❌ خطأ غير متوقع: {e}")
+            log.error("❌ خطأ غير متوقع: %s", e)
             return []
+        finally:
+            if response is not None:
+                response.close()
+
+    def api_get(self, url, params=None, timeout=15, stream=False, cache='none'):
+        """
+        كل طلبات api-sports تمر من هنا (تسجيل/إعادة تشغيل عبر self.transport)
+        ويسجل كل طلب في self.instrumentation؛ cache='miss' للدوال التي لها كاش
+        """
+        started = time.perf_counter()
+        status = None
+        size = 0
+        try:
+            response = self.transport.get(url, params, timeout=timeout, stream=stream)
+            status = response.status_code
+            if stream:
+                # في الطلبات المتدفقة: الزمن حتى وصول الترويسات والحجم المعلن فقط
+                size = int(response.headers.get('Content-Length') or 0)
+            else:
+                size = len(response.content)
+            return response
+        finally:
+            self.instrumentation.record(url, params, status, (time.perf_counter() - started) * 1000, size, cache)
 
-    def fetch_with_retry(self, url, params, max_retries=2):
+    def fetch_with_retry(self, url, params, max_retries=2, stream=False):
+        import requests
         for attempt in range(max_retries):
             try:
-                response = requests.get(url, headers=self.headers, params=params, timeout=15)
+                response = self.api_get(url, params, timeout=15, stream=stream)
                 if response.status_code == 200:
                     return response
                 else:
-                    print(f"⚠️ محاولة {attempt + 1} فشلت: {response.status_code}")
+                    log.warning("⚠️ محاولة %s فشلت: %s", attempt + 1, response.status_code)
+                    response.close()
             except requests.exceptions.RequestException as e:
-                print(f"⚠️ محاولة {attempt + 1} فشلت: {e}")
+                log.warning("⚠️ محاولة %s فشلت: %s", attempt + 1, e)
             
             if attempt < max_retries - 1:
                 time.sleep(1)
@@ -2121,78 +4977,28 @@ class ProfessionalFootballApp(MDApp):
         processed_matches = []
         
         for match in api_matches:
-            try:
-                fixture = match.get('fixture', {})
-                teams = match.get('teams', {})
-                goals = match.get('goals', {})
-                league = match.get('league', {})
-                
-                home_team = teams.get('home', {})
-                away_team = teams.get('away', {})
-                
-                home_team_name = home_team.get('name', 'Home Team')
-                away_team_name = away_team.get('name', 'Away Team')
-                
-                full_home_team_name = home_team.get('name', 'Home Team')
-                full_away_team_name = away_team.get('name', 'Away Team')
-                
-                home_score = goals.get('home')
-                away_score = goals.get('away')
-                
-                status = fixture.get('status', {}).get('short', 'NS')
-                elapsed = fixture.get('status', {}).get('elapsed')
-                
-                processed_match = {
-                    'id': fixture.get('id'),
-                    'league': league.get('name', 'Unknown League'),
-                    'league_id': league.get('id'),
-                    'season': league.get('seasons', [{}])[0].get('year', datetime.now().year) if league.get('seasons') else datetime.now().year,
-                    'home_team': home_team_name,
-                    'full_home_team': full_home_team_name,
-                    'home_team_id': home_team.get('id'),
-                    'away_team': away_team_name,
-                    'full_away_team': full_away_team_name,
-                    'away_team_id': away_team.get('id'),
-                    'home_score': home_score,
-                    'away_score': away_score,
-                    'status': status,
-                    'elapsed': elapsed,
-                    'time': fixture.get('date', ''),
-                    'events': match.get('events', []),
-                    'venue': fixture.get('venue', {}).get('name', ''),
-                    'referee': fixture.get('referee', 'Unknown')
-                }
-                
+            processed_match = self.process_api_fixture(match)
+            if processed_match is not None:
                 processed_matches.append(processed_match)
                 
-            except Exception as e:
-                print(f"Error processing match: {e}")
-                continue
-                
         return processed_matches
 
+    def process_api_fixture(self, match):
+        try:
+            return Match.from_fixture(match)
+        except Exception as e:
+            log.warning("Error processing match: %s", e)
+            return None
+
     def process_matches_improved(self, matches):
         processed = []
         for match in matches:
             try:
-                match.setdefault('home_score', None)
-                match.setdefault('away_score', None)
-                match.setdefault('elapsed', None)
-                match.setdefault('events', [])
-                
-                time_str = match.get('time', '')
-                if time_str:
-                    try:
-                        dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-                        match['formatted_time'] = dt.strftime('%H:%M')
-                    except:
-                        match['formatted_time'] = time_str[:16] if time_str else "TBD"
-                else:
-                    match['formatted_time'] = 'TBD'
-                
+                # حساب حقول العرض مرة واحدة لكل مباراة
+                match.display
                 processed.append(match)
             except Exception as e:
-                print(f"Error in match processing: {e}")
+                log.warning("Error in match processing: %s", e)
                 continue
         return processed
 
@@ -2214,14 +5020,44 @@ class ProfessionalFootballApp(MDApp):
             filtered_list.append(match)
         
         if hidden_count > 0:
-            print(f"🚫 تم إزالة {hidden_count} مباراة مخفية نهائيًا ولن تعود")
+            log.debug("🚫 تم إزالة %s مباراة مخفية نهائيًا ولن تعود", hidden_count)
         
         return filtered_list
 
+    def apply_calendar_filters(self, filtered_matches):
+        """تطبيق فلاتر التقويم المفعلة (NS Perfect 1_1 ثم Perfect2_2) دون أي عمل على الواجهة"""
+        # تطبيق الفلترات بالتسلسل
+        # أولاً: فلتر NS Perfect 1_1
+        if self.filter_ns_perfect_1_1_enabled:
+            log.debug("🎯 تطبيق فلتر NS Perfect 1_1 على %s مباراة", len(filtered_matches))
+            candidates = [match for match in filtered_matches if match.get('status') == 'NS']
+            verdicts = self.batch_evaluator.evaluate(NS_PERFECT_1_1_RULE, candidates)
+            self.verdict_cache.flush()
+            filtered_matches = [match for match, verdict in zip(candidates, verdicts) if verdict.passed]
+            log.debug("🎯 بعد تطبيق فلتر NS Perfect 1_1: %s مباراة", len(filtered_matches))
+        
+        # ثانياً: فلتر Perfect2_2 (للمباريات المنتهية فقط)
+        if self.filter_perfect2_2_enabled:
+            log.debug("🎯 تطبيق فلتر Perfect2_2 على %s مباراة", len(filtered_matches))
+            temp_filtered = []
+            for match in filtered_matches:
+                # Perfect2_2 تعمل فقط على المباريات المنتهية
+                if match.get('status') == 'FT':
+                    filter_result = self.apply_perfect2_2_to_calendar(match)
+                    if filter_result and filter_result.passed:
+                        temp_filtered.append(match)
+                        log.debug("✅ Perfect2_2: %s vs %s", match.get('home_team'), match.get('away_team'))
+                else:
+                    # المباريات غير المنتهية تمرر بدون فلترة Perfect2_2
+                    temp_filtered.append(match)
+            filtered_matches = temp_filtered
+            log.debug("🎯 بعد تطبيق فلتر Perfect2_2: %s مباراة", len(filtered_matches))
+
+        return filtered_matches
+
     @mainthread
     def display_calendar_matches_improved(self, matches, target_date):
-        container = self.root.ids.main_list
-        container.clear_widgets()
+        container = self.clear_main_list()
         
         today = datetime.now().date()
         
@@ -2249,45 +5085,15 @@ class ProfessionalFootballApp(MDApp):
                     match for match in matches
                     if match.get('league_id') in required_league_ids
                 ]
-                print(f"🔍 بعد التصفية حسب الدوري: {len(filtered_matches)} مباراة مجدولة")
+                log.debug("🔍 بعد التصفية حسب الدوري: %s مباراة مجدولة", len(filtered_matches))
             else:
                 filtered_matches = matches
 
-            # تطبيق الفلترات بالتسلسل
-            final_matches_filtered = []
-            
-            # أولاً: فلتر NS Perfect 1_1
-            if self.filter_ns_perfect_1_1_enabled:
-                print(f"🎯 تطبيق فلتر NS Perfect 1_1 على {len(filtered_matches)} مباراة")
-                temp_filtered = []
-                for match in filtered_matches:
-                    if match.get('status') == 'NS':  
-                        filter_result = self.filter_ns_perfect_1_1(match)
-                        if "✅ yes" in filter_result:  
-                            temp_filtered.append(match)
-                filtered_matches = temp_filtered
-                print(f"🎯 بعد تطبيق فلتر NS Perfect 1_1: {len(filtered_matches)} مباراة")
-            
-            # ثانياً: فلتر Perfect2_2 (للمباريات المنتهية فقط)
-            if self.filter_perfect2_2_enabled:
-                print(f"🎯 تطبيق فلتر Perfect2_2 على {len(filtered_matches)} مباراة")
-                temp_filtered = []
-                for match in filtered_matches:
-                    # Perfect2_2 تعمل فقط على المباريات المنتهية
-                    if match.get('status') == 'FT':
-                        filter_result = self.apply_perfect2_2_to_calendar(match)
-                        if filter_result and "✅ yes" in filter_result:
-                            temp_filtered.append(match)
-                            print(f"✅ Perfect2_2: {match.get('home_team')} vs {match.get('away_team')}")
-                    else:
-                        # المباريات غير المنتهية تمرر بدون فلترة Perfect2_2
-                        temp_filtered.append(match)
-                filtered_matches = temp_filtered
-                print(f"🎯 بعد تطبيق فلتر Perfect2_2: {len(filtered_matches)} مباراة")
-            
+            filtered_matches = self.apply_calendar_filters(filtered_matches)
+
             # إزالة المفضلة والمخفية
             final_matches = self.filter_out_hidden_and_favorite_matches(filtered_matches)
-            print(f"🚫 النتيجة النهائية: {len(final_matches)} مباراة مجدولة")
+            log.debug("🚫 النتيجة النهائية: %s مباراة مجدولة", len(final_matches))
             
             if final_matches:
                 # عرض معلومات الفلترات النشطة
@@ -2318,15 +5124,7 @@ class ProfessionalFootballApp(MDApp):
                 )
                 container.add_widget(count_label)
                 
-                for match in final_matches:
-                    item = OptimizedCompactMatchItem(match_data=match)
-                    
-                    # إضافة مؤشر إذا كانت المباراة من فلتر Perfect2_2
-                    if self.filter_perfect2_2_enabled and match.get('status') == 'FT':
-                        # يمكنك إضافة أيقونة أو لون مميز هنا
-                        pass
-                    
-                    container.add_widget(item)
+                self.render_match_items(container, final_matches, progress_label=count_label)
             else:
                 no_matches_text = "No scheduled matches found"
                 if required_league_ids:
@@ -2378,7 +5176,7 @@ class ProfessionalFootballApp(MDApp):
             Clock.schedule_once(lambda dt: self.close_stats_popup(popup), 30)
         
         except Exception as e:
-            print(f"❌ Error showing stats popup: {e}")
+            log.error("❌ Error showing stats popup: %s", e)
             self.show_snackbar("⚠️ خطأ في فتح الإحصائيات")
     
     def load_popup_from_cache(self, match_data, popup, cached_data):
@@ -2444,12 +5242,12 @@ class ProfessionalFootballApp(MDApp):
                 popup.second_team_goals_for, popup.second_team_goals_against
             )
             
-            print(f"✅ Loaded popup data from Perfect2_2 cache for match {match_data.get('id')}")
-            print(f"   Home: {home_goals_for} scored, {home_goals_against} conceded")
-            print(f"   Away: {away_goals_for} scored, {away_goals_against} conceded")
+            log.info("✅ Loaded popup data from Perfect2_2 cache for match %s", match_data.get('id'))
+            log.debug("   Home: %s scored, %s conceded", home_goals_for, home_goals_against)
+            log.debug("   Away: %s scored, %s conceded", away_goals_for, away_goals_against)
             
         except Exception as e:
-            print(f"❌ Error loading popup from cache: {e}")
+            log.error("❌ Error loading popup from cache: %s", e)
             # في حالة الخطأ، نعود للطريقة العادية
             self.load_popup_statistics_improved(match_data, popup)
     
@@ -2489,20 +5287,33 @@ class ProfessionalFootballApp(MDApp):
                         ), 0)
                         
                     except Exception as e:
-                        print(f"❌ خطأ في جلب الإحصائيات: {e}")
+                        log.error("❌ خطأ في جلب الإحصائيات: %s", e)
                         Clock.schedule_once(lambda dt: self.update_popup_stats(
                             popup, "green:0:0", "green:0:0",
                             popup.home_team_name, popup.away_team_name,
                             None, None
                         ), 0)
                         
-                threading.Thread(target=fetch_stats, daemon=True).start()
+                threading.Thread(
+                    target=self.instrumentation.with_source('load_popup_statistics_improved', fetch_stats),
+                    daemon=True
+                ).start()
                 
         except Exception as e:
-            print(f"❌ خطأ في تحميل الإحصائيات: {e}")
+            log.error("❌ خطأ في تحميل الإحصائيات: %s", e)
 
     def fetch_team_last_matches_improved(self, team_id, league_id, season, is_home_team):
         try:
+            form = self.fixtures_warehouse.team_form(team_id, league_id, season, is_home_team, 3)
+            if form is not None:
+                if not form:
+                    return "green:0:0"
+                filtered_matches = [
+                    {'home_goals': home_goals, 'away_goals': away_goals, 'is_home': is_home_team, 'date': date}
+                    for home_goals, away_goals, date in form
+                ]
+                return self.calculate_stats(filtered_matches, is_home=is_home_team)
+
             url = f"{self.base_url}/fixtures"
             params = {
                 'team': team_id,
@@ -2554,7 +5365,7 @@ class ProfessionalFootballApp(MDApp):
             return stats
             
         except Exception as e:
-            print(f"❌ Error in fetch_team_last_matches: {e}")
+            log.warning("❌ Error in fetch_team_last_matches: %s", e)
             return "green:0:0"
 
     def fetch_team_standings_improved(self, team_id, league_id, season):
@@ -2563,7 +5374,8 @@ class ProfessionalFootballApp(MDApp):
             last_season = season - 1
             
             current_standings = self._fetch_season_standings(team_id, league_id, current_season)
-            last_standings = self._fetch_season_standings(team_id, league_id, last_season)
+            # الموسم الماضي منتهٍ: من مستودع جداول الترتيب
+            last_standings = self.standings_warehouse.standings(team_id, league_id, last_season)
             
             if not last_standings:
                 last_standings = self._find_team_in_all_leagues_last_season(team_id, last_season)
@@ -2582,7 +5394,7 @@ class ProfessionalFootballApp(MDApp):
             return combined_standings
                 
         except Exception as e:
-            print(f"Error fetching team standings: {e}")
+            log.warning("Error fetching team standings: %s", e)
             return {
                 'current_rank': 'N/A',
                 'last_rank': 'N/A',
@@ -2597,30 +5409,30 @@ class ProfessionalFootballApp(MDApp):
 
     def add_hidden_match(self, match):
         if not self.is_hidden(match.get('id')):
-            self.hidden_matches.append(match.copy())
+            self.hidden_matches.append(match)
             self.save_hidden_matches()
-            print(f"✅ تم إضافة المباراة المخفية: {match.get('home_team')} vs {match.get('away_team')}")
+            log.info("✅ تم إضافة المباراة المخفية: %s vs %s", match.get('home_team'), match.get('away_team'))
 
     def remove_hidden_match(self, match_id):
         # إزالة المباراة من القائمة في الذاكرة
         self.hidden_matches = [m for m in self.hidden_matches if m.get('id') != match_id]
         # حفظ التغييرات في قاعدة البيانات
         self.save_hidden_matches()
-        print(f"🗑️ تم حذف المباراة المخفية {match_id} من قاعدة البيانات")
+        log.info("🗑️ تم حذف المباراة المخفية %s من قاعدة البيانات", match_id)
 
     def remove_match_from_all_lists(self, match_id):
         self.matches = [m for m in self.matches if m.get('id') != match_id]        
         self.today_matches = [m for m in self.today_matches if m.get('id') != match_id]         
         self.filtered_matches = [m for m in self.filtered_matches if m.get('id') != match_id]
         
-        print(f"🗑️ تمت إزالة المباراة {match_id} من جميع القوائم الداخلية")
+        log.info("🗑️ تمت إزالة المباراة %s من جميع القوائم الداخلية", match_id)
 
     def is_favorite(self, match_id):
         return any(f.get('id') == match_id for f in self.favorites)
 
     def add_favorite(self, match):
         if not self.is_favorite(match.get('id')):
-            self.favorites.append(match.copy())
+            self.favorites.append(match)
             self.save_favorites()
             if self.current_tab == 'live' and not self.calendar_mode:
                 self.show_live_matches()
@@ -2678,97 +5490,203 @@ class ProfessionalFootballApp(MDApp):
                             'season': league.get('seasons', [{}])[0].get('year') if league.get('seasons') else None
                         }
                         leagues.append(league_data)
-                    
+
+                        self.dimensions.add_league(
+                            league_data['id'], name=league_data['name'], country=league_data['country_name'],
+                            season=league_data['season'], type=league_data['type'], logo=league_data['logo'],
+                            country_code=league_data['country_code'], flag=league_data['flag']
+                        )
+
+                    self.dimensions.flush()
+                    self.storage.save_league_catalog(leagues)
+                    self.league_catalog_seasons = {l['id']: l['season'] for l in leagues}
+                    self.league_index.build(leagues)
                     return leagues
             return []
         except Exception as e:
-            print(f"Error fetching leagues: {e}")
+            log.error("Error fetching leagues: %s", e)
             return []
 
-    def fetch_live_matches_sync(self):
+    def load_cached_league_catalog(self):
+        """تحميل كتالوج الدوريات من SQLite دون أي طلب شبكة"""
+        leagues = self.storage.load_league_catalog()
+        if leagues:
+            self.league_catalog_seasons = {l['id']: l['season'] for l in leagues}
+            self.league_index.build(leagues)
+        return leagues
+
+    def league_catalog_is_stale(self):
+        fetched_at = self.storage.load_setting('league_catalog_fetched_at')
         try:
-            url = f"{self.base_url}/fixtures"
-            params = {'live': 'all'}
-            
-            response = self.fetch_with_retry(url, params)
-            
-            if response and response.status_code == 200:
-                data = response.json()
-                if data.get('response'):
-                    matches = self.process_api_response_improved(data['response'])
-                    live_matches = [match for match in matches if match.get('status') in ['1H', '2H', 'HT', 'ET', 'P', 'BT', 'LIVE']]
+            return time.time() - float(fetched_at) > self.league_catalog_max_age
+        except (TypeError, ValueError):
+            return True
+
+    def sync_fixtures_warehouse_async(self):
+        """مزامنة مستودع المباريات للدوريات المتابعة في الخلفية"""
+        leagues = []
+        for league_id in self.get_required_league_ids():
+            league = self.dimensions.leagues.get(league_id)
+            if league and league.season:
+                leagues.append((league_id, league.season))
+        if not leagues:
+            return
 
-                    live_matches = self.filter_out_hidden_matches_immediately(live_matches)
-                    
-                    return live_matches
-                else:
-                    return []
-            else:
+        def sync():
+            latest = self.data_versions.latest
+            self.fixtures_warehouse.sync_leagues(leagues)
+            if self.data_versions.latest != latest:
+                self.on_fixtures_synced()
+
+        threading.Thread(target=self.instrumentation.with_source('fixtures_warehouse', sync), daemon=True).start()
+
+    @mainthread
+    def on_fixtures_synced(self):
+        """مباريات جديدة في المستودع: إعادة الفلترة حتى لا تبقى نتائج محسوبة على بيانات قديمة"""
+        if self._is_filtering:
+            Clock.schedule_once(lambda dt: self.on_fixtures_synced(), 1)
+            return
+        self._auto_filter_tick(0)
+
+    def refresh_league_catalog_async(self, reason):
+        """تحديث كتالوج الدوريات في الخلفية (طلب واحد في نفس الوقت)"""
+        if self._catalog_refreshing:
+            return
+        self._catalog_refreshing = True
+        log.info("🏆 Refreshing league catalog in background (%s)", reason)
+        threading.Thread(target=self._refresh_league_catalog, daemon=True).start()
+
+    def _refresh_league_catalog(self):
+        try:
+            leagues = self.fetch_leagues()
+            if leagues:
+                self._apply_league_catalog(leagues)
+        finally:
+            self._catalog_refreshing = False
+
+    @mainthread
+    def _apply_league_catalog(self, leagues):
+        self.all_leagues = leagues
+        self.leagues_loaded = True
+
+    def check_league_catalog_season(self, matches):
+        """تحديث الكتالوج عند ظهور موسم أحدث من المحفوظ لأي دوري"""
+        seasons = self.league_catalog_seasons
+        if not seasons:
+            return
+        for match in matches:
+            known = seasons.get(match.league_id)
+            if known and match.season and match.season > known:
+                self.refresh_league_catalog_async(f"new season {match.season} for league {match.league_id}")
+                return
+
+    def build_live_params(self):
+        """
+        بناء طلبات live محصورة في الدوريات المتابعة (live=id-id-...)
+        مقسمة على دفعات، مع الرجوع إلى live=all إذا لم يتم اختيار أي دوري
+        """
+        league_ids = sorted(lid for lid in self.get_required_league_ids() if lid)
+        if not league_ids:
+            return [{'live': 'all'}]
+
+        chunk_size = self.live_league_chunk_size
+        return [
+            {'live': '-'.join(str(lid) for lid in league_ids[i:i + chunk_size])}
+            for i in range(0, len(league_ids), chunk_size)
+        ]
+
+    def fetch_live_fixtures(self, max_retries=2):
+        """جلب المباريات المباشرة الخام لكل الدفعات، أو None إذا فشل أي طلب"""
+        url = f"{self.base_url}/fixtures"
+        fixtures = []
+        seen_ids = set()
+
+        for params in self.build_live_params():
+            response = self.fetch_with_retry(url, params, max_retries=max_retries)
+            if not response or response.status_code != 200:
+                return None
+
+            for fixture in response.json().get('response', []):
+                fixture_id = fixture.get('fixture', {}).get('id')
+                if fixture_id in seen_ids:
+                    continue
+                seen_ids.add(fixture_id)
+                fixtures.append(fixture)
+
+        return fixtures
+
+    def _process_live_fixtures(self, fixtures):
+        matches = self.process_api_response_improved(fixtures)
+        self.dimensions.flush()
+        self.check_league_catalog_season(matches)
+        self.storage.save_live_snapshot(matches)
+        live_matches = [match for match in matches if match.get('status') in ['1H', '2H', 'HT', 'ET', 'P', 'BT', 'LIVE']]
+        return self.filter_out_hidden_matches_immediately(live_matches)
+
+    def fetch_live_matches_sync(self):
+        try:
+            fixtures = self.fetch_live_fixtures()
+            if not fixtures:
                 return []
+
+            return self._process_live_fixtures(fixtures)
                 
         except Exception as e:
-            print(f"Error fetching live matches: {e}")
+            log.error("Error fetching live matches: %s", e)
             return []
 
     def refresh_live_data_loop(self, dt):
-        pass
-    
-    def _fetch_and_update_live_data(self):
-        try:
-            new_live_matches_data = self.fetch_live_matches_for_update()
-            
-            if new_live_matches_data:
-                self.update_matches_data(new_live_matches_data)
-                
-            self.last_update = datetime.now().strftime('%H:%M:%S')
-            
-        except Exception as e:
-            print(f"Error in auto-update: {e}")
-            self.show_snackbar(f"Auto update error: {e}", duration=4)
+        self.live_updater.poll_now()
+
+    @mainthread
+    def start_live_updates_if_enabled(self):
+        self.live_updater.seed(self.matches)
+        if self.auto_update and not self.live_updater.is_running:
+            self.live_updater.start(self.live_updater.fast_interval)
             
     def fetch_live_matches_for_update(self):
         try:
-            url = f"{self.base_url}/fixtures"
-            params = {'live': 'all'}
-            
-            response = self.fetch_with_retry(url, params, max_retries=1)
-            
-            if response and response.status_code == 200:
-                data = response.json()
-                if data.get('response'):
-                    matches = self.process_api_response_improved(data['response'])
-                    live_matches = [match for match in matches if match.get('status') in ['1H', '2H', 'HT', 'ET', 'P', 'BT', 'LIVE']]
+            fixtures = self.fetch_live_fixtures(max_retries=1)
 
-                    live_matches = self.filter_out_hidden_matches_immediately(live_matches)
-                    
-                    return live_matches
-            return []
+            # None يعني فشل الطلب (يختلف عن عدم وجود مباريات مباشرة)
+            if fixtures is None:
+                return None
+
+            return self._process_live_fixtures(fixtures)
                 
         except Exception as e:
-            print(f"Error fetching live matches for update: {e}")
-            return []
+            log.error("Error fetching live matches for update: %s", e)
+            return None
 
     @mainthread
-    def update_matches_data(self, new_matches):
+    def update_matches_data(self, new_matches, ended_ids=None):
         hidden_ids = {m.get('id') for m in self.hidden_matches}
+        ended_ids = set(ended_ids or ())
 
         filtered_new_matches = [
             match for match in new_matches 
             if match.get('id') not in hidden_ids
         ]
         
-        print(f"🔄 تحديث البيانات: {len(new_matches)} مباراة جديدة، {len(new_matches) - len(filtered_new_matches)} مخفية")
+        log.debug("🔄 تحديث البيانات: %s مباراة جديدة، %s مخفية", len(new_matches), len(new_matches) - len(filtered_new_matches))
         
         new_matches_dict = {m.get('id'): m for m in filtered_new_matches}
         
         updated_self_matches = []
         should_refresh_ui = False
+        match_widgets = self._match_widgets_by_id()
         
         for old_match in self.matches:
             match_id = old_match.get('id')
 
             if match_id in hidden_ids:
                 continue
+
+            if match_id in ended_ids:
+                # خرجت من قائمة المباريات المباشرة
+                self.data_versions.match_finished(old_match)
+                should_refresh_ui = True
+                continue
                 
             new_match = new_matches_dict.pop(match_id, None)
             
@@ -2776,11 +5694,16 @@ class ProfessionalFootballApp(MDApp):
                 old_status = old_match.get('status')
                 new_status = new_match.get('status')
                 
-                old_match.update(new_match)
-                self.find_and_update_match_widget(old_match)
+                # السجلات غير قابلة للتعديل: استبدال المرجع بالسجل الجديد
+                widget = match_widgets.get(match_id)
+                if widget:
+                    widget.match_data = new_match
                 
-                updated_self_matches.append(old_match)
+                updated_self_matches.append(new_match)
                 
+                if new_status in FINISHED_STATUSES and old_status not in FINISHED_STATUSES:
+                    self.data_versions.match_finished(new_match)
+
                 if old_status in ['1H', '2H', 'HT', 'LIVE'] and new_status in ['FT', 'AET', 'PEN']:
                     should_refresh_ui = True
             else:
@@ -2794,10 +5717,9 @@ class ProfessionalFootballApp(MDApp):
         self.matches = updated_self_matches
         self.today_matches = [m for m in self.matches if self._is_today(m.get('time'))]
 
+        # مع فلتر نشط يعيد on_live_deltas تقييم المباريات المتغيرة فقط
         if should_refresh_ui and self.current_tab == 'live' and not self.calendar_mode:
-            if self.current_filter != "No Filter":
-                 self.run_filter_process_threaded() 
-            else:
+            if self.current_filter == "No Filter":
                  self.show_live_matches()
         
         self.root.ids.topbar.right_action_items[0][0] = 'update'
@@ -2806,13 +5728,20 @@ class ProfessionalFootballApp(MDApp):
     def _reset_update_icon(self):
         self.root.ids.topbar.right_action_items[0][0] = 'autorenew'
 
+    def _match_widgets_by_id(self):
+        return {
+            widget.match_data.get('id'): widget
+            for widget in self.root.ids.main_list.children
+            if isinstance(widget, OptimizedCompactMatchItem) and widget.match_data
+        }
+
     def find_and_update_match_widget(self, match_data):
         match_id = match_data.get('id')
         main_list = self.root.ids.main_list
         
         for widget in main_list.children:
             if isinstance(widget, OptimizedCompactMatchItem) and widget.match_data.get('id') == match_id:
-                widget.match_data = match_data.copy()
+                widget.match_data = match_data
                 break
 
     def _is_today(self, time_str):
@@ -2866,7 +5795,7 @@ class ProfessionalFootballApp(MDApp):
                 return "green:" + str(final_goals_for) + ":" + str(final_goals_against)
                 
         except Exception as e:
-            print(f"Error in calcul: {e}")
+            log.warning("Error in calcul: %s", e)
             return "green:0:0"
 
     def calculate_stats(self, matches, is_home):
@@ -2881,7 +5810,7 @@ class ProfessionalFootballApp(MDApp):
             return "green:0:0"
             
         except Exception as e:
-            print(f"Error in calculate_stats: {e}")
+            log.warning("Error in calculate_stats: %s", e)
             return "green:0:0"
 
     def _determine_last_rank_display(self, last_standings, current_standings):
@@ -2914,31 +5843,10 @@ class ProfessionalFootballApp(MDApp):
 
     def _find_team_in_all_leagues_last_season(self, team_id, last_season):
         try:
-            url = f"{self.base_url}/leagues"
-            params = {
-                'team': team_id,
-                'season': last_season
-            }
-            
-            response = self.fetch_with_retry(url, params)
-            
-            if response and response.status_code == 200:
-                data = response.json()
-                if data.get('response'):
-                    for league_data in data['response']:
-                        league_info = league_data.get('league', {})
-                        league_id = league_info.get('id')
-                        league_name = league_info.get('name', '')
-                        
-                        standings = self._fetch_season_standings(team_id, league_id, last_season)
-                        if standings:
-                            standings['league_name'] = league_name
-                            return standings
-            
-            return None
+            return self.last_season_resolver.resolve(team_id, last_season)
             
         except Exception as e:
-            print(f"Error finding team in all leagues: {e}")
+            log.warning("Error finding team in all leagues: %s", e)
             return None
 
     def _fetch_season_standings(self, team_id, league_id, season):
@@ -2984,7 +5892,7 @@ class ProfessionalFootballApp(MDApp):
             return None
             
         except Exception as e:
-            print(f"Error fetching season standings: {e}")
+            log.warning("Error fetching season standings: %s", e)
             return None
 
     def determine_team_order(self, match_data):
@@ -3066,7 +5974,7 @@ class ProfessionalFootballApp(MDApp):
                 popup.second_team_played = 'N/A'
                 
         except Exception as e:
-            print(f"Error updating popup stats: {e}")
+            log.error("Error updating popup stats: %s", e)
 
     def close_stats_popup(self, popup):
         anim = Animation(opacity=0, duration=0.3)
@@ -3099,8 +6007,7 @@ class ProfessionalFootballApp(MDApp):
         self.show_no_live_matches()
 
     def show_loading(self, message="Loading...", progress=0, status=""):
-        container = self.root.ids.main_list
-        container.clear_widgets()
+        container = self.clear_main_list()
         loading_widget = LoadingWidget()
         loading_widget.loading_text = message
         loading_widget.progress_value = progress
@@ -3109,16 +6016,14 @@ class ProfessionalFootballApp(MDApp):
 
     def show_api_error(self, error_msg=""):
         self.api_available = False
-        container = self.root.ids.main_list
-        container.clear_widgets()
+        container = self.clear_main_list()
         error_widget = ErrorWidget()
         error_widget.error_text = f"Error: {error_msg}" if error_msg else "Connection error"
         container.add_widget(error_widget)
 
     def show_no_live_matches(self):
         self.api_available = True
-        container = self.root.ids.main_list
-        container.clear_widgets()
+        container = self.clear_main_list()
         
         empty_item = TwoLineListItem(
             text="No live matches",
@@ -3187,8 +6092,7 @@ class ProfessionalFootballApp(MDApp):
             self.show_api_error()
             return
             
-        container = self.root.ids.main_list
-        container.clear_widgets()
+        container = self.clear_main_list()
         
         if self.current_filter != "No Filter" and self.filtered_matches:
             self.display_filtered_matches()
@@ -3207,7 +6111,7 @@ class ProfessionalFootballApp(MDApp):
             filtered_live_matches = live_matches
 
         final_matches_to_show = self.filter_out_hidden_and_favorite_matches(filtered_live_matches)
-        print(f"📊 Live Matches: {len(live_matches)} -> {len(filtered_live_matches)} بعد فلترة الدوريات -> {len(final_matches_to_show)} بعد الإخفاء النهائي")
+        log.debug("📊 Live Matches: %s -> %s بعد فلترة الدوريات -> %s بعد الإخفاء النهائي", len(live_matches), len(filtered_live_matches), len(final_matches_to_show))
         
         organized_live_matches = self.organize_live_matches_by_minute(final_matches_to_show)
 
@@ -3245,12 +6149,7 @@ class ProfessionalFootballApp(MDApp):
                 live_header.md_bg_color = get_color_from_hex("#FFEBEE")
                 container.add_widget(live_header)
                 
-                for match in organized_live_matches:
-                    item = OptimizedCompactMatchItem(
-                        match_data=match, 
-                        is_fav=self.is_favorite(match.get('id'))
-                    )
-                    container.add_widget(item)
+                self.render_match_items(container, organized_live_matches, progress_label=count_label, with_favorites=True)
             
             if not organized_live_matches:
                 self.show_empty_message("No live matches currently")
@@ -3259,15 +6158,11 @@ class ProfessionalFootballApp(MDApp):
 
     def populate_matches(self, matches_list, container):
         for match in matches_list:
-            item = OptimizedCompactMatchItem(
-                match_data=match, 
-                is_fav=self.is_favorite(match.get('id'))
-            )
+            item = self.match_item_pool.acquire(match, self.is_favorite(match.get('id')))
             container.add_widget(item)
 
     def show_favorites(self):
-        container = self.root.ids.main_list
-        container.clear_widgets()
+        container = self.clear_main_list()
         
         all_available_matches = list({m['id']: m for m in self.matches + self.today_matches}.values())
 
@@ -3300,8 +6195,7 @@ class ProfessionalFootballApp(MDApp):
             self.show_empty_message("No favorites")
 
     def show_empty_message(self, message):
-        container = self.root.ids.main_list
-        container.clear_widgets()
+        container = self.clear_main_list()
         
         empty_item = TwoLineListItem(
             text=message,
@@ -3346,8 +6240,8 @@ class ProfessionalFootballApp(MDApp):
             self.root.ids[btn_id].selected = (tab_name == self.current_tab)
 
     def show_leagues(self):
-        c = self.root.ids.main_list
-        c.clear_widgets()
+        from kivymd.uix.textfield import MDTextField
+        c = self.clear_main_list()
 
         box = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50), spacing=6)
         self.search_input = MDTextField(
@@ -3452,9 +6346,8 @@ class ProfessionalFootballApp(MDApp):
         
         self.display_saved_leagues_for_selection()
 
-    def show_profile(self):
-        container = self.root.ids.main_list
-        container.clear_widgets()
+    def show_profile(self):
+        container = self.clear_main_list()
         
         profile_header = OneLineListItem(text="👤 MY PROFILE")
         profile_header.md_bg_color = get_color_from_hex("#E8F5E8")
@@ -3494,7 +6387,7 @@ class ProfessionalFootballApp(MDApp):
         filter_header.md_bg_color = get_color_from_hex("#E1F5FE")
         container.add_widget(filter_header)
         
-        filter_buttons_box = MDBoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None, height=dp(320))
+        filter_buttons_box = MDBoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None, height=dp(370))
         
         # فلتر Perfect2_2
         btn_perfect2_2 = MDBoxLayout(
@@ -3556,6 +6449,32 @@ class ProfessionalFootballApp(MDApp):
         btn_ns_filter.add_widget(btn_ns_filter_label)
         btn_ns_filter.add_widget(btn_ns_filter_icon)
         filter_buttons_box.add_widget(btn_ns_filter)
+
+        # التحديث المباشر التلقائي
+        btn_auto_update = MDBoxLayout(
+            orientation='horizontal',
+            size_hint_y=None,
+            height=dp(40),
+            padding=dp(5),
+            spacing=dp(10)
+        )
+        btn_auto_update_label = MDLabel(
+            text="🔄 Live Auto Update (adaptive)",
+            theme_text_color='Primary',
+            halign='left',
+            valign='center',
+            size_hint_x=0.8
+        )
+        btn_auto_update_icon = MDIconButton(
+            icon= "checkbox-marked" if self.auto_update else "checkbox-blank-outline",
+            theme_text_color='Custom',
+            text_color=get_color_from_hex("#4CAF50") if self.auto_update else get_color_from_hex("#757575"),
+            on_release=lambda x: self.toggle_auto_update(),
+            size_hint_x=0.2
+        )
+        btn_auto_update.add_widget(btn_auto_update_label)
+        btn_auto_update.add_widget(btn_auto_update_icon)
+        filter_buttons_box.add_widget(btn_auto_update)
         
         # الفلترات الأخرى الحالية
         btn_condition1 = MDRaisedButton(
@@ -3603,6 +6522,20 @@ class ProfessionalFootballApp(MDApp):
             bg_color=get_color_from_hex("#FFFFFF")
         )
         container.add_widget(hidden_matches_btn)
+
+        api_stats_btn = OneLineIconListItem(
+            text="📈 API Performance",
+            on_release=lambda x: self.show_api_stats(),
+            bg_color=get_color_from_hex("#FFFFFF")
+        )
+        container.add_widget(api_stats_btn)
+
+        rank_policy_btn = OneLineIconListItem(
+            text="🚫 Rank Pair Policy (NS Perfect 1_1)",
+            on_release=lambda x: self.show_rank_pair_policy(),
+            bg_color=get_color_from_hex("#FFFFFF")
+        )
+        container.add_widget(rank_policy_btn)
         
         info_header = OneLineListItem(text="ℹ️ ABOUT")
         info_header.md_bg_color = get_color_from_hex("#E3F2FD")
@@ -3612,6 +6545,186 @@ class ProfessionalFootballApp(MDApp):
         container.add_widget(OneLineListItem(text="⚽ Football Live App"))
         container.add_widget(OneLineListItem(text="👨‍💻 Developed with KivyMD"))
     
+    def show_api_stats(self):
+        """زمن الاستجابة p50/p95 لكل endpoint وأكثر مصادر الطلبات"""
+        container = self.clear_main_list()
+        summary = self.instrumentation.summary()
+
+        header = OneLineListItem(text="📈 API PERFORMANCE")
+        header.md_bg_color = get_color_from_hex("#E1F5FE")
+        container.add_widget(header)
+
+        count_label = MDLabel(
+            text=f"Last {summary['records']} calls and cache hits",
+            font_style='Caption',
+            halign='center',
+            theme_text_color='Secondary',
+            size_hint_y=None,
+            height=dp(25)
+        )
+        container.add_widget(count_label)
+
+        for endpoint, entry in sorted(summary['endpoints'].items(), key=lambda item: -item[1]['calls']):
+            container.add_widget(TwoLineListItem(
+                text=f"/{endpoint}: {entry['calls']} calls, {entry['hits']} cache hits, {entry['errors']} errors",
+                secondary_text=f"p50 {entry['p50_ms']:.0f} ms | p95 {entry['p95_ms']:.0f} ms | {entry['bytes'] / 1024:.0f} KB"
+            ))
+
+        sources_header = OneLineListItem(text="🔝 TOP REQUEST SOURCES")
+        sources_header.md_bg_color = get_color_from_hex("#F3E5F5")
+        container.add_widget(sources_header)
+
+        for caller, calls in summary['top_sources']:
+            container.add_widget(OneLineListItem(text=f"{caller}: {calls} calls"))
+
+        filters = self.rule_engine.summary()
+        filters_header = OneLineListItem(text="🧮 FILTER FETCHES")
+        filters_header.md_bg_color = get_color_from_hex("#E8F5E9")
+        container.add_widget(filters_header)
+        container.add_widget(TwoLineListItem(
+            text=f"{filters['evaluations']} evaluations | avoided {filters['avoided']['network']} network, {filters['avoided']['cached']} cached",
+            secondary_text=f"needed {filters['fetched']['network']} network, {filters['fetched']['cached']} cached"
+        ))
+        container.add_widget(OneLineListItem(
+            text=f"♻️ {filters['reused']} verdicts reused unchanged ({len(self.verdict_cache)} stored)"
+        ))
+
+        persist_row = MDBoxLayout(
+            orientation='horizontal',
+            size_hint_y=None,
+            height=dp(40),
+            padding=dp(5),
+            spacing=dp(10)
+        )
+        persist_row.add_widget(MDLabel(
+            text="💾 Save API log to database",
+            theme_text_color='Primary',
+            halign='left',
+            valign='center',
+            size_hint_x=0.8
+        ))
+        persist_row.add_widget(MDIconButton(
+            icon="checkbox-marked" if self.instrumentation.persist else "checkbox-blank-outline",
+            theme_text_color='Custom',
+            text_color=get_color_from_hex("#4CAF50") if self.instrumentation.persist else get_color_from_hex("#757575"),
+            on_release=lambda x: self.toggle_api_log_persistence(),
+            size_hint_x=0.2
+        ))
+        container.add_widget(persist_row)
+
+        export_btn = MDRaisedButton(
+            text="📤 Export API Log",
+            on_release=lambda x: self.export_api_stats(),
+            pos_hint={'center_x': 0.5},
+            size_hint_x=0.8
+        )
+        container.add_widget(export_btn)
+
+        back_btn = MDRaisedButton(
+            text="⬅️ Back to Profile",
+            on_release=lambda x: self.show_profile(),
+            pos_hint={'center_x': 0.5},
+            size_hint_x=0.8
+        )
+        container.add_widget(back_btn)
+
+    def toggle_api_log_persistence(self):
+        self.instrumentation.persist = not self.instrumentation.persist
+        if not self.instrumentation.persist:
+            self.instrumentation.flush()
+        self.storage.save_filter_state('instrumentation_persist', self.instrumentation.persist)
+        self.show_api_stats()
+
+    def export_api_stats(self):
+        """تصدير السجل بجانب قاعدة البيانات (قابل للوصول من مدير الملفات على Android)"""
+        try:
+            folder = os.path.dirname(os.path.abspath(self.storage.db_path))
+            path = os.path.join(folder, f"api_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            self.instrumentation.export(path)
+            self.show_snackbar(f"Exported to {path}")
+        except Exception as e:
+            self.show_snackbar(f"Export failed: {e}")
+
+    def show_rank_pair_policy(self):
+        """عرض وتعديل أزواج الترتيب الممنوعة: سطر لكل ترتيب للفريق الأكثر تسجيلاً"""
+        container = self.clear_main_list()
+        policy = self.rank_policy
+
+        header = OneLineListItem(text="🚫 RANK PAIR POLICY")
+        header.md_bg_color = get_color_from_hex("#FFEBEE")
+        container.add_widget(header)
+
+        container.add_widget(MDLabel(
+            text=f"Version {policy.version} | {len(policy.pairs)} forbidden pairs | tap a rank to edit",
+            font_style='Caption',
+            halign='center',
+            theme_text_color='Secondary',
+            size_hint_y=None,
+            height=dp(25)
+        ))
+
+        for winner_rank in range(1, max(policy.size, 21)):
+            losers = policy.forbidden_for(winner_rank)
+            container.add_widget(TwoLineListItem(
+                text=f"+ Rank {winner_rank} (more goals)",
+                secondary_text=f"Forbidden vs: {', '.join(map(str, losers))}" if losers else "No forbidden ranks",
+                on_release=lambda x, rank=winner_rank: self.edit_rank_pair_row(rank)
+            ))
+
+        reset_btn = MDRaisedButton(
+            text="🔄 Reset to Default",
+            on_release=lambda x: self.reset_rank_pair_policy(),
+            pos_hint={'center_x': 0.5},
+            size_hint_x=0.8
+        )
+        container.add_widget(reset_btn)
+
+        back_btn = MDRaisedButton(
+            text="⬅️ Back to Profile",
+            on_release=lambda x: self.show_profile(),
+            pos_hint={'center_x': 0.5},
+            size_hint_x=0.8
+        )
+        container.add_widget(back_btn)
+
+    def edit_rank_pair_row(self, winner_rank):
+        from kivymd.uix.dialog import MDDialog
+        from kivymd.uix.textfield import MDTextField
+
+        content = BoxLayout(orientation='vertical', size_hint_y=None, height=dp(70))
+        field = MDTextField(
+            hint_text="Forbidden loser ranks (ex: 2, 3, 10)",
+            text=', '.join(map(str, self.rank_policy.forbidden_for(winner_rank)))
+        )
+        content.add_widget(field)
+
+        def save(*args):
+            try:
+                loser_ranks = {int(part) for part in re.split(r'[\s,]+', field.text.strip()) if part}
+            except ValueError:
+                self.show_snackbar("Ranks must be numbers")
+                return
+            self.dialog.dismiss()
+            self.rank_policy.set_forbidden_for(winner_rank, loser_ranks)
+            self.show_rank_pair_policy()
+            self.show_snackbar(f"Rank pair policy v{self.rank_policy.version} saved")
+
+        self.dialog = MDDialog(
+            title=f"Rank {winner_rank} vs",
+            type="custom",
+            content_cls=content,
+            buttons=[
+                MDFlatButton(text="Cancel", on_release=lambda x: self.dialog.dismiss()),
+                MDFlatButton(text="Save", on_release=save),
+            ]
+        )
+        self.dialog.open()
+
+    def reset_rank_pair_policy(self):
+        self.rank_policy.reset()
+        self.show_rank_pair_policy()
+        self.show_snackbar(f"Rank pair policy reset (v{self.rank_policy.version})")
+
     def reset_all_filters(self):
         """إعادة تعيين جميع الفلترات"""
         self.reset_filter()
@@ -3628,8 +6741,7 @@ class ProfessionalFootballApp(MDApp):
         self.show_snackbar("✅ All filters reset")
 
     def show_hidden_matches(self):
-        container = self.root.ids.main_list
-        container.clear_widgets()
+        container = self.clear_main_list()
         
         if self.hidden_matches:
             header = OneLineListItem(text="👻 HIDDEN MATCHES")
@@ -3637,10 +6749,7 @@ class ProfessionalFootballApp(MDApp):
             container.add_widget(header)
             
             for match in self.hidden_matches:
-                item = OptimizedCompactMatchItem(
-                    match_data=match, 
-                    is_fav=self.is_favorite(match.get('id'))
-                )
+                item = self.match_item_pool.acquire(match, self.is_favorite(match.get('id')))
                 container.add_widget(item)
             
             clear_btn = MDRaisedButton(
@@ -3670,42 +6779,22 @@ class ProfessionalFootballApp(MDApp):
         t.start()
 
     def fetch_leagues_api(self, keyword=""):
-        url = "https://v3.football.api-sports.io/leagues"
-        headers = {"x-apisports-key": "ff5507928d7ea3382d5a8149db14e988"}
         try:
-            if self.leagues_loaded:
-                 leagues = self.all_leagues
-            else:
-                resp = requests.get(url, headers=headers)
-                data = resp.json()
-                leagues = data.get("response", [])
-            
-            filtered = []
-
-            for item in leagues:
-                if isinstance(item, dict) and 'league' in item:
-                    league = item.get("league", {})
-                    country = item.get("country", {})
+            if not self.league_index.ready:
+                if self.leagues_loaded and self.all_leagues:
+                    self.league_index.build(self.all_leagues)
                 else:
-                    league = item
-                    country = {'name': item.get('country_name', ''), 'code': item.get('country_code', '')}
-
-                name = league.get("name", "")
-                country_name = country.get("name", "")
-                league_id = league.get("id", "")
-                lname = name.lower()
-                cname = country_name.lower()
-
-                if keyword and keyword not in lname and keyword not in cname:
-                    continue
-                if any(x in lname for x in ["women", "feminine", "u19", "u20", "u17"]):
-                    continue
+                    # fetch_leagues يبني الفهرس عند اكتماله
+                    leagues = self.fetch_leagues()
+                    if leagues:
+                        self.all_leagues = leagues
+                        self.leagues_loaded = True
 
-                filtered.append((f"{name} ({country_name})", league_id))
+            filtered = self.league_index.search(keyword)
 
             Clock.schedule_once(lambda dt: self.display_leagues(filtered))
         except Exception as e:
-            print("⚠️ Loading error:", e)
+            log.warning("⚠️ Loading error: %s", e)
             Clock.schedule_once(lambda dt: self.show_dialog("Error loading leagues"))
 
     def display_leagues(self, leagues_list):
@@ -3763,6 +6852,7 @@ class ProfessionalFootballApp(MDApp):
             self.show_live_matches()
 
     def show_snackbar(self, message, duration=3):
+        from kivymd.uix.snackbar import Snackbar
         try:
             Snackbar(
                 text=message,
@@ -3773,9 +6863,10 @@ class ProfessionalFootballApp(MDApp):
                 bg_color=get_color_from_hex("#323232")
             ).open()
         except Exception as e:
-            print(f"Error showing snackbar: {e}")
+            log.error("Error showing snackbar: %s", e)
 
     def show_dialog(self, text):
+        from kivymd.uix.dialog import MDDialog
         self.dialog = MDDialog(
             title="Information",
             text=text,
@@ -3801,17 +6892,18 @@ class ProfessionalFootballApp(MDApp):
 
     def toggle_auto_update(self):
         self.auto_update = not self.auto_update
+        self.save_filter_state()
         status = "enabled" if self.auto_update else "disabled"
         self.show_snackbar(f"Auto update {status}")
         
         if self.auto_update:
-            if not self._update_event:
-                self._update_event = Clock.schedule_interval(self.refresh_live_data_loop, self.update_interval)
-            elif not self._update_event.is_active:
-                self._update_event()
+            self.live_updater.seed(self.matches)
+            self.live_updater.start()
         else:
-            if self._update_event:
-                self._update_event.cancel()
+            self.live_updater.stop()
+
+        if self.current_tab == 'profile':
+            self.show_profile()
 
     def show_hidden_matches_in_profile(self):
         if self.current_tab == 'profile':
@@ -3821,33 +6913,7 @@ class ProfessionalFootballApp(MDApp):
         self.load_leagues_and_matches()
 
     def refresh_data(self):
-        threading.Thread(target=self._fetch_and_update_live_data, daemon=True).start()
-
-    def default_filter_condition(self, match_data):
-        return "❌ no"
-
-    def filter_condition_1(self, match_data):
-        try:
-            home_score = match_data.get('home_score', 0)
-            away_score = match_data.get('away_score', 0)
-            status = match_data.get('status', '')
-            
-            if status not in ['NS', '1H', '2H', 'HT', 'ET', 'LIVE']:
-                 return "❌ no"
-            
-            if status == 'NS':
-                return "✅ yes"
-            
-            if (home_score > 0 and away_score == 0) or (home_score == 0 and away_score > 0):
-                return "✅ yes"
-            
-            if home_score == 0 and away_score == 0:
-                return "✅ yes"
-            
-            return "❌ no"
-        except Exception as e:
-            print(f"Error in filter_condition_1: {e}")
-            return "❌ no"
+        self.live_updater.poll_now()
 
     def extract_goals_for_and_against(self, stats_str):
         try:
@@ -3860,134 +6926,29 @@ class ProfessionalFootballApp(MDApp):
         except:
             return 0, 0
 
-    def filter_condition_2(self, match_data):
-        try:
-            home_team_id = match_data.get('home_team_id')
-            away_team_id = match_data.get('away_team_id')
-            league_id = match_data.get('league_id')
-            season = match_data.get('season', datetime.now().year)
-            home_score = match_data.get('home_score', 0)
-            away_score = match_data.get('away_score', 0)
-            status = match_data.get('status', 'NS')
-            
-            # ------------------------------------------------------------------
-
-            if status in ['FT', 'AET', 'PEN']:
-
-                if home_score == 0 and away_score == 0:
-                    return "❌ no (انتهت بالتعادل السلبي 0-0)"
-                
-
-                return "❌ no (انتهت: FT/AET/PEN)"
-
-            # ------------------------------------------------------------------
-
-            if home_score > 0 and away_score > 0:
-                return "❌ no (سجلوا كلاهما)"
-
-            # ------------------------------------------------------------------
-
-            if status not in ['NS', '1H', '2H', 'HT', 'ET', 'LIVE']:
-                return "❌ no"
-
-
-            if home_score == away_score and status != 'NS': 
-                return "✅ yes" 
-            
-
-            if status == 'NS':
-                return "✅ yes"
-                
-
-            if not home_team_id or not away_team_id or not league_id:
-                return "❌ no"
-
-
-            if home_score < away_score:
-                losing_team_id = home_team_id
-                winning_team_id = away_team_id
-                losing_is_home = True
-            else: 
-                losing_team_id = away_team_id
-                winning_team_id = home_team_id
-                losing_is_home = False
-            
-
-            losing_stats_str = self.fetch_team_last_matches_improved(
-                losing_team_id, league_id, season, losing_is_home
-            )
-            
-            winning_stats_str = self.fetch_team_last_matches_improved(
-                winning_team_id, league_id, season, not losing_is_home
-            )
-            
-
-            losing_goals_for, losing_goals_against = self.extract_goals_for_and_against(losing_stats_str)
-            winning_goals_for, winning_goals_against = self.extract_goals_for_and_against(winning_stats_str)
-            
-
-            if losing_goals_against > 7:
-                return "❌ no (الخاسر استقبل أكثر من 7 أهداف)"
-            
-
-            if (losing_goals_against - winning_goals_against) > 2:
-                    return "❌ no (الخاسر استقبل عدد أهداف مرتفع)"
-
-                                                # ============================================================
-
-            if losing_goals_for >= winning_goals_for:
-                return "✅ yes"
-            
-            return "❌ no (الأهداف المسجلة للخاسر أقل)"
-            
-        except Exception as e:
-            print(f"Error in filter_condition_2: {e}")
-            return "❌ no"
-
-    def combined_filter_condition(self, match_data):
-        condition1_result = self.filter_condition_1(match_data)
-        condition2_result = self.filter_condition_2(match_data)
-        
-        if condition1_result == "✅ yes" and condition2_result == "✅ yes":
-            return "✅ yes"
-        
-        return "❌ no"
-        
-    def filter_condition_combined_1_and_2(self, match_data):
-        condition1_result = self.filter_condition_1(match_data)
-        if condition1_result != "✅ yes":
-            return "❌ no"
-
-        condition2_result = self.filter_condition_2(match_data)
-        
-        if condition2_result == "✅ yes":
-            return "✅ yes"
-        
-        return "❌ no"
-
     def apply_filter_condition_1(self):
-        self.set_filter_logic(self.filter_condition_1, "One Team Scored/No Goals")
+        self.set_filter_logic(CONDITION_1_RULE, "One Team Scored/No Goals")
         self.run_filter_process_threaded()
         self.show_snackbar("Applied Condition 1: One team scored or no goals")
 
     def apply_filter_condition_2(self):
-        self.set_filter_logic(self.filter_condition_2, "Loser Scored More (Last 3)")
+        self.set_filter_logic(CONDITION_2_RULE, "Loser Scored More (Last 3)")
         self.run_filter_process_threaded()
         self.show_snackbar("Applied Condition 2: Losing team scored more in last 3 matches")
 
     def apply_combined_filter(self):
-        self.set_filter_logic(self.combined_filter_condition, "Combined Filter (1 and 2)")
+        self.set_filter_logic(CONDITION_1_AND_2_RULE, "Combined Filter (1 and 2)")
         self.run_filter_process_threaded()
         self.show_snackbar("Applied Combined Filter (Conditions 1 and 2)")
 
     def apply_combined_filter_1_and_2(self):
-        self.set_filter_logic(self.filter_condition_combined_1_and_2, "Condition 1 + 2")
+        self.set_filter_logic(CONDITION_1_AND_2_RULE, "Condition 1 + 2")
         self.run_filter_process_threaded()
         self.show_snackbar("Applied Combined Filter: One Team Scored/No Goals AND Loser Stats")
     
-    def apply_combined_filter_on_start(self):
-        self.set_filter_logic(self.filter_condition_combined_1_and_2, "Condition 1 + 2 (Auto)")
-        Clock.schedule_once(lambda dt: self.run_filter_process_threaded(), 0)
+    def apply_combined_filter_on_start(self, live_matches=None):
+        self.set_filter_logic(CONDITION_1_AND_2_RULE, "Condition 1 + 2 (Auto)")
+        Clock.schedule_once(lambda dt: self.run_filter_process_threaded(live_matches), 0)
         self.show_snackbar("Auto-Filter Applied: Condition 1 + 2")
 
     def reset_filter_ui(self):
@@ -3996,61 +6957,148 @@ class ProfessionalFootballApp(MDApp):
             self.show_live_matches()
         self.show_snackbar("Filter reset")
 
-    def set_filter_logic(self, new_logic_function, filter_name="Custom"):
-        self.filter_condition = new_logic_function
+    def set_filter_logic(self, rule, filter_name="Custom"):
+        self.filter_rule = rule
         self.current_filter = filter_name
 
-    def run_filter_process_threaded(self):
+    def run_filter_process_threaded(self, live_matches=None):
         if self._is_filtering:
             return
             
         self._is_filtering = True
         
         def apply_filter():
+            nonlocal live_matches
             try:
                 filtered_matches = []
                 filter_results = {}
                 
-                live_matches = self.fetch_live_matches_sync()
-                
-                relevant_matches = [
-                    match for match in live_matches 
-                    if match.get('status') in ['1H', '2H', 'HT', 'ET', 'P', 'BT', 'LIVE']
-                ]
+                if live_matches is None:
+                    live_matches = self.fetch_live_matches_sync()
                 
-                required_league_ids = self.get_required_league_ids()
-                if required_league_ids:
-                    relevant_matches = [
-                        match for match in relevant_matches
-                        if match.get('league_id') in required_league_ids
-                    ]
-
-                hidden_ids = {m.get('id') for m in self.hidden_matches}
-                relevant_matches = [
-                    match for match in relevant_matches 
-                    if match.get('id') not in hidden_ids
-                ]
+                relevant_matches = self._filter_candidates(live_matches)
                 
-                for match in relevant_matches:
-                    match_id = match.get('id')
-                    result = self.apply_filter_condition(match)
-                    filter_results[match_id] = result
+                verdicts = self.batch_evaluator.evaluate(self.filter_rule, relevant_matches)
+                for match, result in zip(relevant_matches, verdicts):
+                    filter_results[match.get('id')] = result
                     
-                    if result == "✅ yes":
+                    if result.passed:
                         filtered_matches.append(match)
+                self.verdict_cache.flush()
                 
                 Clock.schedule_once(lambda dt: self._update_ui_with_filtered_matches(
                     filtered_matches, filter_results
                 ), 0)
                 
             except Exception as e:
-                print(f"Filter error: {e}")
+                log.warning("Filter error: %s", e)
                 Clock.schedule_once(lambda dt: self._handle_filter_error(e), 0)
         
-        threading.Thread(target=apply_filter, daemon=True).start()
+        threading.Thread(target=self.instrumentation.with_source(f"filter: {self.current_filter}", apply_filter), daemon=True).start()
+
+    def _filter_candidates(self, matches):
+        """المباريات التي يطبق عليها فلتر المباريات المباشرة"""
+        relevant_matches = [
+            match for match in matches 
+            if match.get('status') in ['1H', '2H', 'HT', 'ET', 'P', 'BT', 'LIVE']
+        ]
+        
+        required_league_ids = self.get_required_league_ids()
+        if required_league_ids:
+            relevant_matches = [
+                match for match in relevant_matches
+                if match.get('league_id') in required_league_ids
+            ]
+
+        hidden_ids = {m.get('id') for m in self.hidden_matches}
+        return [
+            match for match in relevant_matches 
+            if match.get('id') not in hidden_ids
+        ]
+
+    def on_live_deltas(self, deltas, ended_ids):
+        """
+        مستمع LiveUpdater: إعادة تقييم الفلتر النشط فقط للمباريات الجديدة
+        أو التي تغيرت نتيجتها أو حالتها (تغير الدقيقة وحده لا يغير النتيجة)
+        """
+        if self.filter_rule is NO_FILTER_RULE:
+            return
+
+        if self._is_filtering:
+            self._pending_filter_deltas.append((deltas, ended_ids))
+            return
+
+        changed = [
+            delta.match for delta in deltas
+            if delta.kind == 'new' or any(field in delta.changes for field in SCORE_FEATURES)
+        ]
+        ended_ids = set(ended_ids or ())
+        if not changed and not ended_ids & self.filter_results.keys():
+            return
+
+        rule = self.filter_rule
+
+        def evaluate():
+            try:
+                candidates = self._filter_candidates(changed)
+                verdicts = self.batch_evaluator.evaluate(rule, candidates)
+                self.verdict_cache.flush()
+                results = {match.get('id'): verdict for match, verdict in zip(candidates, verdicts)}
+                Clock.schedule_once(lambda dt: self._apply_filter_deltas(rule, changed, results, ended_ids), 0)
+            except Exception as e:
+                log.warning("Incremental filter error: %s", e)
+
+        threading.Thread(target=self.instrumentation.with_source(f"filter delta: {self.current_filter}", evaluate), daemon=True).start()
+
+    def _apply_filter_deltas(self, rule, changed, results, ended_ids):
+        """دمج النتائج الجديدة مع filtered_matches وإرسال المباريات التي دخلت أو خرجت من الفلتر"""
+        if rule is not self.filter_rule:
+            return
+
+        current = OrderedDict((match.get('id'), match) for match in self.filtered_matches)
+        entered, left = [], []
+
+        for match in changed:
+            match_id = match.get('id')
+            verdict = results.get(match_id)
+            if verdict is None:
+                # لم تعد ضمن المباريات المعنية (انتهت أو أخفيت مثلاً)
+                self.filter_results.pop(match_id, None)
+            else:
+                self.filter_results[match_id] = verdict
+
+            if verdict is not None and verdict.passed:
+                if match_id not in current:
+                    entered.append(match)
+                current[match_id] = match
+            elif match_id in current:
+                left.append(current.pop(match_id))
+
+        for match_id in ended_ids:
+            self.filter_results.pop(match_id, None)
+            if match_id in current:
+                left.append(current.pop(match_id))
+
+        self.filtered_matches = list(current.values())
+        if entered or left:
+            self.on_filter_changes(entered, left)
+
+    def on_filter_changes(self, entered, left):
+        """مباريات دخلت الفلتر النشط أو خرجت منه بعد تحديث مباشر"""
+        log.debug("🔍 %s: +%s / -%s", self.current_filter, len(entered), len(left))
+
+        if self.current_tab == 'live' and not self.calendar_mode:
+            self.display_filtered_matches()
+
+        parts = []
+        if entered:
+            parts.append(f"+{len(entered)} entered")
+        if left:
+            parts.append(f"-{len(left)} left")
+        self.show_snackbar(f"🔍 {self.current_filter}: {', '.join(parts)}")
 
     def apply_filter_condition(self, match_data):
-        return self.filter_condition(match_data)
+        return self.batch_evaluator.evaluate(self.filter_rule, [match_data])[0]
 
     @mainthread
     def _update_ui_with_filtered_matches(self, filtered_matches, filter_results):
@@ -4061,9 +7109,15 @@ class ProfessionalFootballApp(MDApp):
         if self.current_tab == 'live' and not self.calendar_mode:
             self.display_filtered_matches()
 
+        self._replay_filter_deltas()
+
+    def _replay_filter_deltas(self):
+        pending, self._pending_filter_deltas = self._pending_filter_deltas, []
+        for deltas, ended_ids in pending:
+            self.on_live_deltas(deltas, ended_ids)
+
     def display_filtered_matches(self):
-        container = self.root.ids.main_list
-        container.clear_widgets()
+        container = self.clear_main_list()
         
         if self._is_filtering:
             self.show_loading("Applying filter...")
@@ -4094,9 +7148,7 @@ class ProfessionalFootballApp(MDApp):
                 live_header.md_bg_color = get_color_from_hex("#FFEBEE")
                 container.add_widget(live_header)
                 
-                for match in organized_live_matches:
-                    item = OptimizedCompactMatchItem(match_data=match)
-                    container.add_widget(item)
+                self.render_match_items(container, organized_live_matches, progress_label=filter_info)
             
             if not organized_live_matches:
                  self.show_empty_message("No live matches match filter conditions")
@@ -4119,7 +7171,8 @@ class ProfessionalFootballApp(MDApp):
         self.filtered_matches = []
         self.filter_results = {}
         self._is_filtering = False
-        self.filter_condition = self.default_filter_condition
+        self._pending_filter_deltas = []
+        self.filter_rule = NO_FILTER_RULE
         self.current_filter = "No Filter"
 
     def clear_filter_cache(self):
@@ -4139,14 +7192,16 @@ class ProfessionalFootballApp(MDApp):
         if self._auto_filter_event:
             self._auto_filter_event.cancel()
         
-        self._auto_filter_event = Clock.schedule_interval(
-            lambda dt: self.run_filter_process_threaded(), 
-            self.filter_interval
-        )
+        self._auto_filter_event = Clock.schedule_interval(self._auto_filter_tick, self.filter_interval)
+
+    def _auto_filter_tick(self, dt):
+        # أثناء التحديث المباشر self.matches حديثة (والتغييرات تفلتر فور وصولها) فلا حاجة لإعادة جلب live=all
+        self.run_filter_process_threaded(list(self.matches) if self.live_updater.is_running else None)
 
     def _handle_filter_error(self, error):
         self._is_filtering = False
         self.show_snackbar(f"Filter error: {error}")
+        self._replay_filter_deltas()
 
     def load_leagues_and_matches(self):
         self.show_loading("🚀 Starting Football App", 0, "Initializing...")
@@ -4155,52 +7210,116 @@ class ProfessionalFootballApp(MDApp):
         self.loading_thread.start()
 
     def _load_with_progress(self):
-        total_steps = 5
-        current_step = 0
-        
+        """
+        خط بدء التشغيل: عرض آخر لقطة مباشرة محفوظة فوراً، ثم جلب الدوريات
+        والمباريات المباشرة بالتوازي، وتأجيل الفلتر التلقائي لما بعد أول عرض
+        """
+        timings = self.startup_timings
+        start = time.perf_counter()
+
+        def mark(phase, since):
+            now = time.perf_counter()
+            timings[phase] = (now - since) * 1000
+            log.info("⏱️ Startup %s: %.0f ms", phase, timings[phase])
+            return now
+
         try:
-            current_step += 1
-            progress = (current_step / total_steps) * 100
-            self.update_loading_status(progress, "🔌 Connecting to server...")
-            time.sleep(0.5)
-            
-            current_step += 1
-            progress = (current_step / total_steps) * 100
-            self.update_loading_status(progress, "🏆 Loading leagues...")
-            leagues = self.fetch_leagues()
-            
+            phase_start = start
+            snapshot = self.storage.load_live_snapshot()
+            if snapshot:
+                self.show_cached_live_snapshot(snapshot)
+            phase_start = mark('cached_snapshot', phase_start)
+
+            # كاش Perfect2_2 غير مطلوب لأول عرض
+            self.load_deferred_state()
+
+            self.update_loading_status(20, "🏆 Loading leagues & ⚽ live matches...")
+
+            # الدوريات والمباريات المباشرة مستقلة عن بعضها: جلب متوازٍ
+            live_result = {}
+            live_thread = threading.Thread(
+                target=lambda: live_result.setdefault('matches', self.fetch_live_matches_sync()),
+                daemon=True
+            )
+            live_thread.start()
+
+            leagues = self.load_cached_league_catalog()
+            if leagues:
+                log.info("📦 League catalog loaded from storage: %s leagues", len(leagues))
+                if self.league_catalog_is_stale():
+                    self.refresh_league_catalog_async("daily refresh")
+            else:
+                leagues = self.fetch_leagues()
+            phase_start = mark('leagues', phase_start)
+
             if leagues:
-                current_step += 1
-                progress = (current_step / total_steps) * 100
-                self.update_loading_status(progress, "📊 Processing data...")
+                self.update_loading_status(60, "⚽ Loading live matches...")
                 self.all_leagues = leagues
                 self.leagues_loaded = True
-                
-                current_step += 1
-                progress = (current_step / total_steps) * 100
-                self.update_loading_status(progress, "⚽ Loading live matches...")
-                live_matches = self.fetch_live_matches_sync()
-                
-                current_step += 1
-                progress = (current_step / total_steps) * 100
-                self.update_loading_status(progress, "🎯 Applying filters...")
-                
+
+                live_thread.join()
+                live_matches = live_result.get('matches')
+                phase_start = mark('live', phase_start)
+
+                self.update_loading_status(90, "🎯 Applying filters...")
+
                 if live_matches:
                     self.update_ui_with_matches(live_matches)
-                    self.apply_combined_filter_on_start()
+                    self.show_live_in_main_thread()
+                    self.schedule_startup_filter(live_matches)
                 else:
                     self.show_no_matches_in_main_thread()
             else:
                 self.show_error_in_main_thread("Could not load leagues")
-                
+
             self.update_loading_status(100, "✅ Ready!")
-            time.sleep(0.3)
-            
+            self.start_live_updates_if_enabled()
+            mark('total', start)
+
         except Exception as e:
             self.show_error_in_main_thread(str(e))
         finally:
             self._is_loading = False
 
+    @mainthread
+    def show_cached_live_snapshot(self, snapshot):
+        """عرض آخر مباريات مباشرة محفوظة ريثما يصل الرد الجديد"""
+        if self.matches:
+            return
+        self.matches = self.filter_out_hidden_and_favorite_matches(snapshot)
+        self.api_available = True
+        if self.current_tab == 'live' and not self.calendar_mode:
+            self.show_live_matches()
+
+    @mainthread
+    def show_live_in_main_thread(self):
+        if self.current_tab == 'live' and not self.calendar_mode:
+            self.show_live_matches()
+
+    @mainthread
+    def schedule_startup_filter(self, live_matches):
+        # بعد أول عرض للقائمة، مع إعادة استخدام المباريات التي تم جلبها للتو
+        Clock.schedule_once(lambda dt: self.apply_combined_filter_on_start(live_matches), 0.5)
+
+    def load_deferred_state(self):
+        """تحميل كاش Perfect2_2 في الخلفية بعد أول عرض"""
+        def load():
+            started = time.perf_counter()
+            cache = self.storage.load_perfect2_2_cache()
+            self.startup_timings['perfect2_2_cache'] = (time.perf_counter() - started) * 1000
+
+            # ما أضيف قبل اكتمال التحميل أحدث من المحفوظ
+            with self._perfect2_2_lock:
+                cache.update(self.perfect2_2_cache)
+                self.perfect2_2_cache = cache
+                self._perfect2_2_cache_loaded.set()
+                pending, self._perfect2_2_save_pending = self._perfect2_2_save_pending, False
+            log.info("📦 Perfect2_2 cache loaded: %s entries", len(cache))
+            if pending:
+                self.save_perfect2_2_cache()
+
+        threading.Thread(target=load, daemon=True).start()
+
     @mainthread
     def update_loading_status(self, progress, status):
         container = self.root.ids.main_list